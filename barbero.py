@@ -1,15 +1,10 @@
 import tkinter as tk
 from tkinter import scrolledtext
-import threading
-import time
-import random
 
-# --- CONFIGURACIÓN ---
-SILLAS_ESPERA = 5       # Número de sillas en la sala de espera
-TIEMPO_CORTE_MIN = 1.0  # Segundos que tarda un corte
-TIEMPO_CORTE_MAX = 3.0
-LLEGADA_CLIENTES_MIN = 0.5
-LLEGADA_CLIENTES_MAX = 2.0
+import barbero_sim as sim
+from barbero_sim import Barberia, NUM_BARBEROS, SILLAS_ESPERA
+from bitacora import Bitacora, DEBUG, INFO, AVISO
+from vista import BucleRender, PanelBitacora, MotorVista
 
 # Colores de estado
 COL_BARBERO_DURMIENDO = "#FF4444" # Rojo
@@ -18,155 +13,130 @@ COL_SILLA_VACIA = "#DDDDDD"       # Gris claro
 COL_SILLA_OCUPADA = "#5555FF"     # Azul
 
 class BarberiaGUI:
-    def __init__(self, root):
+    def __init__(self, root, barberos=NUM_BARBEROS, sillas_espera=SILLAS_ESPERA, medir_contencion=True,
+                 traza=None, vigilar=False):
         self.root = root
-        self.root.title("Simulación: El Barbero Dormilón")
-        self.root.geometry("600x500")
-        
-        # Variables compartidas y Semáforos
-        self.clientes_esperando = 0
+        self.root.title("Simulación: El Barbero Dormilón" + (f" - {traza}" if traza else ""))
+        self.root.geometry("600x620" if medir_contencion or traza else "600x500")
+
+        self.motor = MotorVista(lambda entorno: Barberia(sillas_espera=sillas_espera, barberos=barberos,
+                                                         entorno=entorno),
+                                self.log, traza, medir_contencion, vigilar)
+        self.sim = self.motor.sim
+        self.sim.agregar_observador(self.on_evento)
         self.sillas_gui = [] # Lista para guardar referencias a los labels de las sillas
-        self.mutex = threading.Lock()
-        self.sem_clientes_listos = threading.Semaphore(0)
-        self.sem_barbero_listo = threading.Semaphore(0)
-        self.running = True
+        self.barberos_gui = [] # (estado, silla) de cada barbero
 
         # --- INTERFAZ GRÁFICA ---
         # 1. Zona del Barbero
         frame_barbero = tk.LabelFrame(root, text=" Zona del Barbero ", font=("Arial", 12, "bold"), padx=10, pady=10)
         frame_barbero.pack(fill="x", padx=20, pady=10)
 
-        self.lbl_estado_barbero = tk.Label(frame_barbero, text="DURMIENDO Zzz...", bg=COL_BARBERO_DURMIENDO, fg="white", font=("Arial", 14, "bold"), width=25, height=2, relief="ridge")
-        self.lbl_estado_barbero.pack()
-        
-        self.lbl_silla_barbero = tk.Label(frame_barbero, text="[ Silla del Barbero ]", font=("Arial", 10))
-        self.lbl_silla_barbero.pack(pady=5)
+        ancho = 25 if self.sim.barberos == 1 else max(8, 50 // self.sim.barberos)
+        for b in range(self.sim.barberos):
+            frame_b = tk.Frame(frame_barbero)
+            frame_b.pack(side=tk.LEFT, expand=True)
+
+            lbl_estado_barbero = tk.Label(frame_b, text="DURMIENDO Zzz...", bg=COL_BARBERO_DURMIENDO, fg="white", font=("Arial", 14, "bold"), width=ancho, height=2, relief="ridge")
+            lbl_estado_barbero.pack()
+
+            lbl_silla_barbero = tk.Label(frame_b, text="[ Silla del Barbero ]", font=("Arial", 10))
+            lbl_silla_barbero.pack(pady=5)
+            self.barberos_gui.append((lbl_estado_barbero, lbl_silla_barbero))
 
         # 2. Zona de Espera
-        frame_espera = tk.LabelFrame(root, text=f" Sala de Espera ({SILLAS_ESPERA} lugares) ", font=("Arial", 12), padx=10, pady=10)
+        frame_espera = tk.LabelFrame(root, text=f" Sala de Espera ({self.sim.sillas_espera} lugares) ", font=("Arial", 12), padx=10, pady=10)
         frame_espera.pack(fill="x", padx=20, pady=10)
-        
+
         frame_sillas_container = tk.Frame(frame_espera)
         frame_sillas_container.pack()
 
         # Crear visualmente las sillas de espera
-        for i in range(SILLAS_ESPERA):
+        for i in range(self.sim.sillas_espera):
             lbl_silla = tk.Label(frame_sillas_container, text=f"Silla {i+1}", bg=COL_SILLA_VACIA, width=8, height=3, relief="sunken", borderwidth=2)
             lbl_silla.pack(side=tk.LEFT, padx=5)
             self.sillas_gui.append(lbl_silla)
 
+        # Contención de los semáforos y locks de la barbería, o la reproducción
+        self.motor.crear_paneles(root, fill="x", padx=20, pady=(0, 10))
+
         # 3. Log de eventos (para no usar la terminal negra)
+        self.bitacora = Bitacora(nivel=DEBUG)
         tk.Label(root, text="Registro de Eventos:").pack(anchor="w", padx=20)
         self.log_box = scrolledtext.ScrolledText(root, height=8, width=70, state='disabled')
+        self.panel_log = PanelBitacora(self.log_box, self.bitacora)
+        controles = self.panel_log.controles(root)
+        self.motor.crear_controles(controles)
+        controles.pack(anchor="w", padx=20)
         self.log_box.pack(padx=20, pady=(0,20))
 
-        # --- INICIAR HILOS ---
-        self.thread_barbero = threading.Thread(target=self.proceso_barbero, daemon=True)
-        self.thread_barbero.start()
-        
-        # Hilo generador de clientes
-        self.thread_generador = threading.Thread(target=self.generar_clientes, daemon=True)
-        self.thread_generador.start()
+        # --- INICIAR HILOS Y RENDER ---
+        self.render = BucleRender(root, self.instantanea, self.pintar)
+        self.render.en_cada_frame(self.panel_log.volcar)
+        self.motor.iniciar(root, self.render, self.bitacora)
 
     # --- FUNCIONES AUXILIARES GUI (THREAD-SAFE) ---
-    def log(self, mensaje):
-        # Método seguro para escribir en el log desde otros hilos
-        self.root.after(0, self._log_safe, mensaje)
+    def log(self, mensaje, nivel=INFO):
+        # Seguro desde otros hilos: solo agrega a la bitácora, el render la vuelca
+        self.bitacora.registrar(mensaje, nivel)
+
+    # --- RENDER (hilo de Tk, una vez por frame) ---
+    def instantanea(self):
+        # [barbero 1 cortando, ..., barbero M cortando, silla 1 ocupada, ...]
+        return self.sim.cortando + [c is not None for c in self.sim.sillas]
 
-    def _log_safe(self, mensaje):
-        self.log_box.config(state='normal')
-        self.log_box.insert(tk.END, mensaje + "\n")
-        self.log_box.see(tk.END) # Auto-scroll al final
-        self.log_box.config(state='disabled')
+    def pintar(self, indice, valor):
+        if indice < self.sim.barberos:
+            self.actualizar_barbero(indice, valor)
+        else:
+            self.actualizar_silla_espera(indice - self.sim.barberos, valor)
 
     def actualizar_silla_espera(self, indice, ocupada):
         color = COL_SILLA_OCUPADA if ocupada else COL_SILLA_VACIA
         texto = f"Cliente\nEsperando" if ocupada else f"Silla {indice+1}\nVacía"
         fg_color = "white" if ocupada else "black"
-        # Usamos root.after para que el hilo principal de la GUI haga el cambio
-        self.root.after(0, lambda: self.sillas_gui[indice].config(bg=color, text=texto, fg=fg_color))
+        self.sillas_gui[indice].config(bg=color, text=texto, fg=fg_color)
 
-    def actualizar_barbero(self, estado_cortando):
+    def actualizar_barbero(self, indice, estado_cortando):
         color = COL_BARBERO_CORTANDO if estado_cortando else COL_BARBERO_DURMIENDO
         texto = "CORTANDO CABELLO ✂️" if estado_cortando else "DURMIENDO Zzz..."
         silla_txt = "[ Silla Ocupada por Cliente ]" if estado_cortando else "[ Silla del Barbero Vacía ]"
-        self.root.after(0, lambda: self.lbl_estado_barbero.config(bg=color, text=texto))
-        self.root.after(0, lambda: self.lbl_silla_barbero.config(text=silla_txt))
-
-    # --- LÓGICA DE HILOS ---
-    def proceso_barbero(self):
-        while self.running:
-            self.log("Barbero: No hay nadie, me duermo...")
-            self.actualizar_barbero(estado_cortando=False)
-            
-            # Espera a que llegue un cliente (se duerme)
-            self.sem_clientes_listos.acquire()
-            
-            # Despierta y atiende
-            with self.mutex:
-                # Encuentra qué silla liberar (la primera ocupada)
-                silla_a_liberar = -1
-                for i in range(SILLAS_ESPERA):
-                     # Checamos el color para saber si está ocupada (un truco visual rapido)
-                    if self.sillas_gui[i].cget("bg") == COL_SILLA_OCUPADA:
-                        silla_a_liberar = i
-                        break
-                
-                if silla_a_liberar != -1:
-                    self.actualizar_silla_espera(silla_a_liberar, False)
-                    self.clientes_esperando -= 1
-                    self.log(f"Barbero: Desperté! Atendiendo cliente de silla {silla_a_liberar+1}. Quedan {self.clientes_esperando} esperando.")
-
-            # Avisa que está listo para cortar
-            self.sem_barbero_listo.release()
-            
-            # Cortando el cabello (tiempo y visual)
-            self.actualizar_barbero(estado_cortando=True)
-            tiempo_corte = random.uniform(TIEMPO_CORTE_MIN, TIEMPO_CORTE_MAX)
-            time.sleep(tiempo_corte)
-            self.log("Barbero: Corte terminado. ¡Siguiente!")
-
-    def proceso_cliente(self, id_cliente):
-        self.log(f"Cliente {id_cliente}: Llegó a la barbería.")
-        with self.mutex:
-            if self.clientes_esperando < SILLAS_ESPERA:
-                # Hay lugar, buscamos silla vacía
-                silla_libre = -1
-                for i in range(SILLAS_ESPERA):
-                    if self.sillas_gui[i].cget("bg") == COL_SILLA_VACIA:
-                        silla_libre = i
-                        break
-                
-                self.clientes_esperando += 1
-                self.actualizar_silla_espera(silla_libre, True)
-                self.log(f"Cliente {id_cliente}: Tomé la silla {silla_libre+1}. Espero mi turno.")
-                self.sem_clientes_listos.release() # Despierta al barbero si duerme
-            else:
-                 self.log(f"Cliente {id_cliente}: Barbería llena. Me voy enojado.")
-                 return # Se va
-
-        # Espera a que el barbero le corte el pelo
-        self.sem_barbero_listo.acquire()
-        # (El tiempo de corte ocurre en el hilo del barbero)
-        self.log(f"Cliente {id_cliente}: ¡Me cortaron el pelo! Me voy feliz.")
-
-    def generar_clientes(self):
-        id_counter = 1
-        while self.running:
-            time.sleep(random.uniform(LLEGADA_CLIENTES_MIN, LLEGADA_CLIENTES_MAX))
-            t = threading.Thread(target=self.proceso_cliente, args=(id_counter,), daemon=True)
-            t.start()
-            id_counter += 1
+        lbl_estado_barbero, lbl_silla_barbero = self.barberos_gui[indice]
+        lbl_estado_barbero.config(bg=color, text=texto)
+        lbl_silla_barbero.config(text=silla_txt)
+
+    def quien(self, id_barbero):
+        return "Barbero" if self.sim.barberos == 1 else f"Barbero {id_barbero+1}"
+
+    # --- EVENTOS DEL MOTOR ---
+    def on_evento(self, evento, actor, recurso, dato):
+        if evento == sim.BARBERO_DUERME:
+            self.log(f"{self.quien(actor)}: No hay nadie, me duermo...", DEBUG)
+        elif evento == sim.BARBERO_ATIENDE:
+            self.log(f"{self.quien(actor)}: Desperté! Atendiendo cliente de silla {recurso+1}. Quedan {self.sim.clientes_esperando} esperando.")
+        elif evento == sim.CORTE_TERMINADO:
+            self.log(f"{self.quien(actor)}: Corte terminado. ¡Siguiente!")
+        elif evento == sim.CLIENTE_LLEGA:
+            self.log(f"Cliente {actor}: Llegó a la barbería.", DEBUG)
+        elif evento == sim.CLIENTE_SIENTA:
+            self.log(f"Cliente {actor}: Tomé la silla {recurso+1}. Espero mi turno.")
+        elif evento == sim.CLIENTE_SE_VA:
+            self.log(f"Cliente {actor}: Barbería llena. Me voy enojado.", AVISO)
+        elif evento == sim.CLIENTE_ATENDIDO:
+            self.log(f"Cliente {actor}: ¡Me cortaron el pelo! Me voy feliz.")
 
 if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Simulación visual: El Barbero Dormilón")
+    parser.add_argument("--barberos", type=int, default=NUM_BARBEROS)
+    parser.add_argument("--sillas-espera", type=int, default=SILLAS_ESPERA)
+    parser.add_argument("--sin-contencion", action="store_true", help="no medir locks ni semáforos")
+    parser.add_argument("--reproducir", metavar="RUTA", help="reproducir una traza grabada con --traza (sin hilos)")
+    parser.add_argument("--vigilar", action="store_true", help="detectar deadlocks e inanición (alertas en la bitácora)")
+    args = parser.parse_args()
+
     root = tk.Tk()
-    app = BarberiaGUI(root)
-    # Manejo seguro del cierre de ventana
-    def on_closing():
-        app.running = False
-        app.log("Cerrando aplicación... Espere a que terminen los hilos activos.")
-        # Liberamos semáforos para evitar deadlocks al cerrar
-        app.sem_clientes_listos.release() 
-        root.destroy()
-    root.protocol("WM_DELETE_WINDOW", on_closing)
-    root.mainloop()
\ No newline at end of file
+    app = BarberiaGUI(root, barberos=args.barberos, sillas_espera=args.sillas_espera,
+                      medir_contencion=not args.sin_contencion, traza=args.reproducir,
+                      vigilar=args.vigilar)
+    root.mainloop()
@@ -0,0 +1,213 @@
+from collections import deque
+
+from simulacion import Simulacion, EntornoReproduccion, ejecutar_cli
+from estadisticas import HistogramaLog, HistogramaTiempo
+
+# --- CONFIGURACIÓN ---
+NUM_BARBEROS = 1        # Barberos atendiendo en paralelo
+SILLAS_ESPERA = 5       # Número de sillas en la sala de espera
+TIEMPO_CORTE_MIN = 1.0  # Segundos que tarda un corte
+TIEMPO_CORTE_MAX = 3.0
+LLEGADA_CLIENTES_MIN = 0.5
+LLEGADA_CLIENTES_MAX = 2.0
+
+# --- EVENTOS ---
+BARBERO_DUERME = "barbero_duerme"       # actor = barbero
+BARBERO_ATIENDE = "barbero_atiende"     # recurso = silla que se libera, dato = cliente
+BARBERO_CORTA = "barbero_corta"
+CORTE_TERMINADO = "corte_terminado"
+CLIENTE_LLEGA = "cliente_llega"         # actor = id del cliente
+CLIENTE_SIENTA = "cliente_sienta"       # recurso = silla ocupada
+CLIENTE_SE_VA = "cliente_se_va"         # barbería llena
+CLIENTE_ATENDIDO = "cliente_atendido"
+
+class Barberia(Simulacion):
+    EVENTOS = (BARBERO_DUERME, BARBERO_ATIENDE, BARBERO_CORTA, CORTE_TERMINADO,
+               CLIENTE_LLEGA, CLIENTE_SIENTA, CLIENTE_SE_VA, CLIENTE_ATENDIDO)
+
+    def __init__(self, sillas_espera=SILLAS_ESPERA, entorno=None, semilla=None,
+                 tiempo_corte=(TIEMPO_CORTE_MIN, TIEMPO_CORTE_MAX),
+                 llegada=(LLEGADA_CLIENTES_MIN, LLEGADA_CLIENTES_MAX),
+                 barberos=NUM_BARBEROS):
+        super().__init__(entorno, semilla)
+        self.barberos = barberos
+        self.sillas_espera = sillas_espera
+        self.tiempo_corte = tiempo_corte
+        self.llegada = llegada
+
+        # Variables compartidas y Semáforos
+        # Sala de espera: cola FIFO de (cliente, silla, turno, llegada) + pila de
+        # sillas libres. Sentarse y ser llamado son O(1) sin recorrer las sillas.
+        self.clientes_esperando = 0
+        self.cola = deque()
+        self.sillas_libres = list(range(sillas_espera - 1, -1, -1)) # La silla 0 sale primero
+        self.sillas = [None] * sillas_espera # id del cliente sentado (None = vacía), para las vistas
+        self.cortando = [False] * barberos   # Estado de cada barbero, para las vistas
+        self.mutex = self.entorno.Lock("mutex")
+        self.sem_clientes_listos = self.entorno.Semaphore(0, "sem_clientes_listos")
+
+        # Contadores
+        self.llegadas = 0
+        self.atendidos = 0
+        self.rechazados = 0
+
+        # Estadísticas (se actualizan dentro de las secciones críticas)
+        self.espera = HistogramaLog()                       # Segundos en la sala de espera
+        self.largo_cola = HistogramaTiempo(sillas_espera)   # Clientes esperando vs. tiempo
+        self.tiempo_ocupado = [0.0] * barberos              # Segundos cortando por barbero
+        self.inicio_corte = [None] * barberos
+        self.inicio = 0.0
+
+    def actores(self):
+        self.inicio = self.entorno.ahora()
+        self.largo_cola.ultimo = self.inicio
+        return [self.proceso_barbero(b) for b in range(self.barberos)] + [self.generar_clientes()]
+
+    # --- LÓGICA DE HILOS ---
+    def proceso_barbero(self, id_barbero):
+        rng = self.rng_actor("barbero", id_barbero)
+        while self.running:
+            self.cortando[id_barbero] = False
+            self.notificar(BARBERO_DUERME, id_barbero)
+
+            # Espera a que llegue un cliente (se duerme)
+            yield self.sem_clientes_listos
+
+            # Despierta y atiende al que llegó primero
+            turno = None
+            with self.mutex:
+                if self.cola:
+                    id_cliente, silla, turno, llegada = self.cola.popleft()
+                    ahora = self.entorno.ahora()
+                    self.sillas[silla] = None
+                    self.sillas_libres.append(silla)
+                    self.clientes_esperando -= 1
+                    self.atendidos += 1
+                    self.espera.registrar(ahora - llegada)
+                    self.largo_cola.cambiar(ahora, self.clientes_esperando)
+                    self.notificar(BARBERO_ATIENDE, id_barbero, silla, id_cliente)
+
+            if turno is None:
+                continue # Despertado sin cliente (p. ej. al detener)
+
+            # Avisa a ESE cliente que está listo para cortar
+            turno.release()
+
+            # Cortando el cabello
+            self.cortando[id_barbero] = True
+            self.inicio_corte[id_barbero] = self.entorno.ahora()
+            self.notificar(BARBERO_CORTA, id_barbero)
+            yield rng.uniform(*self.tiempo_corte)
+            self.tiempo_ocupado[id_barbero] += self.entorno.ahora() - self.inicio_corte[id_barbero]
+            self.inicio_corte[id_barbero] = None
+            self.notificar(CORTE_TERMINADO, id_barbero)
+
+    def proceso_cliente(self, id_cliente):
+        self.notificar(CLIENTE_LLEGA, id_cliente)
+        with self.mutex:
+            if self.sillas_libres:
+                # Hay lugar: tomamos una silla libre y nos formamos
+                silla_libre = self.sillas_libres.pop()
+                turno = self.entorno.Semaphore(0, "turno")
+                ahora = self.entorno.ahora()
+                self.cola.append((id_cliente, silla_libre, turno, ahora))
+                self.clientes_esperando += 1
+                self.largo_cola.cambiar(ahora, self.clientes_esperando)
+                self.sillas[silla_libre] = id_cliente
+                self.notificar(CLIENTE_SIENTA, id_cliente, silla_libre)
+                self.sem_clientes_listos.release() # Despierta al barbero si duerme
+            else:
+                self.rechazados += 1
+                self.notificar(CLIENTE_SE_VA, id_cliente)
+                return # Se va
+
+        # Espera a que algún barbero lo llame (turno propio: orden de llegada)
+        yield turno
+        # (El tiempo de corte ocurre en el hilo del barbero)
+        self.notificar(CLIENTE_ATENDIDO, id_cliente)
+
+    def generar_clientes(self):
+        rng = self.rng_actor("llegadas")
+        id_counter = 1
+        while self.running:
+            yield rng.uniform(*self.llegada)
+            self.llegadas += 1
+            self.lanzar(self.proceso_cliente(id_counter))
+            id_counter += 1
+
+    # --- ESTADÍSTICAS ---
+    def utilizacion(self):
+        # Fracción del tiempo medido que cada barbero pasó cortando
+        ahora = self.tiempo_medido()
+        transcurrido = max(ahora - self.inicio, 1e-9)
+        util = []
+        for b in range(self.barberos):
+            ocupado = self.tiempo_ocupado[b]
+            inicio = self.inicio_corte[b]
+            if inicio is not None:
+                ocupado += max(0.0, ahora - inicio) # Corte en curso
+            util.append(round(ocupado / transcurrido, 4))
+        return util
+
+    def parametros(self):
+        return {"barberos": self.barberos, "sillas_espera": self.sillas_espera}
+
+    def resumen(self):
+        r = super().resumen()
+        r.update(barberos=self.barberos, sillas_espera=self.sillas_espera,
+                 llegadas=self.llegadas, atendidos=self.atendidos, rechazados=self.rechazados,
+                 esperando=self.clientes_esperando)
+        r.update(self.por_segundo(("llegadas", "atendidos", "rechazados")))
+        r["tasa_rechazo"] = round(self.rechazados / self.llegadas, 4) if self.llegadas else 0.0
+        r["utilizacion"] = self.utilizacion()
+        r["espera"] = self.espera.resumen()
+        self.largo_cola.cerrar(self.tiempo_medido())
+        r["largo_cola_medio"] = round(self.largo_cola.media(), 4)
+        r["largo_cola"] = self.largo_cola.distribucion_agrupada()
+        return r
+
+# --- RÉPLICA (reproducción de trazas) ---
+# El estado que leen las vistas, reconstruido solo a partir de los eventos de
+# una traza: sin semáforos ni procesos. estado()/restaurar() dan las
+# instantáneas que reproduccion.py indexa para saltar a cualquier tiempo.
+class ReplicaBarberia(Simulacion):
+    EVENTOS = Barberia.EVENTOS
+
+    def __init__(self, barberos=NUM_BARBEROS, sillas_espera=SILLAS_ESPERA):
+        super().__init__(EntornoReproduccion())
+        self.barberos = barberos
+        self.sillas_espera = sillas_espera
+        self.clientes_esperando = 0
+        self.sillas = [None] * sillas_espera
+        self.cortando = [False] * barberos
+
+    def actores(self):
+        return []
+
+    def aplicar(self, evento, actor, recurso, dato):
+        if evento == BARBERO_CORTA:
+            self.cortando[actor] = True
+        elif evento == CORTE_TERMINADO or evento == BARBERO_DUERME:
+            self.cortando[actor] = False
+        elif evento == CLIENTE_SIENTA:
+            self.sillas[recurso] = actor
+            self.clientes_esperando += 1
+        elif evento == BARBERO_ATIENDE:
+            self.sillas[recurso] = None
+            self.clientes_esperando -= 1
+
+    def estado(self):
+        return [list(self.cortando), list(self.sillas), self.clientes_esperando]
+
+    def restaurar(self, estado):
+        cortando, sillas, self.clientes_esperando = estado
+        self.cortando[:] = cortando
+        self.sillas[:] = sillas
+
+if __name__ == "__main__":
+    ejecutar_cli(Barberia, "Barbero Dormilón sin GUI", {
+        "barberos": dict(type=int, help="barberos atendiendo en paralelo"),
+        "sillas_espera": dict(type=int, help="sillas de la sala de espera"),
+        "tiempo_corte": dict(type=float, nargs=2, metavar=("MIN", "MAX"), help="segundos por corte"),
+        "llegada": dict(type=float, nargs=2, metavar=("MIN", "MAX"), help="segundos entre llegadas"),
+    })
@@ -0,0 +1,236 @@
+import csv
+import itertools
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from simulacion import EntornoVirtual
+import barbero_sim
+import productor_sim
+
+try:
+    import colas # NumPy: sin él el barrido solo simula
+except ImportError:
+    colas = None
+
+# --- BARRIDO DE PARÁMETROS ---
+# Corre una grilla de configuraciones (producto cartesiano de los valores
+# dados para cada parámetro) sobre el motor con reloj virtual, repartida en
+# un pool de procesos, y junta los resultados en una tabla. Al lado de cada
+# configuración pone la predicción M/M/c/K (colas.py), que se calcula para
+# toda la grilla de una vez: con --simular N solo se simulan las N mejores
+# según la predicción, para cribar miles de configuraciones en segundos.
+#
+#   python barrido.py barbero -g sillas_espera=1:10 -g barberos=1,2,3 -d 20000 -j 4
+#   python barrido.py productor -g capacidad=2,4,8,16 -g consumidores=1:4 --simular 5 --orden throughput
+
+DURACION = 10000.0
+
+def _medio(minimo, maximo):
+    return (minimo + maximo) / 2
+
+# --- PROBLEMAS ---
+# Cada problema: parámetros barribles con su valor por defecto, cómo crear
+# la simulación, qué medir de ella y su modelo de colas equivalente
+# (lam, mu, c, K) para la predicción.
+
+def crear_barberia(p, semilla):
+    return barbero_sim.Barberia(
+        sillas_espera=p["sillas_espera"], entorno=EntornoVirtual(), semilla=semilla,
+        tiempo_corte=(p["corte_min"], p["corte_max"]), llegada=(p["llegada_min"], p["llegada_max"]),
+        barberos=p["barberos"])
+
+def metricas_barberia(sim):
+    util = sim.utilizacion()
+    sim.largo_cola.cerrar(sim.tiempo_medido())
+    return {"throughput": sim.atendidos / max(sim.tiempo_medido(), 1e-9),
+            "p_bloqueo": sim.rechazados / sim.llegadas if sim.llegadas else 0.0,
+            "utilizacion": sum(util) / len(util), "Wq": sim.espera.media(), "Lq": sim.largo_cola.media()}
+
+def modelo_barberia(p):
+    # Clientes que llegan, barberos como servidores, K = los que cortan + los que esperan
+    return (1 / _medio(p["llegada_min"], p["llegada_max"]), 1 / _medio(p["corte_min"], p["corte_max"]),
+            p["barberos"], p["barberos"] + p["sillas_espera"])
+
+def crear_productor(p, semilla):
+    return productor_sim.ProductorConsumidor(
+        capacidad=p["capacidad"], entorno=EntornoVirtual(), semilla=semilla,
+        productores=p["productores"], consumidores=p["consumidores"],
+        tiempo_producir=(p["producir_min"], p["producir_max"]),
+        tiempo_consumir=(p["consumir_min"], p["consumir_max"]))
+
+def metricas_productor(sim):
+    # Wq = latencia media de un item en el buffer, Lq = ocupación media
+    t = max(sim.tiempo_medido(), 1e-9)
+    media_consumir = _medio(*sim.tiempo_consumir)
+    m = sim.metricas_buffer()
+    return {"throughput": sim.consumidos / t,
+            "utilizacion": sim.consumidos * media_consumir / t / sim.consumidores,
+            "Wq": m["latencia"].media(), "Lq": m["ocupacion_media"]}
+
+def modelo_productor(p):
+    # Items que llegan del conjunto de productores, consumidores como
+    # servidores, K = slots + el item que tiene cada consumidor. Los
+    # productores se bloquean con el buffer lleno en lugar de perder el item:
+    # p_bloqueo es la fracción de producciones que encuentran el buffer lleno.
+    return (p["productores"] / _medio(p["producir_min"], p["producir_max"]),
+            1 / _medio(p["consumir_min"], p["consumir_max"]),
+            p["consumidores"], p["capacidad"] + p["consumidores"])
+
+PROBLEMAS = {
+    "barbero": {
+        "parametros": {"barberos": barbero_sim.NUM_BARBEROS, "sillas_espera": barbero_sim.SILLAS_ESPERA,
+                       "corte_min": barbero_sim.TIEMPO_CORTE_MIN, "corte_max": barbero_sim.TIEMPO_CORTE_MAX,
+                       "llegada_min": barbero_sim.LLEGADA_CLIENTES_MIN,
+                       "llegada_max": barbero_sim.LLEGADA_CLIENTES_MAX},
+        "crear": crear_barberia, "metricas": metricas_barberia, "modelo": modelo_barberia},
+    "productor": {
+        "parametros": {"capacidad": productor_sim.CAPACIDAD_BUFFER,
+                       "productores": productor_sim.NUM_PRODUCTORES,
+                       "consumidores": productor_sim.NUM_CONSUMIDORES,
+                       "producir_min": productor_sim.TIEMPO_PRODUCIR[0],
+                       "producir_max": productor_sim.TIEMPO_PRODUCIR[1],
+                       "consumir_min": productor_sim.TIEMPO_CONSUMIR[0],
+                       "consumir_max": productor_sim.TIEMPO_CONSUMIR[1]},
+        "crear": crear_productor, "metricas": metricas_productor, "modelo": modelo_productor},
+}
+
+# Métricas de la predicción que se muestran (con prefijo "mm_") y que se
+# pueden usar para ordenar; +1 = más es mejor
+METRICAS_MODELO = {"throughput": 1, "p_bloqueo": -1, "utilizacion": 1, "Lq": -1, "Wq": -1}
+
+# --- GRILLA ---
+def _valor(texto, ejemplo):
+    # Del mismo tipo que el valor por defecto (barberos, capacidad... son enteros)
+    return int(float(texto)) if isinstance(ejemplo, int) else float(texto)
+
+def parsear_eje(texto, defaults):
+    # "nombre=1,2,5" o "nombre=inicio:fin[:paso]" (fin incluido)
+    nombre, _, valores = texto.partition("=")
+    if nombre not in defaults or not valores:
+        raise ValueError(f"eje inválido {texto!r}; parámetros: {', '.join(defaults)}")
+    ejemplo = defaults[nombre]
+    if ":" in valores:
+        partes = [float(x) for x in valores.split(":")]
+        inicio, fin, paso = partes[0], partes[1], partes[2] if len(partes) > 2 else 1.0
+        cantidad = int(round((fin - inicio) / paso)) + 1
+        lista = [_valor(inicio + i * paso, ejemplo) for i in range(cantidad)]
+    else:
+        lista = [_valor(x, ejemplo) for x in valores.split(",")]
+    return nombre, lista
+
+def grilla(problema, ejes):
+    # Lista de configuraciones (dicts completos) del producto cartesiano
+    defaults = PROBLEMAS[problema]["parametros"]
+    nombres = list(ejes)
+    return [dict(defaults, **dict(zip(nombres, combinacion)))
+            for combinacion in itertools.product(*(ejes[n] for n in nombres))]
+
+# --- PREDICCIÓN Y SIMULACIÓN ---
+def predecir(problema, configuraciones):
+    # M/M/c/K de toda la grilla en una sola llamada vectorizada
+    modelo = PROBLEMAS[problema]["modelo"]
+    lam, mu, c, K = zip(*(modelo(p) for p in configuraciones))
+    r = colas.mmck(lam, mu, c, K)
+    return [{f"mm_{m}": round(float(r[m][i]), 6) for m in METRICAS_MODELO} for i in range(len(configuraciones))]
+
+def correr_configuracion(trabajo):
+    # En un proceso del pool: una simulación completa con reloj virtual
+    problema, p, duracion, semilla = trabajo
+    definicion = PROBLEMAS[problema]
+    sim = definicion["crear"](p, semilla)
+    sim.ejecutar(duracion)
+    return {f"sim_{m}": round(v, 6) for m, v in definicion["metricas"](sim).items()}
+
+def barrer(problema, configuraciones, duracion=DURACION, semilla=0, procesos=None):
+    trabajos = [(problema, p, duracion, semilla) for p in configuraciones]
+    if procesos == 1:
+        return [correr_configuracion(t) for t in trabajos]
+    # Varias configuraciones por envío para no pagar el IPC de a una
+    lote = max(1, len(trabajos) // (4 * (procesos or os.cpu_count() or 1)))
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        return list(pool.map(correr_configuracion, trabajos, chunksize=lote))
+
+# --- TABLA ---
+def imprimir(filas):
+    if not filas:
+        return
+    columnas = list(filas[0])
+    anchos = [max(len(c), *(len(_formato(f.get(c))) for f in filas)) for c in columnas]
+    print("  ".join(c.rjust(a) for c, a in zip(columnas, anchos)))
+    for f in filas:
+        print("  ".join(_formato(f.get(c)).rjust(a) for c, a in zip(columnas, anchos)))
+
+def _formato(valor):
+    if valor is None:
+        return "-"
+    return f"{valor:.4g}" if isinstance(valor, float) else str(valor)
+
+def guardar(filas, ruta):
+    if ruta.endswith(".json"):
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            json.dump(filas, archivo, indent=2)
+        return
+    columnas = list(dict.fromkeys(c for f in filas for c in f))
+    with open(ruta, "w", encoding="utf-8", newline="") as archivo:
+        escritor = csv.DictWriter(archivo, columnas)
+        escritor.writeheader()
+        escritor.writerows(filas)
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Barrido de parámetros con predicción M/M/c/K")
+    parser.add_argument("problema", choices=list(PROBLEMAS))
+    parser.add_argument("-g", "--eje", action="append", default=[], metavar="NOMBRE=VALORES",
+                        help="valores de un parámetro: a,b,c o inicio:fin[:paso] (repetible)")
+    parser.add_argument("-d", "--duracion", type=float, default=DURACION, help="segundos virtuales por corrida")
+    parser.add_argument("-s", "--semilla", type=int, default=0)
+    parser.add_argument("-j", "--procesos", type=int, help="procesos del pool (default: uno por CPU)")
+    parser.add_argument("--simular", type=int, metavar="N",
+                        help="simular solo las N mejores según la predicción (0 = solo predecir)")
+    parser.add_argument("--orden", choices=list(METRICAS_MODELO), default="throughput",
+                        help="métrica de la predicción para elegir las mejores")
+    parser.add_argument("-o", "--salida", metavar="RUTA", help="guardar la tabla (.csv o .json)")
+    args = parser.parse_args(argv)
+
+    defaults = PROBLEMAS[args.problema]["parametros"]
+    try:
+        ejes = dict(parsear_eje(e, defaults) for e in args.eje)
+    except ValueError as e:
+        parser.error(str(e))
+    configuraciones = grilla(args.problema, ejes)
+    columnas = list(ejes) or list(defaults)
+    filas = [{n: p[n] for n in columnas} for p in configuraciones]
+
+    if colas is not None:
+        for fila, prediccion in zip(filas, predecir(args.problema, configuraciones)):
+            fila.update(prediccion)
+    elif args.simular is not None:
+        parser.error("--simular elige según la predicción, que necesita NumPy")
+
+    a_simular = list(range(len(configuraciones)))
+    if args.simular is not None:
+        signo = METRICAS_MODELO[args.orden]
+        a_simular.sort(key=lambda i: -signo * filas[i][f"mm_{args.orden}"])
+        a_simular = a_simular[:args.simular]
+        filas_vistas = [filas[i] for i in a_simular] if args.simular else filas
+    else:
+        filas_vistas = filas
+    if a_simular:
+        try:
+            resultados = barrer(args.problema, [configuraciones[i] for i in a_simular], args.duracion,
+                                args.semilla, args.procesos)
+        except ValueError as e: # Configuración que el motor rechaza (p. ej. sin tiempos)
+            parser.error(str(e))
+        for i, r in zip(a_simular, resultados):
+            filas[i].update(r)
+
+    imprimir(filas_vistas)
+    print(f"{len(configuraciones)} configuraciones, {len(a_simular)} simuladas")
+    if args.salida:
+        guardar(filas, args.salida)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
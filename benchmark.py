@@ -0,0 +1,267 @@
+import json
+import statistics
+import sys
+import time
+
+from simulacion import ENTORNOS
+import barbero_sim
+import filosofos_sim
+import productor_sim
+
+# --- SUITE DE BENCHMARKS ---
+# Corre los tres problemas sin GUI a los tamaños, semillas y duraciones
+# pedidos y reporta, por caso:
+#   * throughput (atendidos / comidas / items por segundo del entorno),
+#   * percentiles de espera (p50/p95/p99, si el problema la mide),
+#   * tiempo de CPU y de pared, y pasos de proceso por segundo de CPU.
+# Los resultados salen en JSON y pueden compararse contra una línea base
+# guardada para marcar regresiones.
+#
+# Con --entorno virtual (el default) las métricas de la simulación son
+# deterministas para cada semilla: si cambian, cambió el comportamiento; el
+# costo del código de sincronización se ve en la CPU. Con hilos, los tiempos
+# de la demo se escalan por ESCALA_HILOS para que una corrida corta tenga
+# suficientes eventos.
+#
+# Lo medido con el reloj (la CPU siempre; todo con hilos o asyncio) varía
+# entre corridas del mismo código, así que se compara con una tolerancia
+# propia, más amplia, que además crece con la dispersión observada entre
+# repeticiones y entre semillas. La tolerancia ajustada queda para las
+# métricas deterministas.
+
+ESCALA_HILOS = 0.001
+DURACION = {"virtual": 10000.0, "hilos": 2.0, "asyncio": 2.0}
+TOLERANCIA = 0.10       # Cambio relativo que se considera regresión (métricas deterministas)
+TOLERANCIA_TIEMPO = 0.75 # Ídem para las medidas con el reloj: corridas seguidas del mismo
+                         # código llegaron a diferir un 50% en una máquina de una CPU
+K_DISPERSION = 2.0      # ... o k veces su dispersión relativa, si es mayor
+REPETICIONES = 3        # Corridas por semilla; del tiempo de CPU se toma el mínimo
+
+def _escalar(rango, escala):
+    return (rango[0] * escala, rango[1] * escala)
+
+# --- CASOS ---
+# Cada caso: crear(tamano, entorno, semilla, escala) -> simulación lista para
+# ejecutar, y metricas(sim) -> (throughput, resumen de espera o None)
+
+def crear_barbero(tamano, entorno, semilla, escala):
+    # tamano = barberos; las llegadas se aceleran en proporción para mantener la carga
+    llegada = (barbero_sim.LLEGADA_CLIENTES_MIN / tamano, barbero_sim.LLEGADA_CLIENTES_MAX / tamano)
+    return barbero_sim.Barberia(
+        sillas_espera=barbero_sim.SILLAS_ESPERA * tamano, entorno=entorno, semilla=semilla,
+        tiempo_corte=_escalar((barbero_sim.TIEMPO_CORTE_MIN, barbero_sim.TIEMPO_CORTE_MAX), escala),
+        llegada=_escalar(llegada, escala), barberos=tamano)
+
+def metricas_barbero(sim):
+    return sim.atendidos, sim.espera
+
+def crear_filosofos(estrategia):
+    def crear(tamano, entorno, semilla, escala):
+        # tamano = filósofos
+        return filosofos_sim.CenaFilosofos(
+            tamano, entorno, semilla, estrategia=estrategia,
+            tiempo_pensar=_escalar((filosofos_sim.TIEMPO_PENSAR_MIN, filosofos_sim.TIEMPO_PENSAR_MAX), escala),
+            tiempo_comer=_escalar((filosofos_sim.TIEMPO_COMER_MIN, filosofos_sim.TIEMPO_COMER_MAX), escala))
+    return crear
+
+def metricas_filosofos(sim):
+    espera = sim.espera[0].__class__()
+    for h in sim.espera:
+        espera.combinar(h)
+    return sim.total_comidas, espera
+
+def crear_productor(tipo_buffer):
+    def crear(tamano, entorno, semilla, escala):
+        # tamano = productores = consumidores
+        return productor_sim.ProductorConsumidor(
+            entorno=entorno, semilla=semilla, productores=tamano, consumidores=tamano,
+            tipo_buffer=tipo_buffer,
+            tiempo_producir=_escalar(productor_sim.TIEMPO_PRODUCIR, escala),
+            tiempo_consumir=_escalar(productor_sim.TIEMPO_CONSUMIR, escala))
+    return crear
+
+def metricas_productor(sim):
+    # La "espera" del productor-consumidor es la latencia de cada item en el buffer
+    return sim.consumidos, sim.metricas_buffer()["latencia"]
+
+CASOS = {"barbero": (crear_barbero, metricas_barbero)}
+for _estrategia in filosofos_sim.ESTRATEGIAS:
+    CASOS[f"filosofos-{_estrategia}"] = (crear_filosofos(_estrategia), metricas_filosofos)
+for _tipo in productor_sim.BUFFERS:
+    CASOS[f"productor-{_tipo}"] = (crear_productor(_tipo), metricas_productor)
+
+TAMANOS = {"barbero": [1, 4], "filosofos": [5, 50], "productor": [1, 4]}
+
+# Dirección de cada métrica comparable: +1 = más es mejor, -1 = menos es mejor
+METRICAS = {"throughput": 1, "espera_p50": -1, "espera_p95": -1, "espera_p99": -1,
+            "cpu_s": -1, "pasos_por_s_cpu": 1}
+METRICAS_CPU = {"cpu_s", "pasos_por_s_cpu"} # Medidas con el reloj en cualquier entorno
+
+# --- EJECUCIÓN ---
+def _medir(sim, metricas, pasos, cpu, pared):
+    # Métricas de una repetición
+    completados, espera = metricas(sim)
+    r = {"throughput": round(completados / max(sim.tiempo_medido(), 1e-9), 4),
+         "cpu_s": round(cpu, 4), "pared_s": round(pared, 4)}
+    if espera is not None:
+        r.update(espera_p50=round(espera.percentil(50), 6), espera_p95=round(espera.percentil(95), 6),
+                 espera_p99=round(espera.percentil(99), 6))
+    if pasos is not None:
+        r["pasos"] = pasos
+        r["pasos_por_s_cpu"] = round(pasos / max(cpu, 1e-9), 1)
+    return r
+
+def correr_caso(nombre, tamano, entorno, semilla, duracion, repeticiones=REPETICIONES):
+    # El tiempo de CPU de una corrida sola es ruidoso (planificador, caché):
+    # se repite y se queda con la más rápida, que es la que menos ruido tiene;
+    # de las demás métricas, la mediana (con reloj virtual son todas iguales).
+    # En "dispersion" queda el rango relativo de cada métrica entre las
+    # repeticiones, que comparar() usa como medida del ruido. Entre
+    # repeticiones la simulación se reinicia en el lugar (misma configuración
+    # y semilla) en vez de construirse de nuevo.
+    crear, metricas = CASOS[nombre]
+    escala = 1.0 if entorno == "virtual" else ESCALA_HILOS
+    sim = crear(tamano, ENTORNOS[entorno](), semilla, escala)
+    corridas = []
+    for repeticion in range(repeticiones):
+        if repeticion:
+            sim.reiniciar()
+        cpu0, pared0 = time.process_time(), time.perf_counter()
+        pasos = sim.ejecutar(duracion)
+        cpu, pared = time.process_time() - cpu0, time.perf_counter() - pared0
+        corridas.append(_medir(sim, metricas, pasos, cpu, pared))
+    r = {}
+    dispersion = {}
+    for metrica in corridas[0]:
+        valores = [c[metrica] for c in corridas]
+        if metrica in ("cpu_s", "pared_s"):
+            r[metrica] = min(valores)
+        elif metrica == "pasos_por_s_cpu":
+            r[metrica] = max(valores)
+        else:
+            r[metrica] = statistics.median(valores)
+        if r[metrica] and max(valores) != min(valores):
+            dispersion[metrica] = round((max(valores) - min(valores)) / abs(r[metrica]), 4)
+    if dispersion:
+        r["dispersion"] = dispersion
+    return r
+
+def correr_suite(casos=tuple(CASOS), tamanos=None, semillas=(0,), entorno="virtual", duracion=None,
+                 repeticiones=REPETICIONES):
+    # Una fila por (caso, tamaño): la media de cada métrica sobre las semillas
+    # y su desviación estándar (en "desvio") si hay más de una; "dispersion"
+    # es la mayor entre repeticiones de una misma semilla
+    duracion = duracion or DURACION[entorno]
+    resultados = []
+    for nombre in casos:
+        familia = nombre.split("-")[0]
+        for tamano in (tamanos or TAMANOS[familia]):
+            corridas = [correr_caso(nombre, tamano, entorno, s, duracion, repeticiones) for s in semillas]
+            fila = {"caso": nombre, "tamano": tamano, "entorno": entorno, "duracion": duracion,
+                    "semillas": list(semillas)}
+            desvio = {}
+            dispersion = {}
+            for metrica in corridas[0]:
+                if metrica == "dispersion":
+                    continue
+                valores = [c[metrica] for c in corridas]
+                fila[metrica] = round(statistics.fmean(valores), 6)
+                if len(valores) > 1:
+                    desvio[metrica] = round(statistics.stdev(valores), 6)
+            for c in corridas:
+                for metrica, valor in c.get("dispersion", {}).items():
+                    dispersion[metrica] = max(dispersion.get(metrica, 0.0), valor)
+            if desvio:
+                fila["desvio"] = desvio
+            if dispersion:
+                fila["dispersion"] = dispersion
+            resultados.append(fila)
+    return resultados
+
+# --- LÍNEA BASE ---
+def _clave(fila):
+    return fila["caso"], fila["tamano"], fila["entorno"]
+
+def _umbral(fila, anterior, metrica, tolerancia, tolerancia_tiempo):
+    # Empeoramiento relativo tolerado para una métrica de una fila
+    if fila["entorno"] == "virtual" and metrica not in METRICAS_CPU:
+        return tolerancia
+    umbral = tolerancia_tiempo
+    for f in (fila, anterior):
+        umbral = max(umbral, K_DISPERSION * f.get("dispersion", {}).get(metrica, 0.0))
+        desvio = f.get("desvio", {}).get(metrica)
+        if desvio and f[metrica]:
+            umbral = max(umbral, K_DISPERSION * desvio / abs(f[metrica]))
+    return umbral
+
+def comparar(resultados, base, tolerancia=TOLERANCIA, tolerancia_tiempo=TOLERANCIA_TIEMPO):
+    # Lista de (clave, métrica, valor base, valor nuevo, cambio relativo) que
+    # empeoraron más que su tolerancia
+    por_clave = {_clave(f): f for f in base}
+    regresiones = []
+    for fila in resultados:
+        anterior = por_clave.get(_clave(fila))
+        if anterior is None:
+            continue
+        for metrica, direccion in METRICAS.items():
+            if metrica not in fila or metrica not in anterior or not anterior[metrica]:
+                continue
+            antes, ahora = anterior[metrica], fila[metrica]
+            cambio = (ahora - antes) / abs(antes)
+            # Cuánto peor como factor: así +50% de CPU y -33% de pasos/s (la
+            # misma corrida, más lenta) superan la tolerancia por igual
+            if direccion > 0:
+                peor = antes / ahora - 1 if ahora > 0 else float("inf")
+            else:
+                peor = ahora / antes - 1
+            if peor > _umbral(fila, anterior, metrica, tolerancia, tolerancia_tiempo):
+                regresiones.append((_clave(fila), metrica, antes, ahora, round(cambio, 4)))
+    return regresiones
+
+def imprimir(resultados):
+    print(f"{'caso':<24} {'N':>4} {'throughput':>11} {'p50':>8} {'p95':>8} {'p99':>8} {'cpu s':>8} {'pasos/s cpu':>12}")
+    for f in resultados:
+        esperas = [f"{f[k]:>8.3f}" if k in f else f"{'-':>8}" for k in ("espera_p50", "espera_p95", "espera_p99")]
+        pasos = f"{f['pasos_por_s_cpu']:>12,.0f}" if "pasos_por_s_cpu" in f else f"{'-':>12}"
+        print(f"{f['caso']:<24} {f['tamano']:>4} {f['throughput']:>11.3f} {' '.join(esperas)} {f['cpu_s']:>8.3f} {pasos}")
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Benchmarks sin GUI de los tres problemas")
+    parser.add_argument("--casos", nargs="+", choices=list(CASOS), default=list(CASOS))
+    parser.add_argument("-n", "--tamanos", nargs="+", type=int,
+                        help="barberos / filósofos / productores (= consumidores); default por problema")
+    parser.add_argument("-s", "--semillas", nargs="+", type=int, default=[0])
+    parser.add_argument("--entorno", choices=list(ENTORNOS), default="virtual")
+    parser.add_argument("-d", "--duracion", type=float, help="segundos del entorno por corrida")
+    parser.add_argument("-r", "--repeticiones", type=int, default=REPETICIONES,
+                        help="corridas por semilla (se toma la de menor CPU)")
+    parser.add_argument("-o", "--salida", metavar="RUTA", help="guardar los resultados en JSON")
+    parser.add_argument("--base", metavar="RUTA", help="comparar contra una línea base guardada con -o")
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA,
+                        help="empeoramiento relativo tolerado en las métricas deterministas")
+    parser.add_argument("--tolerancia-tiempo", type=float, default=TOLERANCIA_TIEMPO,
+                        help="ídem para CPU y, con hilos o asyncio, todas las métricas "
+                             "(crece con la dispersión entre repeticiones y semillas)")
+    args = parser.parse_args(argv)
+
+    resultados = correr_suite(args.casos, args.tamanos, args.semillas, args.entorno, args.duracion,
+                              args.repeticiones)
+    imprimir(resultados)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump(resultados, archivo, indent=2)
+    if args.base:
+        with open(args.base, encoding="utf-8") as archivo:
+            base = json.load(archivo)
+        regresiones = comparar(resultados, base, args.tolerancia, args.tolerancia_tiempo)
+        for clave, metrica, antes, ahora, cambio in regresiones:
+            print(f"REGRESIÓN {clave[0]} N={clave[1]} ({clave[2]}): {metrica} {antes} -> {ahora} ({cambio:+.1%})")
+        if regresiones:
+            return 1
+        print(f"Sin regresiones respecto de {args.base} (tolerancia {args.tolerancia:.0%}, "
+              f"{args.tolerancia_tiempo:.0%} en tiempos).")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+import threading
+import time
+
+# --- BITÁCORA EN ANILLO ---
+# Registro de mensajes de capacidad fija: cuando se llena, los registros nuevos
+# pisan a los más viejos, así que una corrida de 24 horas usa memoria constante.
+# Los hilos de la simulación solo agregan (O(1) bajo un lock corto); la vista
+# consume por lotes lo que llegó desde el último frame y, opcionalmente, todo
+# se vuelca en streaming a un archivo.
+
+# Niveles (mismos valores que el módulo logging)
+DEBUG = 10
+INFO = 20
+AVISO = 30
+
+NOMBRES_NIVEL = {DEBUG: "DEBUG", INFO: "INFO", AVISO: "AVISO"}
+
+CAPACIDAD_BITACORA = 5000
+
+class Bitacora:
+    def __init__(self, capacidad=CAPACIDAD_BITACORA, nivel=INFO):
+        self.capacidad = capacidad
+        self.nivel = nivel                  # Se descartan los registros por debajo
+        self.total = 0                      # Registros aceptados desde el inicio
+        self._registros = [None] * capacidad
+        self._lock = threading.Lock()
+        self._archivo = None
+        self._inicio = time.monotonic()
+
+    def habilitado(self, nivel):
+        # Para no formatear mensajes que se van a descartar
+        return nivel >= self.nivel
+
+    def registrar(self, mensaje, nivel=INFO):
+        if nivel < self.nivel:
+            return
+        registro = (time.monotonic() - self._inicio, nivel, mensaje)
+        with self._lock:
+            self._registros[self.total % self.capacidad] = registro
+            self.total += 1
+            if self._archivo is not None:
+                self._archivo.write(self._formatear(registro))
+
+    def pendientes(self, desde, maximo=None):
+        # Registros con número de secuencia >= desde.
+        # Devuelve (registros, perdidos, nuevo_desde); "perdidos" son los que el
+        # anillo ya pisó o que exceden `maximo` (se conservan los más nuevos).
+        with self._lock:
+            total = self.total
+            n = total - desde
+            disponibles = min(n, self.capacidad)
+            if maximo is not None:
+                disponibles = min(disponibles, maximo)
+            registros = [self._registros[i % self.capacidad] for i in range(total - disponibles, total)]
+        return registros, n - disponibles, total
+
+    def registros(self):
+        return self.pendientes(max(0, self.total - self.capacidad))[0]
+
+    # --- EXPORTACIÓN ---
+    @staticmethod
+    def _formatear(registro):
+        t, nivel, mensaje = registro
+        return f"{t:12.3f} {NOMBRES_NIVEL.get(nivel, nivel):<5} {mensaje}\n"
+
+    def exportar(self, ruta):
+        # Vuelca lo que hay en el anillo y sigue escribiendo cada registro nuevo
+        archivo = open(ruta, "w", encoding="utf-8", buffering=1 << 16)
+        with self._lock:
+            self._cerrar_archivo()
+            total = self.total
+            for i in range(max(0, total - self.capacidad), total):
+                archivo.write(self._formatear(self._registros[i % self.capacidad]))
+            self._archivo = archivo
+
+    def cerrar(self):
+        with self._lock:
+            self._cerrar_archivo()
+
+    def _cerrar_archivo(self):
+        if self._archivo is not None:
+            self._archivo.close()
+            self._archivo = None
@@ -0,0 +1,67 @@
+import numpy as np
+
+# --- TEORÍA DE COLAS (FORMAS CERRADAS) ---
+# Predicciones de M/M/1/K y M/M/c/K (llegadas Poisson de tasa lam, c
+# servidores exponenciales de tasa mu, a lo sumo K clientes en el sistema
+# contando los que se atienden) vectorizadas con NumPy: cada argumento
+# puede ser un escalar o un arreglo, y se evalúan miles de configuraciones
+# de una vez. Devuelven un dict de arreglos:
+#
+#   p_bloqueo   -> probabilidad de encontrar el sistema lleno (llegada perdida)
+#   throughput  -> tasa efectiva de atención, lam * (1 - p_bloqueo)
+#   utilizacion -> fracción del tiempo que está ocupado cada servidor
+#   L, Lq       -> clientes medios en el sistema / en la cola
+#   W, Wq       -> tiempo medio en el sistema / esperando (de los que entran)
+#
+# Los motores no son exponenciales (sortean tiempos uniformes), así que esto
+# es una aproximación para cribar: con menos variabilidad, la simulación
+# suele dar colas y rechazos algo menores que los predichos.
+
+def _medidas(lam, mu, c, p, n):
+    # p: (configuraciones, K+1) probabilidades del número en el sistema
+    p_bloqueo = np.take_along_axis(p, np.asarray(n, dtype=np.int64)[:, None], axis=1)[:, 0]
+    estados = np.arange(p.shape[1])
+    L = p @ estados
+    Lq = (p * np.maximum(estados[None, :] - c[:, None], 0)).sum(axis=1)
+    throughput = lam * (1 - p_bloqueo)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        W = np.where(throughput > 0, L / throughput, 0.0)
+        Wq = np.where(throughput > 0, Lq / throughput, 0.0)
+    return {"p_bloqueo": p_bloqueo, "throughput": throughput, "utilizacion": throughput / (c * mu),
+            "L": L, "Lq": Lq, "W": W, "Wq": Wq}
+
+def mmck(lam, mu, c, K):
+    # p_n = p0 a^n / n!                 si n <= c
+    #     = p0 a^c / c! (a/c)^(n-c)     si c < n <= K        (a = lam / mu)
+    # Se calcula en logaritmos para que a^n / n! no desborde con K grande.
+    lam, mu, c, K = np.broadcast_arrays(*(np.atleast_1d(np.asarray(x, dtype=float)) for x in (lam, mu, c, K)))
+    c = np.minimum(c, K)
+    n = np.arange(int(K.max()) + 1)
+    log_fact = np.concatenate(([0.0], np.cumsum(np.log(np.arange(1, n[-1] + 1)))))
+    nn = n[None, :]
+    cc = c[:, None]
+    log_cc = log_fact[c.astype(np.int64)][:, None]
+    # Con lam = 0, log_a = -inf y 0 * -inf daría NaN en n = 0: ahí el término
+    # es a^0 = 1 (log 0) y el sistema queda vacío (p0 = 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_a = np.log(lam / mu)[:, None]
+        log_p = np.where(nn <= cc,
+                         np.where(nn == 0, 0.0, nn * log_a) - log_fact[n][None, :],
+                         cc * log_a - log_cc + (nn - cc) * (log_a - np.log(cc)))
+    log_p = np.where(nn <= K[:, None], log_p, -np.inf)
+    log_p -= log_p.max(axis=1, keepdims=True)
+    p = np.exp(log_p)
+    p /= p.sum(axis=1, keepdims=True)
+    return _medidas(lam, mu, c, p, K)
+
+def mm1k(lam, mu, K):
+    # Caso c = 1: p_n proporcional a rho^n (geométrica truncada en K); en
+    # logaritmos para que rho > 1 con K grande no desborde
+    lam, mu, K = np.broadcast_arrays(*(np.atleast_1d(np.asarray(x, dtype=float)) for x in (lam, mu, K)))
+    n = np.arange(int(K.max()) + 1)[None, :]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_p = np.where(n == 0, 0.0, n * np.log(lam / mu)[:, None]) # lam = 0: igual que en mmck
+    log_p = np.where(n <= K[:, None], log_p, -np.inf)
+    p = np.exp(log_p - log_p.max(axis=1, keepdims=True))
+    p /= p.sum(axis=1, keepdims=True)
+    return _medidas(lam, mu, np.ones_like(lam), p, K)
@@ -0,0 +1,176 @@
+import json
+import threading
+import time
+
+from simulacion import PedidoLote
+
+# --- CONTENCIÓN DE PRIMITIVAS ---
+# Versiones medidas de Lock y Semaphore para el modo hilos: registran cuánto
+# espera cada acquire, cuántos acquire encontraron la primitiva tomada y, en
+# los locks, cuánto tiempo se retuvo. Se activan pasando una Contencion al
+# EntornoHilos; sin ella el entorno devuelve sus primitivas sin envolver, así
+# que apagado no cuesta nada.
+#
+# Cada hilo acumula en sus propios contadores (una lista por hilo y por
+# nombre, sin locks); los totales se suman recién al leerlos.
+
+class EstadisticasPrimitiva:
+    # Índices de los contadores de cada hilo
+    ADQUISICIONES, CONTENDIDAS, ESPERA, ESPERA_MAX, RETENCION, RETENCION_MAX = range(6)
+
+    def __init__(self, nombre, tipo):
+        self.nombre = nombre
+        self.tipo = tipo
+        self._por_hilo = {}     # ident del hilo -> contadores
+
+    def contadores(self):
+        # Los del hilo actual (se crean la primera vez)
+        ident = threading.get_ident()
+        c = self._por_hilo.get(ident)
+        if c is None:
+            c = self._por_hilo[ident] = [0, 0, 0.0, 0.0, 0.0, 0.0]
+        return c
+
+    def registrar_espera(self, espera, contendida, veces=1):
+        c = self.contadores()
+        c[0] += veces
+        if contendida:
+            c[1] += 1
+            c[2] += espera
+            if espera > c[3]:
+                c[3] = espera
+
+    def registrar_retencion(self, retencion):
+        c = self.contadores()
+        c[4] += retencion
+        if retencion > c[5]:
+            c[5] = retencion
+
+    def resumen(self):
+        total = [0, 0, 0.0, 0.0, 0.0, 0.0]
+        for c in list(self._por_hilo.values()):
+            for i in (0, 1, 2, 4):
+                total[i] += c[i]
+            total[3] = max(total[3], c[3])
+            total[5] = max(total[5], c[5])
+        adquisiciones, contendidas, espera, espera_max, retencion, retencion_max = total
+        r = {"tipo": self.tipo, "adquisiciones": adquisiciones, "contendidas": contendidas,
+             "tasa_contencion": round(contendidas / adquisiciones, 4) if adquisiciones else 0.0,
+             "espera_total": round(espera, 6), "espera_max": round(espera_max, 6),
+             "espera_media": round(espera / contendidas, 6) if contendidas else 0.0,
+             "hilos": len(self._por_hilo)}
+        if self.tipo == "lock":
+            r.update(retencion_total=round(retencion, 6), retencion_max=round(retencion_max, 6),
+                     retencion_media=round(retencion / adquisiciones, 6) if adquisiciones else 0.0)
+        return r
+
+class LockMedido:
+    # Envuelve el Lock del entorno (LockHilos, o un LockVigilado)
+    def __init__(self, lock, estadisticas):
+        self._lock = lock
+        self._stats = estadisticas
+        self._tomado = 0.0      # Solo lo escribe quien tiene el lock
+
+    def acquire(self, blocking=True, timeout=-1):
+        if self._lock.acquire(False):
+            self._stats.registrar_espera(0.0, False)
+        else:
+            if not blocking:
+                return False
+            t0 = time.perf_counter()
+            if not self._lock.acquire(True, timeout):
+                return False
+            self._stats.registrar_espera(time.perf_counter() - t0, True)
+        self._tomado = time.perf_counter()
+        return True
+
+    def release(self):
+        self._stats.registrar_retencion(time.perf_counter() - self._tomado)
+        self._lock.release()
+
+    def locked(self):
+        return self._lock.locked()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+class SemaforoMedido:
+    # Envuelve un SemaforoHilos (o un SemaforoVigilado). No mide retención: en estos protocolos los
+    # semáforos son señales (los libera otro hilo), no secciones críticas.
+    def __init__(self, semaforo, estadisticas):
+        self._sem = semaforo
+        self._stats = estadisticas
+
+    def acquire(self, blocking=True, timeout=None):
+        if self._sem.acquire(False):
+            self._stats.registrar_espera(0.0, False)
+            return True
+        if not blocking:
+            return False
+        t0 = time.perf_counter()
+        if not self._sem.acquire(True, timeout):
+            return False
+        self._stats.registrar_espera(time.perf_counter() - t0, True)
+        return True
+
+    def release(self, n=1):
+        self._sem.release(n)
+
+    def hasta(self, k):
+        return PedidoLote(self, k)
+
+    def adquirir_hasta(self, k):
+        contendida = self._sem.disponibles() == 0
+        t0 = time.perf_counter()
+        n = self._sem.adquirir_hasta(k)
+        self._stats.registrar_espera(time.perf_counter() - t0 if contendida else 0.0, contendida, n)
+        return n
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+class Contencion:
+    # Registro de todas las primitivas medidas de una simulación. Varias
+    # primitivas con el mismo nombre (p. ej. el turno de cada cliente) suman
+    # en las mismas estadísticas.
+    def __init__(self):
+        self.primitivas = {}
+        self._lock = threading.Lock()
+
+    def _estadisticas(self, nombre, tipo):
+        with self._lock:
+            stats = self.primitivas.get(nombre)
+            if stats is None:
+                stats = self.primitivas[nombre] = EstadisticasPrimitiva(nombre, tipo)
+            return stats
+
+    def lock(self, lock, nombre):
+        return LockMedido(lock, self._estadisticas(nombre, "lock"))
+
+    def semaforo(self, semaforo, nombre):
+        return SemaforoMedido(semaforo, self._estadisticas(nombre, "semaforo"))
+
+    def reiniciar(self):
+        # Corrida nueva (Simulacion.reiniciar): mediciones desde cero
+        with self._lock:
+            self.primitivas = {}
+
+    def resumen(self):
+        return {nombre: stats.resumen() for nombre, stats in list(self.primitivas.items())}
+
+    def ranking(self, maximo=None):
+        # (nombre, resumen) de mayor a menor espera total: el cuello de botella primero
+        filas = sorted(self.resumen().items(), key=lambda par: par[1]["espera_total"], reverse=True)
+        return filas[:maximo] if maximo else filas
+
+    def exportar(self, ruta):
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            json.dump(self.resumen(), archivo, indent=2, ensure_ascii=False)
@@ -0,0 +1,121 @@
+import math
+
+# --- ESTADÍSTICAS DE MEMORIA FIJA ---
+# Estructuras baratas de actualizar desde los motores (una operación O(1) por
+# muestra) y de tamaño fijo, para corridas arbitrariamente largas.
+
+class HistogramaLog:
+    # Histograma con cubetas logarítmicas: cada cubeta cubre un factor
+    # constante (2^(1/sub) por defecto, ~9% de error relativo con sub=8), de
+    # `minimo` a `maximo`. Sirve para latencias/tiempos de espera y para
+    # sacar percentiles sin guardar las muestras.
+    def __init__(self, minimo=1e-6, maximo=1e6, sub=8):
+        self.minimo = minimo
+        self.factor = 2 ** (1 / sub)
+        self._escala = sub / math.log(2)
+        self.num_cubetas = int(math.ceil(math.log(maximo / minimo) * self._escala)) + 2
+        self.cubetas = [0] * self.num_cubetas   # [0] = menores que `minimo`
+        self.n = 0
+        self.suma = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def registrar(self, valor, veces=1):
+        if valor < self.minimo:
+            i = 0
+        else:
+            i = min(int(math.log(valor / self.minimo) * self._escala) + 1, self.num_cubetas - 1)
+        self.cubetas[i] += veces
+        self.n += veces
+        self.suma += valor * veces
+        if valor < self.min:
+            self.min = valor
+        if valor > self.max:
+            self.max = valor
+
+    def limite_superior(self, i):
+        return self.minimo * self.factor ** i
+
+    def percentil(self, p):
+        # Límite superior de la cubeta donde cae el percentil p (0-100),
+        # acotado por el máximo observado
+        if self.n == 0:
+            return 0.0
+        objetivo = p / 100 * self.n
+        acumulado = 0
+        for i, c in enumerate(self.cubetas):
+            acumulado += c
+            if acumulado >= objetivo and c:
+                return min(self.limite_superior(i), self.max)
+        return self.max
+
+    def media(self):
+        return self.suma / self.n if self.n else 0.0
+
+    def combinar(self, otro):
+        for i, c in enumerate(otro.cubetas):
+            self.cubetas[i] += c
+        self.n += otro.n
+        self.suma += otro.suma
+        self.min = min(self.min, otro.min)
+        self.max = max(self.max, otro.max)
+
+    def resumen(self, percentiles=(50, 95, 99)):
+        r = {"n": self.n, "media": round(self.media(), 6),
+             "max": round(self.max, 6) if self.n else 0.0}
+        for p in percentiles:
+            r[f"p{p}"] = round(self.percentil(p), 6)
+        return r
+
+MAX_CUBETAS = 20 # Rangos de la distribución agrupada
+
+class HistogramaTiempo:
+    # Distribución ponderada por tiempo de una cantidad entera (largo de cola,
+    # ocupación): cuánto tiempo pasó el sistema con 0, 1, 2, ... elementos.
+    def __init__(self, maximo, t0=0.0):
+        self.tiempo_en = [0.0] * (maximo + 1)
+        self.valor = 0
+        self.ultimo = t0
+
+    def cambiar(self, ahora, valor):
+        self.tiempo_en[self.valor] += ahora - self.ultimo
+        self.valor = valor
+        self.ultimo = ahora
+
+    def cerrar(self, ahora):
+        # Acumula el tramo en curso (para leer resultados a mitad de corrida).
+        # Al cerrar en el fin de la corrida, un cambio tardío (de un proceso
+        # que terminaba su paso al detener) ya puede estar más adelante.
+        self.cambiar(max(ahora, self.ultimo), self.valor)
+
+    def total(self):
+        return sum(self.tiempo_en)
+
+    def media(self):
+        total = self.total()
+        return sum(v * t for v, t in enumerate(self.tiempo_en)) / total if total else 0.0
+
+    def distribucion(self):
+        # {valor: fracción del tiempo}, solo valores observados
+        total = self.total()
+        if not total:
+            return {}
+        return {v: round(t / total, 6) for v, t in enumerate(self.tiempo_en) if t}
+
+    def distribucion_agrupada(self, cubetas=MAX_CUBETAS):
+        # Como distribucion(), pero con más de `cubetas` valores posibles los
+        # junta en rangos de igual ancho ("desde-hasta"), para que un resumen
+        # con cientos de miles de sillas no imprima una entrada por largo
+        if len(self.tiempo_en) <= cubetas:
+            return self.distribucion()
+        total = self.total()
+        if not total:
+            return {}
+        ancho = -(-len(self.tiempo_en) // cubetas)
+        r = {}
+        for desde in range(0, len(self.tiempo_en), ancho):
+            t = sum(self.tiempo_en[desde:desde + ancho])
+            if t:
+                hasta = min(desde + ancho, len(self.tiempo_en)) - 1
+                r[f"{desde}-{hasta}"] = round(t / total, 6)
+        return r
@@ -1,16 +1,12 @@
 import tkinter as tk
 from tkinter import scrolledtext
-import threading
-import time
-import random
 import math
 
-# --- CONFIGURACIÓN ---
-NUM_FILOSOFOS = 5
-TIEMPO_PENSAR_MIN = 1.0
-TIEMPO_PENSAR_MAX = 3.0
-TIEMPO_COMER_MIN = 2.0
-TIEMPO_COMER_MAX = 4.0
+import filosofos_sim as sim
+from filosofos_sim import CenaFilosofos, NUM_FILOSOFOS, ESTRATEGIA, ESTRATEGIAS
+from filosofos_sim import PENSANDO, HAMBRIENTO, COMIENDO
+from bitacora import Bitacora, DEBUG, INFO
+from vista import BucleRender, PanelBitacora, MotorVista
 
 # Colores
 C_PENSANDO = "white"
@@ -18,23 +14,73 @@ C_HAMBRIENTO = "#FFD700" # Gold/Amarillo
 C_COMIENDO = "#32CD32"   # LimeGreen
 C_TENEDOR_LIBRE = "black"
 C_TENEDOR_OCUPADO = "red"
+C_FONDO = "#f0f0f0"
+
+# --- VISTA COMPACTA (N grande) ---
+# Por encima de UMBRAL_COMPACTO filósofos no se dibuja un óvalo por filósofo:
+# la mesa se "desenrolla" en una grilla (el filósofo i está en la celda i, en
+# orden de filas, así que sus vecinos quedan a los costados) pintada en UNA
+# sola PhotoImage. Cada frame arma una fila de píxeles por fila de celdas y
+# solo se re-suben las filas que cambiaron: el costo depende de N y del FPS,
+# no de cuántos eventos ocurran. El hambre se pinta en una escala de color
+# según cuánto lleva esperando, para ver la inanición de un vistazo.
+UMBRAL_COMPACTO = 40
+UMBRAL_INANICION = 10.0 # Segundos de hambre que corresponden al color más oscuro
+C_INANICION = ["#FFD700", "#FFB000", "#FF8C00", "#FF6000", "#F03000", "#D00000", "#A00000", "#700000"]
 
 class CenaFilosofosGUI:
-    def __init__(self, root):
+    def __init__(self, root, estrategia=ESTRATEGIA, num_filosofos=NUM_FILOSOFOS, medir_contencion=True,
+                 traza=None, vigilar=False):
         self.root = root
-        self.root.title("Simulación: Cena de los Filósofos (Sin Deadlocks)")
-        self.root.geometry("700x600")
-        
-        # Objetos de sincronización
-        # Cada tenedor es un Mutex (Lock)
-        self.tenedores_locks = [threading.Lock() for _ in range(NUM_FILOSOFOS)]
-        self.running = True
+
+        self.motor = MotorVista(lambda entorno: CenaFilosofos(num_filosofos, entorno, estrategia=estrategia),
+                                self.log, traza, medir_contencion, vigilar)
+        self.sim = self.motor.sim
+        num_filosofos = self.sim.num_filosofos
+        self.root.title(f"Simulación: Cena de los Filósofos (Sin Deadlocks) - {self.sim.nombre_estrategia}"
+                        + (f" - {traza}" if traza else ""))
+        self.root.geometry("700x720" if medir_contencion or traza else "700x600")
+        self.compacta = num_filosofos > UMBRAL_COMPACTO
+        if not self.compacta:
+            # Solo con pocos filósofos se registra cada evento; con miles, la
+            # grilla y el resumen ya muestran el estado y el log solo sumaría costo
+            self.sim.agregar_observador(self.on_evento)
 
         # --- INTERFAZ GRÁFICA ---
         # 1. Panel Superior (Canvas de la Mesa)
-        self.canvas = tk.Canvas(root, width=600, height=400, bg="#f0f0f0")
+        self.canvas = tk.Canvas(root, width=600, height=400, bg=C_FONDO)
         self.canvas.pack(pady=10)
-        
+        if self.compacta:
+            self.crear_grilla()
+        else:
+            self.crear_mesa()
+
+        # Contención de tenedores / camarero / monitor, según la estrategia, o la reproducción
+        self.motor.crear_paneles(root, fill="x", padx=20)
+
+        # 2. Log de Eventos
+        frame_log = tk.LabelFrame(root, text=" Bitácora de la Cena ", padx=10, pady=10)
+        frame_log.pack(fill="both", expand=True, padx=20, pady=10)
+
+        self.bitacora = Bitacora(nivel=DEBUG)
+        self.log_box = scrolledtext.ScrolledText(frame_log, height=8, state='disabled')
+        self.panel_log = PanelBitacora(self.log_box, self.bitacora)
+        controles = self.panel_log.controles(frame_log)
+        self.motor.crear_controles(controles)
+        controles.pack(anchor="w")
+        self.log_box.pack(fill="both", expand=True)
+
+        # --- INICIAR HILOS Y RENDER ---
+        if self.compacta:
+            self.log(f"Vista compacta: {num_filosofos} filósofos, sin registro por evento.")
+            self.render = BucleRender(root, self.instantanea_grilla, self.pintar_fila)
+            self.render.en_cada_frame(self.actualizar_resumen)
+        else:
+            self.render = BucleRender(root, self.instantanea, self.pintar)
+        self.render.en_cada_frame(self.panel_log.volcar)
+        self.motor.iniciar(root, self.render, self.bitacora)
+
+    def crear_mesa(self):
         # Dibujar mesa central
         cx, cy = 300, 200
         radio_mesa = 100
@@ -48,22 +94,26 @@ class CenaFilosofosGUI:
         # Calcular posiciones en círculo (Trigonometría básica)
         radio_filosofos = 160
         radio_tenedores = 120
+        n = self.sim.num_filosofos
+        r = 30 if n <= 8 else max(6, 240 // n) # Que no se pisen los círculos
         
-        for i in range(NUM_FILOSOFOS):
-            angulo = (2 * math.pi * i) / NUM_FILOSOFOS - (math.pi / 2) # -pi/2 para empezar arriba
+        for i in range(n):
+            angulo = (2 * math.pi * i) / n - (math.pi / 2) # -pi/2 para empezar arriba
             
             # Posición del Filósofo
             fx = cx + radio_filosofos * math.cos(angulo)
             fy = cy + radio_filosofos * math.sin(angulo)
             
-            # Dibujar Filósofo (Círculo)
-            f_id = self.canvas.create_oval(fx-30, fy-30, fx+30, fy+30, fill=C_PENSANDO, width=2)
-            t_id = self.canvas.create_text(fx, fy, text=f"F{i+1}\nPensando", font=("Arial", 9, "bold"))
+            # Dibujar Filósofo (Círculo); el texto solo entra si hay pocos
+            f_id = self.canvas.create_oval(fx-r, fy-r, fx+r, fy+r, fill=C_PENSANDO, width=2)
+            t_id = None
+            if r == 30:
+                t_id = self.canvas.create_text(fx, fy, text=f"F{i+1}\nPensando", font=("Arial", 9, "bold"))
             self.filosofos_gui.append(f_id)
             self.textos_gui.append(t_id)
 
             # Posición del Tenedor (Entre filósofo i y filósofo i+1)
-            angulo_t = angulo + (math.pi / NUM_FILOSOFOS)
+            angulo_t = angulo + (math.pi / n)
             tx = cx + radio_tenedores * math.cos(angulo_t)
             ty = cy + radio_tenedores * math.sin(angulo_t)
             
@@ -73,29 +123,74 @@ class CenaFilosofosGUI:
             self.canvas.create_text(tx, ty-15, text=f"T{i+1}", font=("Arial", 8))
             self.tenedores_gui.append(l_id)
 
-        # 2. Log de Eventos
-        frame_log = tk.LabelFrame(root, text=" Bitácora de la Cena ", padx=10, pady=10)
-        frame_log.pack(fill="both", expand=True, padx=20, pady=10)
-        
-        self.log_box = scrolledtext.ScrolledText(frame_log, height=8, state='disabled')
-        self.log_box.pack(fill="both", expand=True)
-
-        # --- INICIAR HILOS ---
-        self.threads = []
-        for i in range(NUM_FILOSOFOS):
-            t = threading.Thread(target=self.proceso_filosofo, args=(i,), daemon=True)
-            self.threads.append(t)
-            t.start()
+    def crear_grilla(self):
+        n = self.sim.num_filosofos
+        self.columnas = math.ceil(math.sqrt(n * 1.5)) # Más ancha que alta, como el canvas
+        self.filas = math.ceil(n / self.columnas)
+        self.escala = max(1, min(580 // self.columnas, 380 // self.filas)) # Píxeles por celda
+        ancho, alto = self.columnas * self.escala, self.filas * self.escala
+        self.imagen = tk.PhotoImage(width=ancho, height=alto)
+        self.canvas.create_image(300 - ancho // 2, 200 - alto // 2, image=self.imagen, anchor=tk.NW)
+
+        # Color de cada celda ya repetido `escala` veces (una fila de píxeles)
+        colores = [C_PENSANDO, C_COMIENDO] + C_INANICION + [C_FONDO]
+        self.tramos = [" ".join([c] * self.escala) for c in colores]
+        self.T_PENSANDO, self.T_COMIENDO, self.T_VACIA = 0, 1, len(colores) - 1
+        self.lbl_resumen = tk.Label(self.root, text="", font=("Consolas", 10))
+        self.lbl_resumen.pack()
 
     # --- GUI UPDATE SAFE ---
-    def log(self, mensaje):
-        self.root.after(0, lambda: self._log_internal(mensaje))
-
-    def _log_internal(self, mensaje):
-        self.log_box.config(state='normal')
-        self.log_box.insert(tk.END, mensaje + "\n")
-        self.log_box.see(tk.END)
-        self.log_box.config(state='disabled')
+    def log(self, mensaje, nivel=INFO):
+        self.bitacora.registrar(mensaje, nivel)
+
+    # --- RENDER COMPACTO (una PhotoImage) ---
+    def instantanea_grilla(self):
+        # Una cadena de colores por fila de celdas; BucleRender solo repinta
+        # las filas cuya cadena cambió
+        ahora = self.sim.entorno.ahora()
+        estados = self.sim.estados
+        desde = self.sim.hambre_desde
+        niveles = len(C_INANICION)
+        paso = UMBRAL_INANICION / niveles
+        tramos = self.tramos
+        celdas = []
+        for i, estado in enumerate(estados):
+            if estado == PENSANDO:
+                celdas.append(self.T_PENSANDO)
+            elif estado == COMIENDO:
+                celdas.append(self.T_COMIENDO)
+            else:
+                celdas.append(2 + min(niveles - 1, int((ahora - desde[i]) / paso)))
+        celdas.extend([self.T_VACIA] * (self.filas * self.columnas - len(celdas)))
+        c = self.columnas
+        return [" ".join([tramos[t] for t in celdas[f * c:(f + 1) * c]]) for f in range(self.filas)]
+
+    def pintar_fila(self, fila, colores):
+        fila_pixeles = "{" + colores + "} "
+        self.imagen.put(fila_pixeles * self.escala, to=(0, fila * self.escala))
+
+    def actualizar_resumen(self):
+        estados = self.sim.estados
+        hambrientos = estados.count(HAMBRIENTO)
+        comiendo = estados.count(COMIENDO)
+        ahora = self.sim.entorno.ahora()
+        espera_max = max((ahora - t for t, e in zip(self.sim.hambre_desde, estados) if e == HAMBRIENTO),
+                         default=0.0)
+        self.lbl_resumen.config(text=f"N={self.sim.num_filosofos}  comiendo={comiendo}  "
+                                     f"hambrientos={hambrientos}  espera máx. actual={espera_max:.1f}s  "
+                                     f"comidas={sum(self.sim.comidas)}")
+
+    # --- RENDER (hilo de Tk, una vez por frame) ---
+    def instantanea(self):
+        # [estado F1..FN, tenedor T1..TN ocupado]
+        return self.sim.estados + self.sim.tenedores
+
+    def pintar(self, indice, valor):
+        n = self.sim.num_filosofos
+        if indice < n:
+            self.actualizar_filosofo(indice, valor)
+        else:
+            self.actualizar_tenedor(indice - n, valor)
 
     def actualizar_filosofo(self, indice, estado):
         # Estado: 0=Pensando, 1=Hambriento, 2=Comiendo
@@ -108,70 +203,36 @@ class CenaFilosofosGUI:
             color = C_COMIENDO
             texto = "COMIENDO"
         
-        self.root.after(0, lambda: self.canvas.itemconfig(self.filosofos_gui[indice], fill=color))
-        self.root.after(0, lambda: self.canvas.itemconfig(self.textos_gui[indice], text=f"F{indice+1}\n{texto}"))
+        self.canvas.itemconfig(self.filosofos_gui[indice], fill=color)
+        if self.textos_gui[indice] is not None:
+            self.canvas.itemconfig(self.textos_gui[indice], text=f"F{indice+1}\n{texto}")
 
     def actualizar_tenedor(self, indice, ocupado):
         color = C_TENEDOR_OCUPADO if ocupado else C_TENEDOR_LIBRE
-        self.root.after(0, lambda: self.canvas.itemconfig(self.tenedores_gui[indice], fill=color))
-
-    # --- LÓGICA FILÓSOFOS ---
-    def proceso_filosofo(self, id_filosofo):
-        # Identificar tenedores (Izquierda y Derecha)
-        # Tenedor izquierdo es el del mismo índice
-        # Tenedor derecho es (índice + 1) % N
-        tenedor_izq = self.tenedores_locks[id_filosofo]
-        tenedor_der = self.tenedores_locks[(id_filosofo + 1) % NUM_FILOSOFOS]
-        
-        idx_izq = id_filosofo
-        idx_der = (id_filosofo + 1) % NUM_FILOSOFOS
+        self.canvas.itemconfig(self.tenedores_gui[indice], fill=color)
 
-        # Para evitar DEADLOCK: Siempre tomar el tenedor de menor índice primero
-        # Esto rompe la simetría circular (espera circular)
-        primero_lock = tenedor_izq if idx_izq < idx_der else tenedor_der
-        segundo_lock = tenedor_der if primero_lock == tenedor_izq else tenedor_izq
-        
-        idx_primero = idx_izq if idx_izq < idx_der else idx_der
-        idx_segundo = idx_der if idx_primero == idx_izq else idx_izq
-
-        while self.running:
-            # 1. PENSAR
-            self.actualizar_filosofo(id_filosofo, 0)
-            tiempo = random.uniform(TIEMPO_PENSAR_MIN, TIEMPO_PENSAR_MAX)
-            # self.log(f"Filósofo {id_filosofo+1} está pensando por {tiempo:.1f}s.")
-            time.sleep(tiempo)
-
-            # 2. HAMBRIENTO
-            self.actualizar_filosofo(id_filosofo, 1)
-            self.log(f"Filósofo {id_filosofo+1} tiene HAMBRE.")
-            
-            # 3. INTENTAR COMER (Tomar tenedores)
-            with primero_lock:
-                self.actualizar_tenedor(idx_primero, True)
-                # self.log(f"Filósofo {id_filosofo+1} tomó tenedor {idx_primero+1}.")
-                
-                with segundo_lock:
-                    self.actualizar_tenedor(idx_segundo, True)
-                    
-                    # 4. COMIENDO (Sección Crítica)
-                    self.actualizar_filosofo(id_filosofo, 2)
-                    self.log(f"--- Filósofo {id_filosofo+1} COMIENDO ---")
-                    time.sleep(random.uniform(TIEMPO_COMER_MIN, TIEMPO_COMER_MAX))
-                
-                # Soltó segundo
-                self.actualizar_tenedor(idx_segundo, False)
-            
-            # Soltó primero
-            self.actualizar_tenedor(idx_primero, False)
-            self.log(f"Filósofo {id_filosofo+1} terminó y soltó tenedores.")
+    # --- EVENTOS DEL MOTOR ---
+    def on_evento(self, evento, actor, recurso, dato):
+        if evento == sim.FILOSOFO_HAMBRE:
+            self.log(f"Filósofo {actor+1} tiene HAMBRE.", DEBUG)
+        elif evento == sim.FILOSOFO_COME:
+            self.log(f"--- Filósofo {actor+1} COMIENDO ---")
+        elif evento == sim.FILOSOFO_TERMINA:
+            self.log(f"Filósofo {actor+1} terminó y soltó tenedores.", DEBUG)
 
 if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Simulación visual: Cena de los Filósofos")
+    parser.add_argument("--estrategia", choices=list(ESTRATEGIAS), default=ESTRATEGIA)
+    parser.add_argument("-n", "--num-filosofos", type=int, default=NUM_FILOSOFOS,
+                        help=f"más de {UMBRAL_COMPACTO} usa la vista compacta")
+    parser.add_argument("--sin-contencion", action="store_true", help="no medir locks ni semáforos")
+    parser.add_argument("--reproducir", metavar="RUTA", help="reproducir una traza grabada con --traza (sin hilos)")
+    parser.add_argument("--vigilar", action="store_true", help="detectar deadlocks e inanición (alertas en la bitácora)")
+    args = parser.parse_args()
+
     root = tk.Tk()
-    app = CenaFilosofosGUI(root)
-    
-    def on_closing():
-        app.running = False
-        root.destroy()
-        
-    root.protocol("WM_DELETE_WINDOW", on_closing)
+    app = CenaFilosofosGUI(root, estrategia=args.estrategia, num_filosofos=args.num_filosofos,
+                           medir_contencion=not args.sin_contencion, traza=args.reproducir,
+                           vigilar=args.vigilar)
     root.mainloop()
\ No newline at end of file
@@ -0,0 +1,375 @@
+from simulacion import Simulacion, EntornoReproduccion, ENTORNOS, ejecutar_cli
+from estadisticas import HistogramaLog
+
+# --- CONFIGURACIÓN ---
+NUM_FILOSOFOS = 5
+TIEMPO_PENSAR_MIN = 1.0
+TIEMPO_PENSAR_MAX = 3.0
+TIEMPO_COMER_MIN = 2.0
+TIEMPO_COMER_MAX = 4.0
+ESTRATEGIA = "jerarquia"
+
+# Estados de un filósofo
+PENSANDO = 0
+HAMBRIENTO = 1
+COMIENDO = 2
+
+# --- EVENTOS ---
+FILOSOFO_PIENSA = "filosofo_piensa"     # actor = filósofo
+FILOSOFO_HAMBRE = "filosofo_hambre"
+FILOSOFO_COME = "filosofo_come"
+FILOSOFO_TERMINA = "filosofo_termina"
+TENEDOR_TOMADO = "tenedor_tomado"       # recurso = tenedor
+TENEDOR_LIBRE = "tenedor_libre"
+
+# --- ESTRATEGIAS ---
+# Todas exponen la misma interfaz:
+#   tomar(i)  -> proceso (`yield from`); vuelve cuando el filósofo i tiene sus
+#                dos tenedores y llama a sim.tomar_tenedor por cada uno
+#   soltar(i) -> sin bloqueo; llama a sim.soltar_tenedor y despierta a quien
+#                corresponda
+# El tenedor izquierdo del filósofo i es el i y el derecho el (i + 1) % N.
+
+class Jerarquia:
+    # Un mutex por tenedor y siempre se toma primero el de menor índice: rompe
+    # la espera circular, pero el que tiene un tenedor lo retiene mientras
+    # espera el otro.
+    def __init__(self, sim):
+        self.sim = sim
+        self.tenedores_locks = [sim.entorno.Lock(f"tenedor[{i}]") for i in range(sim.num_filosofos)]
+
+    def orden(self, i):
+        izq, der = i, (i + 1) % self.sim.num_filosofos
+        return (izq, der) if izq < der else (der, izq)
+
+    def tomar(self, i):
+        # Para evitar DEADLOCK: Siempre tomar el tenedor de menor índice primero
+        # Esto rompe la simetría circular (espera circular)
+        for idx in self.orden(i):
+            yield self.tenedores_locks[idx]
+            self.sim.tomar_tenedor(i, idx)
+
+    def soltar(self, i):
+        # Soltar en orden inverso: segundo y luego primero
+        for idx in reversed(self.orden(i)):
+            self.sim.soltar_tenedor(i, idx)
+            self.tenedores_locks[idx].release()
+
+class Camarero(Jerarquia):
+    # Un camarero (semáforo) deja sentarse a lo sumo N-1 comensales a la vez:
+    # siempre hay uno que consigue los dos tenedores, así que no hay deadlock
+    # aunque todos tomen primero el izquierdo.
+    def __init__(self, sim):
+        super().__init__(sim)
+        self.camarero = sim.entorno.Semaphore(sim.num_filosofos - 1, "camarero")
+
+    def orden(self, i):
+        return i, (i + 1) % self.sim.num_filosofos
+
+    def tomar(self, i):
+        yield self.camarero
+        yield from super().tomar(i)
+
+    def soltar(self, i):
+        super().soltar(i)
+        self.camarero.release()
+
+class Monitor:
+    # Solución de Tanenbaum: un mutex protege el estado de todos y cada
+    # filósofo espera en su propia variable de condición (un semáforo en 0).
+    # Solo se come si ningún vecino come, y se toman los dos tenedores juntos.
+    def __init__(self, sim):
+        self.sim = sim
+        n = sim.num_filosofos
+        self.mutex = sim.entorno.Lock("mutex")
+        self.estado = [PENSANDO] * n
+        self.puede_comer = [sim.entorno.Semaphore(0, f"puede_comer[{i}]") for i in range(n)]
+
+    def _probar(self, i):
+        n = self.sim.num_filosofos
+        if (self.estado[i] == HAMBRIENTO and self.estado[(i - 1) % n] != COMIENDO
+                and self.estado[(i + 1) % n] != COMIENDO):
+            self.estado[i] = COMIENDO
+            self.puede_comer[i].release()
+
+    def tomar(self, i):
+        with self.mutex:
+            self.estado[i] = HAMBRIENTO
+            self._probar(i)
+        yield self.puede_comer[i]
+        self.sim.tomar_tenedor(i, i)
+        self.sim.tomar_tenedor(i, (i + 1) % self.sim.num_filosofos)
+
+    def soltar(self, i):
+        n = self.sim.num_filosofos
+        self.sim.soltar_tenedor(i, (i + 1) % n)
+        self.sim.soltar_tenedor(i, i)
+        with self.mutex:
+            self.estado[i] = PENSANDO
+            self._probar((i - 1) % n)
+            self._probar((i + 1) % n)
+
+class ChandyMisra:
+    # Tenedores limpios/sucios: cada tenedor tiene dueño, arranca sucio y en
+    # manos del vecino de menor índice (grafo de precedencia acíclico). Un
+    # dueño entrega un tenedor sucio cuando se lo piden (salvo que esté
+    # comiendo) y lo limpia al entregarlo; uno limpio lo retiene hasta comer.
+    # Los mensajes del algoritmo original se emulan con un mutex y un
+    # semáforo por filósofo.
+    def __init__(self, sim):
+        self.sim = sim
+        n = sim.num_filosofos
+        self.mutex = sim.entorno.Lock("mutex")
+        self.estado = [PENSANDO] * n
+        self.puede_comer = [sim.entorno.Semaphore(0, f"puede_comer[{i}]") for i in range(n)]
+        # Tenedor f entre los filósofos (f - 1) % n y f
+        self.duenio = [min(f, (f - 1) % n) for f in range(n)]
+        self.sucio = [True] * n
+        self.pedido = [False] * n # El que no es dueño lo está esperando
+
+    def _tenedores(self, i):
+        return i, (i + 1) % self.sim.num_filosofos
+
+    def _vecino(self, i, f):
+        # Quién comparte el tenedor f con el filósofo i
+        n = self.sim.num_filosofos
+        return (f - 1) % n if f == i else f
+
+    def _entregar(self, f, destino):
+        self.duenio[f] = destino
+        self.sucio[f] = False
+        self.pedido[f] = False
+
+    def _intentar_comer(self, i):
+        if self.estado[i] == HAMBRIENTO and all(self.duenio[f] == i for f in self._tenedores(i)):
+            self.estado[i] = COMIENDO
+            return True
+        return False
+
+    def _pedir(self, i, f):
+        duenio = self.duenio[f]
+        if self.estado[duenio] != COMIENDO and self.sucio[f]:
+            self._entregar(f, i)
+            if self.estado[duenio] == HAMBRIENTO:
+                self.pedido[f] = True # El anterior dueño lo vuelve a pedir
+        else:
+            self.pedido[f] = True     # Se atiende cuando el dueño termine de comer
+
+    def tomar(self, i):
+        with self.mutex:
+            self.estado[i] = HAMBRIENTO
+            for f in self._tenedores(i):
+                if self.duenio[f] != i:
+                    self._pedir(i, f)
+            listo = self._intentar_comer(i)
+        if not listo:
+            yield self.puede_comer[i]
+        for f in self._tenedores(i):
+            self.sim.tomar_tenedor(i, f)
+
+    def soltar(self, i):
+        for f in reversed(self._tenedores(i)):
+            self.sim.soltar_tenedor(i, f)
+        with self.mutex:
+            self.estado[i] = PENSANDO
+            for f in self._tenedores(i):
+                self.sucio[f] = True
+                if self.pedido[f]:
+                    otro = self._vecino(i, f)
+                    self._entregar(f, otro)
+                    if self._intentar_comer(otro):
+                        self.puede_comer[otro].release()
+
+ESTRATEGIAS = {"jerarquia": Jerarquia, "camarero": Camarero, "monitor": Monitor,
+               "chandy_misra": ChandyMisra}
+
+class CenaFilosofos(Simulacion):
+    EVENTOS = (FILOSOFO_PIENSA, FILOSOFO_HAMBRE, FILOSOFO_COME, FILOSOFO_TERMINA,
+               TENEDOR_TOMADO, TENEDOR_LIBRE)
+
+    def __init__(self, num_filosofos=NUM_FILOSOFOS, entorno=None, semilla=None,
+                 estrategia=ESTRATEGIA, tiempo_pensar=(TIEMPO_PENSAR_MIN, TIEMPO_PENSAR_MAX),
+                 tiempo_comer=(TIEMPO_COMER_MIN, TIEMPO_COMER_MAX)):
+        super().__init__(entorno, semilla)
+        self.num_filosofos = num_filosofos
+        self.nombre_estrategia = estrategia
+        self.tiempo_pensar = tiempo_pensar
+        self.tiempo_comer = tiempo_comer
+
+        # Objetos de sincronización (según la estrategia elegida)
+        self.estrategia = ESTRATEGIAS[estrategia](self)
+
+        # Estado observable (lo leen las vistas)
+        self.estados = [PENSANDO] * num_filosofos
+        self.tenedores = [False] * num_filosofos # True = ocupado
+        self.comidas = [0] * num_filosofos
+
+        # Estadísticas: cada filósofo escribe solo las suyas; un tenedor solo lo
+        # actualiza quien lo tiene
+        self.espera = [HistogramaLog() for _ in range(num_filosofos)] # Hambre -> comer
+        self.tiempo_tenedores = [0.0] * num_filosofos                 # Segundos en uso
+        self.tomado_en = [None] * num_filosofos
+        self.hambre_desde = [0.0] * num_filosofos # Cuándo empezó a esperar (vale si HAMBRIENTO)
+        self.inicio = 0.0
+
+    def actores(self):
+        self.inicio = self.entorno.ahora()
+        return [self.proceso_filosofo(i) for i in range(self.num_filosofos)]
+
+    @property
+    def total_comidas(self):
+        return sum(self.comidas)
+
+    def uso_tenedores(self):
+        # Fracción del tiempo medido que cada tenedor estuvo tomado
+        ahora = self.tiempo_medido()
+        transcurrido = max(ahora - self.inicio, 1e-9)
+        uso = []
+        for idx in range(self.num_filosofos):
+            ocupado = self.tiempo_tenedores[idx]
+            tomado = self.tomado_en[idx]
+            if tomado is not None:
+                ocupado += max(0.0, ahora - tomado) # En uso ahora mismo
+            uso.append(round(ocupado / transcurrido, 4))
+        return uso
+
+    def parametros(self):
+        return {"num_filosofos": self.num_filosofos, "estrategia": self.nombre_estrategia}
+
+    def resumen(self):
+        r = super().resumen()
+        r.update(estrategia=self.nombre_estrategia, comidas=sum(self.comidas),
+                 comidas_por_filosofo=list(self.comidas), estados=list(self.estados))
+        r.update(self.por_segundo(("total_comidas",)))
+        espera = HistogramaLog()
+        for h in self.espera:
+            espera.combinar(h)
+        r["espera"] = espera.resumen()
+        uso = self.uso_tenedores()
+        r["uso_tenedores"] = uso
+        r["uso_tenedores_medio"] = round(sum(uso) / len(uso), 4)
+        return r
+
+    def cambiar_estado(self, id_filosofo, estado, evento):
+        self.estados[id_filosofo] = estado
+        self.notificar(evento, id_filosofo)
+
+    def tomar_tenedor(self, id_filosofo, idx):
+        self.tenedores[idx] = True
+        self.tomado_en[idx] = self.entorno.ahora()
+        self.notificar(TENEDOR_TOMADO, id_filosofo, idx)
+
+    def soltar_tenedor(self, id_filosofo, idx):
+        self.tenedores[idx] = False
+        self.tiempo_tenedores[idx] += self.entorno.ahora() - self.tomado_en[idx]
+        self.tomado_en[idx] = None
+        self.notificar(TENEDOR_LIBRE, id_filosofo, idx)
+
+    # --- LÓGICA FILÓSOFOS ---
+    def proceso_filosofo(self, id_filosofo):
+        rng = self.rng_actor("filosofo", id_filosofo)
+        while self.running:
+            # 1. PENSAR
+            self.cambiar_estado(id_filosofo, PENSANDO, FILOSOFO_PIENSA)
+            yield rng.uniform(*self.tiempo_pensar)
+
+            # 2. HAMBRIENTO
+            hambre = self.hambre_desde[id_filosofo] = self.entorno.ahora()
+            self.cambiar_estado(id_filosofo, HAMBRIENTO, FILOSOFO_HAMBRE)
+
+            # 3. INTENTAR COMER (Tomar tenedores, según la estrategia)
+            yield from self.estrategia.tomar(id_filosofo)
+            self.espera[id_filosofo].registrar(self.entorno.ahora() - hambre)
+
+            # 4. COMIENDO (Sección Crítica)
+            self.cambiar_estado(id_filosofo, COMIENDO, FILOSOFO_COME)
+            self.comidas[id_filosofo] += 1
+            yield rng.uniform(*self.tiempo_comer)
+
+            self.estrategia.soltar(id_filosofo)
+            self.notificar(FILOSOFO_TERMINA, id_filosofo)
+
+# --- BENCHMARK DE ESTRATEGIAS ---
+def benchmark_estrategias(estrategias=tuple(ESTRATEGIAS), num_filosofos=NUM_FILOSOFOS,
+                          duracion=3600.0, entorno="virtual", semilla=0):
+    # Misma semilla para todas: con reloj virtual la carga es idéntica y
+    # reproducible, y solo cambia cómo se reparten los tenedores
+    resultados = []
+    for nombre in estrategias:
+        sim = CenaFilosofos(num_filosofos, ENTORNOS[entorno](), semilla, estrategia=nombre)
+        sim.ejecutar(duracion)
+        r = sim.resumen()
+        resultados.append({"estrategia": nombre, "comidas_por_s": r["total_comidas_por_s"],
+                           "espera_media": r["espera"]["media"], "espera_max": r["espera"]["max"],
+                           "uso_tenedores": r["uso_tenedores_medio"]})
+    return resultados
+
+def benchmark_cli(argv):
+    import argparse
+    parser = argparse.ArgumentParser(description="Benchmark de estrategias para la cena de los filósofos")
+    parser.add_argument("--estrategias", nargs="+", choices=list(ESTRATEGIAS), default=list(ESTRATEGIAS))
+    parser.add_argument("-n", "--num-filosofos", type=int, default=NUM_FILOSOFOS)
+    parser.add_argument("-d", "--duracion", type=float, default=3600.0, help="segundos simulados")
+    parser.add_argument("--entorno", choices=list(ENTORNOS), default="virtual")
+    parser.add_argument("-s", "--semilla", type=int, default=0)
+    args = parser.parse_args(argv)
+    print(f"{'estrategia':<13} {'comidas/s':>10} {'espera media':>13} {'espera max':>11} {'uso tenedores':>14}")
+    for r in benchmark_estrategias(args.estrategias, args.num_filosofos, args.duracion,
+                                   args.entorno, args.semilla):
+        print(f"{r['estrategia']:<13} {r['comidas_por_s']:>10.4f} {r['espera_media']:>13.3f} "
+              f"{r['espera_max']:>11.3f} {r['uso_tenedores']:>14.4f}")
+
+# --- RÉPLICA (reproducción de trazas) ---
+# Estado de la mesa reconstruido solo a partir de los eventos (ver
+# reproduccion.py): sin tenedores reales ni procesos.
+ESTADO_DE_EVENTO = {FILOSOFO_PIENSA: PENSANDO, FILOSOFO_HAMBRE: HAMBRIENTO, FILOSOFO_COME: COMIENDO}
+
+class ReplicaFilosofos(Simulacion):
+    EVENTOS = CenaFilosofos.EVENTOS
+
+    def __init__(self, num_filosofos=NUM_FILOSOFOS, estrategia=ESTRATEGIA):
+        super().__init__(EntornoReproduccion())
+        self.num_filosofos = num_filosofos
+        self.nombre_estrategia = estrategia
+        self.estados = [PENSANDO] * num_filosofos
+        self.tenedores = [False] * num_filosofos
+        self.comidas = [0] * num_filosofos
+        self.hambre_desde = [0.0] * num_filosofos
+
+    def actores(self):
+        return []
+
+    @property
+    def total_comidas(self):
+        return sum(self.comidas)
+
+    def aplicar(self, evento, actor, recurso, dato):
+        if evento == TENEDOR_TOMADO:
+            self.tenedores[recurso] = True
+        elif evento == TENEDOR_LIBRE:
+            self.tenedores[recurso] = False
+        elif evento in ESTADO_DE_EVENTO:
+            self.estados[actor] = ESTADO_DE_EVENTO[evento]
+            if evento == FILOSOFO_HAMBRE:
+                self.hambre_desde[actor] = self.entorno.ahora()
+            elif evento == FILOSOFO_COME:
+                self.comidas[actor] += 1
+
+    def estado(self):
+        return [list(self.estados), list(self.tenedores), list(self.comidas), list(self.hambre_desde)]
+
+    def restaurar(self, estado):
+        self.estados[:], self.tenedores[:], self.comidas[:], self.hambre_desde[:] = estado
+
+if __name__ == "__main__":
+    import sys
+    if sys.argv[1:2] == ["benchmark"]:
+        # python filosofos_sim.py benchmark -d 3600
+        benchmark_cli(sys.argv[2:])
+    else:
+        ejecutar_cli(CenaFilosofos, "Cena de los Filósofos sin GUI", {
+            "num_filosofos": dict(type=int),
+            "estrategia": dict(choices=list(ESTRATEGIAS), help="cómo se reparten los tenedores"),
+            "tiempo_pensar": dict(type=float, nargs=2, metavar=("MIN", "MAX")),
+            "tiempo_comer": dict(type=float, nargs=2, metavar=("MIN", "MAX")),
+        })
@@ -1,13 +1,10 @@
 import tkinter as tk
 from tkinter import scrolledtext
-import threading
-import time
-import random
 
-# --- CONFIGURACIÓN ---
-CAPACIDAD_BUFFER = 8    # Tamaño de la cinta/buffer
-TIEMPO_PRODUCIR = (0.5, 1.5)
-TIEMPO_CONSUMIR = (1.0, 2.0)
+import productor_sim as sim
+from productor_sim import ProductorConsumidor, NUM_PRODUCTORES, NUM_CONSUMIDORES, TIPO_BUFFER, BUFFERS
+from bitacora import Bitacora, INFO
+from vista import BucleRender, PanelBitacora, MotorVista, FPS
 
 # Colores Profesionales
 COL_VACIO = "#E0E0E0"       # Gris claro
@@ -17,22 +14,24 @@ COL_CONS_ACTIVO = "#FF9800" # Naranja
 COL_ESPERA = "#F44336"      # Rojo (Bloqueado)
 COL_TEXTO = "#000000"
 
+# Métricas del buffer: combinar los histogramas cuesta O(cubetas x
+# consumidores), así que se refrescan cada PERIODO_METRICAS segundos
+PERIODO_METRICAS = 0.5
+BARRAS = "▁▂▃▄▅▆▇█"   # Distribución de la ocupación en una línea
+
 class ProductorConsumidorGUI:
-    def __init__(self, root):
+    def __init__(self, root, productores=NUM_PRODUCTORES, consumidores=NUM_CONSUMIDORES,
+                 tipo_buffer=TIPO_BUFFER, medir_contencion=True, traza=None,
+                 vigilar=False):
         self.root = root
-        self.root.title("Simulación: Productor - Consumidor (Buffer Acotado)")
-        self.root.geometry("700x550")
-        
-        # Variables compartidas
-        self.buffer = [None] * CAPACIDAD_BUFFER # None = Vacío
-        self.mutex = threading.Lock()
-        self.sem_espacios_vacios = threading.Semaphore(CAPACIDAD_BUFFER)
-        self.sem_items_disponibles = threading.Semaphore(0)
-        self.running = True
+        self.root.title("Simulación: Productor - Consumidor (Buffer Acotado)" + (f" - {traza}" if traza else ""))
+        self.root.geometry("700x730" if medir_contencion or traza else "700x610")
         
-        # Índices para comportamiento FIFO (Cola Circular)
-        self.idx_productor = 0
-        self.idx_consumidor = 0
+        self.motor = MotorVista(lambda entorno: ProductorConsumidor(productores=productores, consumidores=consumidores,
+                                                                    tipo_buffer=tipo_buffer, entorno=entorno),
+                                self.log, traza, medir_contencion, vigilar)
+        self.sim = self.motor.sim
+        self.sim.agregar_observador(self.on_evento)
 
         # --- INTERFAZ GRÁFICA ---
         
@@ -59,7 +58,7 @@ class ProductorConsumidorGUI:
         frame_buffer.pack()
 
         self.slots_gui = []
-        for i in range(CAPACIDAD_BUFFER):
+        for i in range(self.sim.capacidad):
             # Contenedor para el slot y su índice
             f = tk.Frame(frame_buffer, bg="#333")
             f.pack(side=tk.LEFT, padx=2)
@@ -70,106 +69,113 @@ class ProductorConsumidorGUI:
             tk.Label(f, text=f"[{i}]", fg="white", bg="#333", font=("Arial", 7)).pack()
             self.slots_gui.append(lbl)
 
+        # Latencia de los items, ocupación y tiempo bloqueado (solo con el motor)
+        self.lbl_metricas = None
+        if self.motor.reproductor is None:
+            self.lbl_metricas = tk.Label(root, text="", font=("Consolas", 9), justify=tk.LEFT)
+            self.lbl_metricas.pack(pady=(5, 0))
+            self._frames = 0
+
+        # Contención de los semáforos y locks del buffer, o la reproducción
+        self.motor.crear_paneles(root, fill="x", padx=20, pady=(10, 0))
+
         # 3. Log
+        self.bitacora = Bitacora()
         tk.Label(root, text="Log de Operaciones:", anchor="w").pack(fill="x", padx=20, pady=(20,0))
         self.log_box = scrolledtext.ScrolledText(root, height=10, state='disabled')
+        self.panel_log = PanelBitacora(self.log_box, self.bitacora)
+        controles = self.panel_log.controles(root)
+        self.motor.crear_controles(controles)
+        controles.pack(anchor="w", padx=20)
         self.log_box.pack(fill="both", expand=True, padx=20, pady=10)
 
-        # --- HILOS ---
-        self.t1 = threading.Thread(target=self.proceso_productor, daemon=True)
-        self.t2 = threading.Thread(target=self.proceso_consumidor, daemon=True)
-        self.t1.start()
-        self.t2.start()
+        # --- HILOS Y RENDER ---
+        self.render = BucleRender(root, self.instantanea, self.pintar)
+        self.render.en_cada_frame(self.panel_log.volcar)
+        if self.lbl_metricas is not None:
+            self.render.en_cada_frame(self.actualizar_metricas)
+        self.motor.iniciar(root, self.render, self.bitacora)
 
     # --- GUI UPDATE HELPER ---
-    def log(self, msg):
-        self.root.after(0, lambda: self._write_log(msg))
-
-    def _write_log(self, msg):
-        self.log_box.config(state='normal')
-        self.log_box.insert(tk.END, msg + "\n")
-        self.log_box.see(tk.END)
-        self.log_box.config(state='disabled')
+    def log(self, msg, nivel=INFO):
+        self.bitacora.registrar(msg, nivel)
+
+    # --- RENDER (hilo de Tk, una vez por frame) ---
+    def instantanea(self):
+        # [productores esperando, consumidores esperando, slot 0, slot 1, ...]
+        return [sum(self.sim.estado_productores), sum(self.sim.estado_consumidores)] + self.sim.buffer
+
+    def pintar(self, indice, valor):
+        if indice == 0:
+            self.actualizar_actor("prod", valor)
+        elif indice == 1:
+            self.actualizar_actor("cons", valor)
+        else:
+            self.actualizar_slot(indice - 2, valor is not None, f"#{valor}")
+
+    def actualizar_metricas(self):
+        self._frames += 1
+        if self._frames % max(1, int(PERIODO_METRICAS * FPS)):
+            return
+        m = self.sim.metricas_buffer()
+        lat = m["latencia"]
+        dist = m["ocupacion_distribucion"]
+        pico = max(dist.values(), default=0.0) or 1.0
+        barras = "".join(BARRAS[round(dist.get(v, 0.0) / pico * (len(BARRAS) - 1))] for v in range(self.sim.capacidad + 1))
+        self.lbl_metricas.config(text=(
+            f"Latencia en buffer: p50 {lat.percentil(50):.2f}s  p95 {lat.percentil(95):.2f}s  "
+            f"p99 {lat.percentil(99):.2f}s  (n={lat.n})\n"
+            f"Ocupación 0..{self.sim.capacidad} [{barras}]  media {m['ocupacion_media']:.2f}\n"
+            f"Bloqueados: productores {m['bloqueo']['productores']:.1%}  "
+            f"consumidores {m['bloqueo']['consumidores']:.1%} del tiempo"))
 
     def actualizar_slot(self, index, lleno, dato=""):
         color = COL_LLENO if lleno else COL_VACIO
         texto = f"DATO\n{dato}" if lleno else "VACÍO"
-        self.root.after(0, lambda: self.slots_gui[index].config(bg=color, text=texto))
+        self.slots_gui[index].config(bg=color, text=texto)
 
-    def actualizar_actor(self, actor, estado):
-        # Estados: 0=Trabajando, 1=Bloqueado/Esperando
+    def actualizar_actor(self, actor, esperando):
+        # esperando = cuántos actores de ese tipo están bloqueados (0 = todos trabajando)
         if actor == "prod":
-            bg = COL_PROD_ACTIVO if estado == 0 else COL_ESPERA
-            txt = "PRODUCTOR\n[Trabajando]" if estado == 0 else "PRODUCTOR\n[ESPERANDO ESPACIO]"
-            self.root.after(0, lambda: self.lbl_prod.config(bg=bg, text=txt))
+            n = self.sim.productores
+            bg = COL_PROD_ACTIVO if esperando == 0 else COL_ESPERA
+            if n == 1:
+                txt = "PRODUCTOR\n[Trabajando]" if esperando == 0 else "PRODUCTOR\n[ESPERANDO ESPACIO]"
+            else:
+                txt = f"PRODUCTORES ({n})\n[{esperando} ESPERANDO ESPACIO]"
+            self.lbl_prod.config(bg=bg, text=txt)
         else:
-            bg = COL_CONS_ACTIVO if estado == 0 else COL_ESPERA
-            txt = "CONSUMIDOR\n[Procesando]" if estado == 0 else "CONSUMIDOR\n[ESPERANDO DATO]"
-            self.root.after(0, lambda: self.lbl_cons.config(bg=bg, text=txt))
-
-    # --- LÓGICA ---
-    def proceso_productor(self):
-        item_counter = 1
-        while self.running:
-            # Intentar producir (Si buffer lleno, se bloquea aquí)
-            self.actualizar_actor("prod", 1) # Poner en estado de espera visual antes del acquire
-            
-            self.sem_espacios_vacios.acquire() 
-            
-            # Entró a zona crítica
-            self.actualizar_actor("prod", 0) # Ya pasó, está trabajando
-            
-            with self.mutex:
-                # Producir en la posición actual (Circular)
-                dato = f"#{item_counter}"
-                idx = self.idx_productor
-                
-                self.buffer[idx] = dato
-                self.actualizar_slot(idx, True, dato)
-                self.log(f"🟢 Productor: Creó {dato} en slot [{idx}]")
-                
-                # Mover índice circular
-                self.idx_productor = (self.idx_productor + 1) % CAPACIDAD_BUFFER
-                item_counter += 1
-
-            self.sem_items_disponibles.release() # Avisar que hay item
-            
-            # Simular tiempo de producción real
-            time.sleep(random.uniform(*TIEMPO_PRODUCIR))
-
-    def proceso_consumidor(self):
-        while self.running:
-            # Intentar consumir (Si buffer vacío, se bloquea)
-            self.actualizar_actor("cons", 1)
-            
-            self.sem_items_disponibles.acquire()
-            
-            # Entró a zona crítica
-            self.actualizar_actor("cons", 0)
-            
-            with self.mutex:
-                idx = self.idx_consumidor
-                dato = self.buffer[idx]
-                
-                self.buffer[idx] = None
-                self.actualizar_slot(idx, False) # Vaciar slot visualmente
-                self.log(f"🔶 Consumidor: Retiró {dato} del slot [{idx}]")
-                
-                # Mover índice circular
-                self.idx_consumidor = (self.idx_consumidor + 1) % CAPACIDAD_BUFFER
-
-            self.sem_espacios_vacios.release() # Avisar que hay espacio
-            
-            # Simular tiempo de consumo
-            time.sleep(random.uniform(*TIEMPO_CONSUMIR))
+            n = self.sim.consumidores
+            bg = COL_CONS_ACTIVO if esperando == 0 else COL_ESPERA
+            if n == 1:
+                txt = "CONSUMIDOR\n[Procesando]" if esperando == 0 else "CONSUMIDOR\n[ESPERANDO DATO]"
+            else:
+                txt = f"CONSUMIDORES ({n})\n[{esperando} ESPERANDO DATO]"
+            self.lbl_cons.config(bg=bg, text=txt)
+
+    def quien(self, tipo, actor, n):
+        return tipo if n == 1 else f"{tipo} {actor+1}"
+
+    # --- EVENTOS DEL MOTOR ---
+    def on_evento(self, evento, actor, recurso, dato):
+        if evento == sim.ITEM_PRODUCIDO:
+            self.log(f"🟢 {self.quien('Productor', actor, self.sim.productores)}: Creó #{dato} en slot [{recurso}]")
+        elif evento == sim.ITEM_CONSUMIDO:
+            self.log(f"🔶 {self.quien('Consumidor', actor, self.sim.consumidores)}: Retiró #{dato} del slot [{recurso}]")
 
 if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Simulación visual: Productor - Consumidor")
+    parser.add_argument("--productores", type=int, default=NUM_PRODUCTORES)
+    parser.add_argument("--consumidores", type=int, default=NUM_CONSUMIDORES)
+    parser.add_argument("--tipo-buffer", choices=list(BUFFERS), default=TIPO_BUFFER)
+    parser.add_argument("--sin-contencion", action="store_true", help="no medir locks ni semáforos")
+    parser.add_argument("--reproducir", metavar="RUTA", help="reproducir una traza grabada con --traza (sin hilos)")
+    parser.add_argument("--vigilar", action="store_true", help="detectar deadlocks e inanición (alertas en la bitácora)")
+    args = parser.parse_args()
+
     root = tk.Tk()
-    app = ProductorConsumidorGUI(root)
-    
-    def on_closing():
-        app.running = False
-        root.destroy()
-        
-    root.protocol("WM_DELETE_WINDOW", on_closing)
+    app = ProductorConsumidorGUI(root, args.productores, args.consumidores, args.tipo_buffer,
+                                 medir_contencion=not args.sin_contencion, traza=args.reproducir,
+                                 vigilar=args.vigilar)
     root.mainloop()
\ No newline at end of file
@@ -0,0 +1,364 @@
+import multiprocessing
+import struct
+import threading
+import time
+from multiprocessing import shared_memory
+
+# --- PRODUCTOR - CONSUMIDOR MULTIPROCESO ---
+# Con hilos, el GIL deja a todos los consumidores compartiendo un solo núcleo
+# de trabajo real. Este backend pone el anillo (índices + slots) en un bloque
+# de multiprocessing.shared_memory y corre cada productor y consumidor en su
+# propio proceso, sincronizados con semáforos y locks compartidos entre
+# procesos. Los datos viajan en slots de tamaño fijo y se leen/escriben en el
+# lugar a través de memoryview, sin serializar ni copiar el payload.
+#
+# El mismo código corre con hilos (bytearray + primitivas de threading) para
+# poder comparar los dos backends con exactamente la misma carga.
+#
+# Disposición del bloque compartido (enteros de 8 bytes, luego los slots):
+#   [corriendo, idx_productor, idx_consumidor, siguiente_item,
+#    producidos_por[0..P-1], consumidos_por[0..C-1], lleno[0..capacidad-1]]
+#   slot i: [número de item (8 bytes) | payload (tam_slot - 8 bytes)]
+# lleno[i] = 1 mientras el slot i tiene un item publicado que nadie tomó:
+# es lo que lee la vista (un slot ya consumido conserva sus bytes viejos).
+
+CAPACIDAD_BUFFER = 8
+NUM_PRODUCTORES = 1
+NUM_CONSUMIDORES = 1
+TAM_SLOT = 4096         # Bytes por slot (incluye los 8 del número de item)
+TRABAJO = 1             # Pasadas de CPU del consumidor sobre cada payload
+BACKEND = "procesos"
+ESPERA_MAX = 0.1        # Las esperas despiertan cada tanto para ver si hay que parar
+
+# Índices de la cabecera
+CORRIENDO = 0
+IDX_PRODUCTOR = 1
+IDX_CONSUMIDOR = 2
+SIGUIENTE_ITEM = 3
+CABECERA_FIJA = 4
+
+ITEM = struct.Struct("q")
+
+class _ModuloHilos:
+    # Misma interfaz que un contexto de multiprocessing para las primitivas
+    Semaphore = staticmethod(threading.Semaphore)
+    Lock = staticmethod(threading.Lock)
+
+class BufferCompartido:
+    # Anillo por slot, como BufferPorSlot de productor_sim: los índices de
+    # cola/cabeza (bajo su lock) solo reparten turnos, y cada slot tiene sus
+    # semáforos vacío/lleno. Así un consumidor puede procesar el payload en el
+    # lugar, fuera de toda sección crítica, y liberar el slot recién al
+    # terminar sin que otro productor lo pise.
+    def __init__(self, capacidad, productores, consumidores, tam_slot=TAM_SLOT, contexto=None):
+        self.capacidad = capacidad
+        self.productores = productores
+        self.consumidores = consumidores
+        self.tam_slot = tam_slot
+        self.enteros = CABECERA_FIJA + productores + consumidores + capacidad
+        self.ofs_slots = self.enteros * 8
+        tamano = self.ofs_slots + capacidad * tam_slot
+
+        ctx = contexto or _ModuloHilos
+        self.compartido = ctx is not _ModuloHilos
+        if self.compartido:
+            self.shm = shared_memory.SharedMemory(create=True, size=tamano)
+            self.nombre = self.shm.name
+            self._mapear(self.shm.buf)
+        else:
+            self.shm = None
+            self.nombre = None
+            self._mapear(memoryview(bytearray(tamano)))
+
+        self.vacio = [ctx.Semaphore(1) for _ in range(capacidad)]
+        self.lleno = [ctx.Semaphore(0) for _ in range(capacidad)]
+        self.lock_cola = ctx.Lock()
+        self.lock_cabeza = ctx.Lock()
+        self.lock_items = ctx.Lock()
+        self.cabecera[CORRIENDO] = 1
+
+    def _mapear(self, buf):
+        self.buf = buf
+        self.cabecera = buf[:self.ofs_slots].cast("q")
+
+    # --- PASO ENTRE PROCESOS ---
+    # Al hijo viajan el nombre del bloque y las primitivas; la memoria se
+    # vuelve a mapear del otro lado (no se copia).
+    def __getstate__(self):
+        estado = self.__dict__.copy()
+        for clave in ("shm", "buf", "cabecera"):
+            del estado[clave]
+        return estado
+
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        # Los hijos comparten el resource_tracker del padre, que es quien hace
+        # unlink en destruir(); el registro del hijo no agrega una entrada nueva.
+        self.shm = shared_memory.SharedMemory(name=self.nombre)
+        self._mapear(self.shm.buf)
+
+    def cerrar(self):
+        # Soltar las vistas antes de cerrar el mapeo
+        self.cabecera.release()
+        if self.shm is not None:
+            self.buf = None
+            self.shm.close()
+
+    def destruir(self):
+        self.cerrar()
+        if self.shm is not None:
+            self.shm.unlink()
+
+    # --- ESTADO ---
+    @property
+    def corriendo(self):
+        return self.cabecera[CORRIENDO] == 1
+
+    def parar(self):
+        self.cabecera[CORRIENDO] = 0
+
+    def contador_productor(self, id_productor):
+        return CABECERA_FIJA + id_productor
+
+    def contador_consumidor(self, id_consumidor):
+        return CABECERA_FIJA + self.productores + id_consumidor
+
+    def bandera_lleno(self, idx):
+        return CABECERA_FIJA + self.productores + self.consumidores + idx
+
+    def slot(self, idx):
+        ini = self.ofs_slots + idx * self.tam_slot
+        return self.buf[ini:ini + self.tam_slot]
+
+    # --- OPERACIONES ---
+    def _turno(self, lock, indice):
+        with lock:
+            idx = self.cabecera[indice]
+            self.cabecera[indice] = (idx + 1) % self.capacidad
+        return idx
+
+    def _esperar(self, sem):
+        while not sem.acquire(timeout=ESPERA_MAX):
+            if not self.corriendo:
+                return False
+        return True
+
+    def reservar_vacio(self):
+        # -> índice de un slot libre para escribir (None si se pidió parar)
+        idx = self._turno(self.lock_cola, IDX_PRODUCTOR)
+        return idx if self._esperar(self.vacio[idx]) else None
+
+    def publicar(self, idx):
+        self.cabecera[self.bandera_lleno(idx)] = 1 # Antes del release: el item ya está escrito
+        self.lleno[idx].release()
+
+    def reservar_lleno(self):
+        # -> índice de un slot con datos para leer (None si se pidió parar).
+        # El item sale del buffer al tomarlo, como en productor_sim; el slot
+        # sigue reservado hasta liberar().
+        idx = self._turno(self.lock_cabeza, IDX_CONSUMIDOR)
+        if not self._esperar(self.lleno[idx]):
+            return None
+        self.cabecera[self.bandera_lleno(idx)] = 0
+        return idx
+
+    def liberar(self, idx):
+        self.vacio[idx].release()
+
+    def nuevo_item(self):
+        with self.lock_items:
+            self.cabecera[SIGUIENTE_ITEM] += 1
+            return self.cabecera[SIGUIENTE_ITEM]
+
+# --- ACTORES ---
+# Funciones de módulo (no generadores) para que el proceso hijo las pueda
+# importar; con el backend de hilos se usan tal cual.
+
+def proceso_productor(buf, id_productor):
+    contador = buf.contador_productor(id_productor)
+    relleno = bytes(range(256)) * (buf.tam_slot // 256 + 1)
+    relleno = relleno[:buf.tam_slot - ITEM.size]
+    try:
+        while buf.corriendo:
+            item = buf.nuevo_item()
+            idx = buf.reservar_vacio()
+            if idx is None:
+                break
+            vista = buf.slot(idx)
+            ITEM.pack_into(vista, 0, item)
+            vista[ITEM.size:] = relleno # Escribe en la memoria compartida, en el lugar
+            vista.release()
+            buf.publicar(idx)
+            buf.cabecera[contador] += 1 # Solo este actor escribe su contador
+    finally:
+        if buf.compartido:
+            buf.cerrar()
+
+def proceso_consumidor(buf, id_consumidor, trabajo=TRABAJO):
+    contador = buf.contador_consumidor(id_consumidor)
+    try:
+        while buf.corriendo:
+            idx = buf.reservar_lleno()
+            if idx is None:
+                break
+            vista = buf.slot(idx)
+            payload = vista[ITEM.size:] # Sin copia: otra vista sobre el mismo slot
+            suma = 0
+            for _ in range(trabajo):
+                suma += sum(payload) # Trabajo de CPU en Python puro (toma el GIL)
+            payload.release()
+            vista.release()
+            buf.liberar(idx)
+            buf.cabecera[contador] += 1
+    finally:
+        if buf.compartido:
+            buf.cerrar()
+
+# --- MOTOR ---
+class ProductorConsumidorMP:
+    # Misma forma que los motores de simulacion.py (iniciar / ejecutar /
+    # detener / resumen), pero los actores son procesos del SO y no hay
+    # observadores: el estado se lee directamente del bloque compartido.
+    def __init__(self, capacidad=CAPACIDAD_BUFFER, productores=NUM_PRODUCTORES,
+                 consumidores=NUM_CONSUMIDORES, tam_slot=TAM_SLOT, trabajo=TRABAJO,
+                 backend=BACKEND):
+        self.capacidad = capacidad
+        self.productores = productores
+        self.consumidores = consumidores
+        self.tam_slot = tam_slot
+        self.trabajo = trabajo
+        self.backend = backend
+        contexto = multiprocessing.get_context() if backend == "procesos" else None
+        self.buf = BufferCompartido(capacidad, productores, consumidores, tam_slot, contexto)
+        crear = contexto.Process if contexto else threading.Thread
+        self.actores = ([crear(target=proceso_productor, args=(self.buf, p), daemon=True)
+                         for p in range(productores)] +
+                        [crear(target=proceso_consumidor, args=(self.buf, c, trabajo), daemon=True)
+                         for c in range(consumidores)])
+        self.inicio = None
+        self.fin = None
+
+    @property
+    def running(self):
+        return self.buf.corriendo
+
+    @property
+    def buffer(self):
+        # Número de item en cada slot, None si está vacío (lo que mostraría una vista)
+        buf, cabecera = self.buf, self.buf.cabecera
+        return [ITEM.unpack_from(buf.buf, buf.ofs_slots + i * self.tam_slot)[0]
+                if cabecera[buf.bandera_lleno(i)] else None
+                for i in range(self.capacidad)]
+
+    @property
+    def producidos_por(self):
+        return [self.buf.cabecera[self.buf.contador_productor(p)] for p in range(self.productores)]
+
+    @property
+    def consumidos_por(self):
+        return [self.buf.cabecera[self.buf.contador_consumidor(c)] for c in range(self.consumidores)]
+
+    @property
+    def producidos(self):
+        return sum(self.producidos_por)
+
+    @property
+    def consumidos(self):
+        return sum(self.consumidos_por)
+
+    def iniciar(self):
+        self.inicio = time.monotonic()
+        for actor in self.actores:
+            actor.start()
+
+    def detener(self, espera=2.0):
+        # Los actores ven el flag en a lo sumo ESPERA_MAX; si alguno no
+        # termina a tiempo se lo mata, y recién ahí se libera la memoria.
+        self.buf.parar()
+        self.fin = time.monotonic()
+        limite = time.monotonic() + espera
+        for actor in self.actores:
+            actor.join(max(0.0, limite - time.monotonic()))
+            if actor.is_alive() and hasattr(actor, "terminate"):
+                actor.terminate()
+                actor.join()
+
+    def ejecutar(self, duracion):
+        self.iniciar()
+        try:
+            time.sleep(duracion)
+        finally:
+            self.detener()
+        return self.resumen()
+
+    def cerrar(self):
+        self.buf.destruir()
+
+    def resumen(self):
+        fin = self.fin if self.fin is not None else time.monotonic()
+        tiempo = fin - self.inicio if self.inicio is not None else 0.0
+        r = {"tiempo": round(tiempo, 6), "backend": self.backend, "productores": self.productores,
+             "consumidores": self.consumidores, "tam_slot": self.tam_slot, "trabajo": self.trabajo,
+             "producidos": self.producidos, "consumidos": self.consumidos}
+        if tiempo > 0:
+            r["producidos_por_s"] = round(r["producidos"] / tiempo, 3)
+            r["consumidos_por_s"] = round(r["consumidos"] / tiempo, 3)
+        return r
+
+# --- BENCHMARK HILOS VS. PROCESOS ---
+def benchmark_backends(backends=("hilos", "procesos"), consumidores=(1, 2, 4), duracion=2.0,
+                       capacidad=CAPACIDAD_BUFFER, tam_slot=TAM_SLOT, trabajo=TRABAJO, productores=1):
+    # items/s consumidos con la misma carga de CPU por item en cada backend
+    resultados = []
+    for backend in backends:
+        for n in consumidores:
+            sim = ProductorConsumidorMP(capacidad, productores, n, tam_slot, trabajo, backend)
+            try:
+                r = sim.ejecutar(duracion)
+            finally:
+                sim.cerrar()
+            resultados.append({"backend": backend, "consumidores": n,
+                               "items_por_s": round(r["consumidos"] / r["tiempo"], 1)})
+    return resultados
+
+def benchmark_cli(argv):
+    import argparse
+    parser = argparse.ArgumentParser(description="Benchmark hilos vs. procesos con memoria compartida")
+    parser.add_argument("--backends", nargs="+", choices=["hilos", "procesos"], default=["hilos", "procesos"])
+    parser.add_argument("--consumidores", nargs="+", type=int, default=[1, 2, 4])
+    parser.add_argument("--productores", type=int, default=1)
+    parser.add_argument("-d", "--duracion", type=float, default=2.0)
+    parser.add_argument("--capacidad", type=int, default=CAPACIDAD_BUFFER)
+    parser.add_argument("--tam-slot", type=int, default=TAM_SLOT)
+    parser.add_argument("--trabajo", type=int, default=TRABAJO)
+    args = parser.parse_args(argv)
+    print(f"{'backend':<10} {'consumidores':>12} {'items/s':>12}")
+    for r in benchmark_backends(args.backends, args.consumidores, args.duracion, args.capacidad,
+                                args.tam_slot, args.trabajo, args.productores):
+        print(f"{r['backend']:<10} {r['consumidores']:>12} {r['items_por_s']:>12,.1f}")
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Productor - Consumidor con procesos y memoria compartida")
+    parser.add_argument("-d", "--duracion", type=float, default=5.0)
+    parser.add_argument("--backend", choices=["procesos", "hilos"], default=BACKEND)
+    parser.add_argument("--capacidad", type=int, default=CAPACIDAD_BUFFER)
+    parser.add_argument("--productores", type=int, default=NUM_PRODUCTORES)
+    parser.add_argument("--consumidores", type=int, default=NUM_CONSUMIDORES)
+    parser.add_argument("--tam-slot", type=int, default=TAM_SLOT)
+    parser.add_argument("--trabajo", type=int, default=TRABAJO)
+    args = parser.parse_args(argv)
+    sim = ProductorConsumidorMP(args.capacidad, args.productores, args.consumidores,
+                                args.tam_slot, args.trabajo, args.backend)
+    try:
+        print(sim.ejecutar(args.duracion))
+    finally:
+        sim.cerrar()
+
+if __name__ == "__main__":
+    import sys
+    if sys.argv[1:2] == ["benchmark"]:
+        # python productor_mp.py benchmark --consumidores 1 2 4 --trabajo 4
+        benchmark_cli(sys.argv[2:])
+    else:
+        main()
@@ -0,0 +1,481 @@
+import itertools
+import threading
+
+from simulacion import Simulacion, EntornoHilos, EntornoReproduccion, ejecutar_cli
+from estadisticas import HistogramaLog, HistogramaTiempo
+
+# --- CONFIGURACIÓN ---
+CAPACIDAD_BUFFER = 8    # Tamaño de la cinta/buffer
+TIEMPO_PRODUCIR = (0.5, 1.5)
+TIEMPO_CONSUMIR = (1.0, 2.0)
+NUM_PRODUCTORES = 1
+NUM_CONSUMIDORES = 1
+TIPO_BUFFER = "un_lock"
+TAMANO_LOTE = 1         # Items por sección crítica (1 = de a uno, como el original)
+
+# Estados de un actor
+TRABAJANDO = 0
+ESPERANDO = 1
+
+# --- EVENTOS ---
+PRODUCTOR_ESPERA = "productor_espera"       # actor = productor; buffer lleno (o a punto de verlo)
+PRODUCTOR_TRABAJA = "productor_trabaja"
+ITEM_PRODUCIDO = "item_producido"           # recurso = slot, dato = número de item
+CONSUMIDOR_ESPERA = "consumidor_espera"     # actor = consumidor; buffer vacío (o a punto de verlo)
+CONSUMIDOR_TRABAJA = "consumidor_trabaja"
+ITEM_CONSUMIDO = "item_consumido"           # recurso = slot, dato = número de item
+
+# --- IMPLEMENTACIONES DEL BUFFER ---
+# Todas exponen los mismos procesos, que se usan con `yield from`:
+#   poner(item, actor)       -> bloquea si no hay espacio; devuelve el slot usado
+#   sacar(actor)             -> bloquea si no hay items; devuelve (slot, item)
+#   poner_lote(items, actor) -> pone hasta len(items); devuelve cuántos puso
+#   sacar_lote(k, actor)     -> saca entre 1 y k; devuelve la lista de items
+# y avisan cada item puesto / sacado a la simulación (sim.items_puestos /
+# sim.items_sacados) dentro de su sección crítica, antes de liberar el
+# semáforo que lo hace visible al otro lado.
+
+class BufferUnLock:
+    # Cola circular clásica: dos semáforos contadores y UN mutex que protege
+    # los dos índices. Productores y consumidores compiten por el mismo lock.
+    def __init__(self, sim, capacidad):
+        self.sim = sim
+        self.capacidad = capacidad
+        self.slots = [None] * capacidad # None = Vacío; si no, número de item
+        self.sem_espacios_vacios = sim.entorno.Semaphore(capacidad, "sem_espacios_vacios")
+        self.sem_items_disponibles = sim.entorno.Semaphore(0, "sem_items_disponibles")
+        self.crear_locks()
+
+        # Índices para comportamiento FIFO (Cola Circular)
+        self.idx_productor = 0
+        self.idx_consumidor = 0
+
+    def crear_locks(self):
+        # lock_cola protege idx_productor y lock_cabeza idx_consumidor; acá
+        # son el mismo mutex
+        self.mutex = self.sim.entorno.Lock("mutex")
+        self.lock_cola = self.lock_cabeza = self.mutex
+
+    def poner(self, item, actor):
+        yield self.sem_espacios_vacios
+        with self.lock_cola:
+            # Producir en la posición actual (Circular)
+            idx = self.idx_productor
+            self.slots[idx] = item
+            self.sim.items_puestos(actor, idx, (item,))
+            self.idx_productor = (idx + 1) % self.capacidad
+        self.sem_items_disponibles.release() # Avisar que hay item
+        return idx
+
+    def sacar(self, actor):
+        yield self.sem_items_disponibles
+        with self.lock_cabeza:
+            idx = self.idx_consumidor
+            item = self.slots[idx]
+            self.slots[idx] = None
+            self.sim.items_sacados(actor, idx, (item,))
+            self.idx_consumidor = (idx + 1) % self.capacidad
+        self.sem_espacios_vacios.release() # Avisar que hay espacio
+        return idx, item
+
+    # --- POR LOTES ---
+    # Un acquire por lotes, una sola sección crítica y un release(n) para
+    # hasta k items; el tramo contiguo del anillo se copia con a lo sumo dos
+    # slices (dos si da la vuelta).
+    def poner_lote(self, items, actor):
+        pedido = self.sem_espacios_vacios.hasta(len(items))
+        yield pedido
+        n = pedido.obtenidos
+        cap = self.capacidad
+        with self.lock_cola:
+            idx = self.idx_productor
+            fin = idx + n
+            if fin <= cap:
+                self.slots[idx:fin] = items[:n]
+            else:
+                primera = cap - idx
+                self.slots[idx:] = items[:primera]
+                self.slots[:fin - cap] = items[primera:n]
+            self.sim.items_puestos(actor, idx, items[:n])
+            self.idx_productor = fin % cap
+        self.sem_items_disponibles.release(n)
+        return n
+
+    def sacar_lote(self, k, actor):
+        pedido = self.sem_items_disponibles.hasta(k)
+        yield pedido
+        n = pedido.obtenidos
+        cap = self.capacidad
+        with self.lock_cabeza:
+            idx = self.idx_consumidor
+            fin = idx + n
+            if fin <= cap:
+                items = self.slots[idx:fin]
+                self.slots[idx:fin] = [None] * n
+            else:
+                items = self.slots[idx:] + self.slots[:fin - cap]
+                self.slots[idx:] = [None] * (cap - idx)
+                self.slots[:fin - cap] = [None] * (fin - cap)
+            self.sim.items_sacados(actor, idx, items)
+            self.idx_consumidor = fin % cap
+        self.sem_espacios_vacios.release(n)
+        return items
+
+class BufferDosLocks(BufferUnLock):
+    # Cola de dos locks: los productores solo tocan la cola (idx_productor) y
+    # los consumidores solo la cabeza (idx_consumidor). Los semáforos ya
+    # garantizan que nunca usan el mismo slot a la vez, así que un productor
+    # y un consumidor no se bloquean entre sí.
+    def crear_locks(self):
+        # Sin el mutex de BufferUnLock: no se usaría y aparecería en cero en
+        # las mediciones de contención
+        self.lock_cola = self.sim.entorno.Lock("lock_cola")
+        self.lock_cabeza = self.sim.entorno.Lock("lock_cabeza")
+
+class BufferPorSlot:
+    # Anillo repartido por slot: cada actor saca un "ticket" de un contador
+    # atómico (sin lock) que lo asigna a un slot, y solo se sincroniza con ese
+    # slot (semáforos vacío/lleno propios). Actores en slots distintos no
+    # comparten ninguna primitiva. El orden FIFO es aproximado cuando hay más
+    # actores que slots.
+    def __init__(self, sim, capacidad):
+        self.sim = sim
+        self.capacidad = capacidad
+        self.slots = [None] * capacidad
+        self.vacio = [sim.entorno.Semaphore(1, f"vacio[{i}]") for i in range(capacidad)]
+        self.lleno = [sim.entorno.Semaphore(0, f"lleno[{i}]") for i in range(capacidad)]
+        self._tickets_prod = itertools.count()
+        self._tickets_cons = itertools.count()
+
+    def poner(self, item, actor):
+        idx = next(self._tickets_prod) % self.capacidad
+        yield self.vacio[idx]
+        self.slots[idx] = item
+        self.sim.items_puestos(actor, idx, (item,))
+        self.lleno[idx].release()
+        return idx
+
+    def sacar(self, actor):
+        idx = next(self._tickets_cons) % self.capacidad
+        yield self.lleno[idx]
+        item = self.slots[idx]
+        self.slots[idx] = None
+        self.sim.items_sacados(actor, idx, (item,))
+        self.vacio[idx].release()
+        return idx, item
+
+    # Cada slot tiene sus propios semáforos, así que no hay tramo contiguo que
+    # mover de una vez: los lotes se degradan a un item por operación.
+    def poner_lote(self, items, actor):
+        yield from self.poner(items[0], actor)
+        return 1
+
+    def sacar_lote(self, k, actor):
+        _, item = yield from self.sacar(actor)
+        return [item]
+
+BUFFERS = {"un_lock": BufferUnLock, "dos_locks": BufferDosLocks, "por_slot": BufferPorSlot}
+
+class ProductorConsumidor(Simulacion):
+    EVENTOS = (PRODUCTOR_ESPERA, PRODUCTOR_TRABAJA, ITEM_PRODUCIDO,
+               CONSUMIDOR_ESPERA, CONSUMIDOR_TRABAJA, ITEM_CONSUMIDO)
+
+    def __init__(self, capacidad=CAPACIDAD_BUFFER, entorno=None, semilla=None,
+                 productores=NUM_PRODUCTORES, consumidores=NUM_CONSUMIDORES,
+                 tipo_buffer=TIPO_BUFFER, tiempo_producir=TIEMPO_PRODUCIR,
+                 tiempo_consumir=TIEMPO_CONSUMIR, lote=TAMANO_LOTE):
+        super().__init__(entorno, semilla)
+        if self.entorno.virtual and tiempo_producir[1] <= 0 and tiempo_consumir[1] <= 0:
+            # Nadie duerme nunca: con reloj virtual los actores se pasarían el
+            # control en el mismo instante para siempre y ejecutar() no volvería
+            raise ValueError("con reloj virtual tiempo_producir y tiempo_consumir no pueden ser ambos 0 "
+                             "(el reloj no avanzaría); el caso sin trabajo se mide con hilos")
+        self.capacidad = capacidad
+        self.productores = productores
+        self.consumidores = consumidores
+        self.tipo_buffer = tipo_buffer
+        self.tiempo_producir = tiempo_producir
+        self.tiempo_consumir = tiempo_consumir
+        self.lote = lote
+
+        # Variables compartidas
+        self.cola = BUFFERS[tipo_buffer](self, capacidad)
+        self.buffer = self.cola.slots # Lo leen las vistas
+        self._items = itertools.count(1) # Numeración global de items (next() es atómico)
+
+        # Estado observable de los actores
+        self.estado_productores = [TRABAJANDO] * productores
+        self.estado_consumidores = [TRABAJANDO] * consumidores
+        # Contadores por actor: cada uno escribe solo el suyo, sin carreras
+        self.producidos_por = [0] * productores
+        self.consumidos_por = [0] * consumidores
+
+        # Métricas del buffer, de memoria fija: latencia de cada item (de
+        # poner a sacar, por consumidor), segundos que cada actor pasa
+        # bloqueado esperando lugar / items y ocupación ponderada por tiempo.
+        # La ocupación es lo único que escriben productores y consumidores a
+        # la vez: una suma bajo un lock propio que no se cruza con las
+        # primitivas del buffer.
+        self.entrada = [0.0] * capacidad # Cuándo se puso el item de cada slot
+        self.latencia = [HistogramaLog() for _ in range(consumidores)]
+        self.bloqueado_productores = [0.0] * productores
+        self.bloqueado_consumidores = [0.0] * consumidores
+        self.ocupados = 0
+        self.ocupacion_tiempo = HistogramaTiempo(capacidad)
+        self._lock_ocupacion = threading.Lock()
+        self.inicio = 0.0
+
+    def actores(self):
+        self.inicio = self.entorno.ahora()
+        self.ocupacion_tiempo.ultimo = self.inicio
+        return ([self.proceso_productor(p) for p in range(self.productores)] +
+                [self.proceso_consumidor(c) for c in range(self.consumidores)])
+
+    @property
+    def producidos(self):
+        return sum(self.producidos_por)
+
+    @property
+    def consumidos(self):
+        return sum(self.consumidos_por)
+
+    def parametros(self):
+        return {"capacidad": self.capacidad, "productores": self.productores,
+                "consumidores": self.consumidores, "tipo_buffer": self.tipo_buffer}
+
+    # --- MÉTRICAS DEL BUFFER ---
+    # Las llaman los buffers con el slot ya escrito / vaciado y antes del
+    # release que lo publica, así un item siempre se suma antes de restarse.
+    # El reloj se lee con _lock_ocupacion tomado: leído antes, dos hilos
+    # podrían llegar a cambiar() con los tiempos invertidos y restarle tiempo
+    # a la distribución.
+    def items_puestos(self, actor, idx, items):
+        cap = self.capacidad
+        with self._lock_ocupacion:
+            ahora = self.entorno.ahora()
+            self.ocupados += len(items)
+            self.ocupacion_tiempo.cambiar(ahora, self.ocupados)
+        for i in range(len(items)):
+            self.entrada[(idx + i) % cap] = ahora
+        if self.observado():
+            for i, item in enumerate(items):
+                self.notificar(ITEM_PRODUCIDO, actor, (idx + i) % cap, item)
+
+    def items_sacados(self, actor, idx, items):
+        cap = self.capacidad
+        with self._lock_ocupacion:
+            ahora = self.entorno.ahora()
+            self.ocupados -= len(items)
+            self.ocupacion_tiempo.cambiar(ahora, self.ocupados)
+        latencia = self.latencia[actor]
+        for i in range(len(items)):
+            latencia.registrar(ahora - self.entrada[(idx + i) % cap])
+        if self.observado():
+            for i, item in enumerate(items):
+                self.notificar(ITEM_CONSUMIDO, actor, (idx + i) % cap, item)
+
+    def metricas_buffer(self):
+        # Totales combinados; se puede llamar a mitad de corrida (vistas)
+        ahora = self.tiempo_medido()
+        with self._lock_ocupacion:
+            self.ocupacion_tiempo.cerrar(ahora)
+            ocupacion_media = self.ocupacion_tiempo.media()
+            distribucion = self.ocupacion_tiempo.distribucion()
+        latencia = HistogramaLog()
+        for h in self.latencia:
+            latencia.combinar(h)
+        transcurrido = max(ahora - self.inicio, 1e-9)
+        # Fracción del tiempo que el actor medio pasó bloqueado
+        bloqueo = {"productores": round(sum(self.bloqueado_productores) / (transcurrido * self.productores), 4),
+                   "consumidores": round(sum(self.bloqueado_consumidores) / (transcurrido * self.consumidores), 4)}
+        return {"latencia": latencia, "ocupacion_media": ocupacion_media,
+                "ocupacion_distribucion": distribucion, "bloqueo": bloqueo}
+
+    def resumen(self):
+        r = super().resumen()
+        r.update(tipo_buffer=self.tipo_buffer, lote=self.lote, productores=self.productores,
+                 consumidores=self.consumidores, producidos=self.producidos,
+                 consumidos=self.consumidos, ocupacion=self.producidos - self.consumidos)
+        r.update(self.por_segundo(("producidos", "consumidos")))
+        m = self.metricas_buffer()
+        r["latencia"] = m["latencia"].resumen()
+        r["ocupacion_media"] = round(m["ocupacion_media"], 4)
+        with self._lock_ocupacion:
+            r["ocupacion_distribucion"] = self.ocupacion_tiempo.distribucion_agrupada()
+        r["bloqueo_productores"] = m["bloqueo"]["productores"]
+        r["bloqueo_consumidores"] = m["bloqueo"]["consumidores"]
+        return r
+
+    # --- LÓGICA ---
+    def proceso_productor(self, id_productor):
+        if self.lote > 1:
+            yield from self.proceso_productor_lotes(id_productor)
+            return
+        rng = self.rng_actor("productor", id_productor)
+        while self.running:
+            # Intentar producir (Si buffer lleno, se bloquea)
+            self.estado_productores[id_productor] = ESPERANDO
+            self.notificar(PRODUCTOR_ESPERA, id_productor)
+
+            desde = self.entorno.ahora()
+            yield from self.cola.poner(next(self._items), id_productor)
+            self.bloqueado_productores[id_productor] += self.entorno.ahora() - desde
+
+            self.estado_productores[id_productor] = TRABAJANDO
+            self.notificar(PRODUCTOR_TRABAJA, id_productor)
+            self.producidos_por[id_productor] += 1
+
+            # Simular tiempo de producción real
+            if self.tiempo_producir[1] > 0:
+                yield rng.uniform(*self.tiempo_producir)
+
+    def proceso_consumidor(self, id_consumidor):
+        if self.lote > 1:
+            yield from self.proceso_consumidor_lotes(id_consumidor)
+            return
+        rng = self.rng_actor("consumidor", id_consumidor)
+        while self.running:
+            # Intentar consumir (Si buffer vacío, se bloquea)
+            self.estado_consumidores[id_consumidor] = ESPERANDO
+            self.notificar(CONSUMIDOR_ESPERA, id_consumidor)
+
+            desde = self.entorno.ahora()
+            yield from self.cola.sacar(id_consumidor)
+            self.bloqueado_consumidores[id_consumidor] += self.entorno.ahora() - desde
+
+            self.estado_consumidores[id_consumidor] = TRABAJANDO
+            self.notificar(CONSUMIDOR_TRABAJA, id_consumidor)
+            self.consumidos_por[id_consumidor] += 1
+
+            # Simular tiempo de consumo
+            if self.tiempo_consumir[1] > 0:
+                yield rng.uniform(*self.tiempo_consumir)
+
+    # --- LÓGICA POR LOTES ---
+    def proceso_productor_lotes(self, id_productor):
+        rng = self.rng_actor("productor", id_productor)
+        pendientes = []
+        while self.running:
+            # Completar el lote con items nuevos (tiempo de producción por item)
+            faltan = self.lote - len(pendientes)
+            pendientes.extend(next(self._items) for _ in range(faltan))
+            if self.tiempo_producir[1] > 0:
+                yield sum(rng.uniform(*self.tiempo_producir) for _ in range(faltan))
+
+            self.estado_productores[id_productor] = ESPERANDO
+            self.notificar(PRODUCTOR_ESPERA, id_productor)
+
+            desde = self.entorno.ahora()
+            n = yield from self.cola.poner_lote(pendientes, id_productor)
+            self.bloqueado_productores[id_productor] += self.entorno.ahora() - desde
+            del pendientes[:n] # Lo que no entró va en el próximo lote
+
+            self.estado_productores[id_productor] = TRABAJANDO
+            self.notificar(PRODUCTOR_TRABAJA, id_productor)
+            self.producidos_por[id_productor] += n
+
+    def proceso_consumidor_lotes(self, id_consumidor):
+        rng = self.rng_actor("consumidor", id_consumidor)
+        while self.running:
+            self.estado_consumidores[id_consumidor] = ESPERANDO
+            self.notificar(CONSUMIDOR_ESPERA, id_consumidor)
+
+            desde = self.entorno.ahora()
+            items = yield from self.cola.sacar_lote(self.lote, id_consumidor)
+            self.bloqueado_consumidores[id_consumidor] += self.entorno.ahora() - desde
+
+            self.estado_consumidores[id_consumidor] = TRABAJANDO
+            self.notificar(CONSUMIDOR_TRABAJA, id_consumidor)
+            self.consumidos_por[id_consumidor] += len(items)
+
+            if self.tiempo_consumir[1] > 0:
+                yield sum(rng.uniform(*self.tiempo_consumir) for _ in items)
+
+# --- BENCHMARK DE CONTENCIÓN ---
+def benchmark_buffers(tipos=tuple(BUFFERS), hilos=(1, 2, 4, 8), duracion=2.0,
+                      capacidad=CAPACIDAD_BUFFER, tiempo=(0.0, 0.0), lote=TAMANO_LOTE):
+    # items/s con hilos reales para cada implementación y cada cantidad de
+    # productores (= consumidores). tiempo=(0, 0) mide solo sincronización.
+    resultados = []
+    for tipo in tipos:
+        for n in hilos:
+            sim = ProductorConsumidor(capacidad, EntornoHilos(), productores=n, consumidores=n,
+                                      tipo_buffer=tipo, tiempo_producir=tiempo, tiempo_consumir=tiempo,
+                                      lote=lote)
+            sim.ejecutar(duracion)
+            consumidos = sim.consumidos
+            resultados.append({"buffer": tipo, "hilos": n, "lote": lote,
+                               "items_por_s": round(consumidos / duracion, 1)})
+    return resultados
+
+def benchmark_cli(argv):
+    import argparse
+    parser = argparse.ArgumentParser(description="Benchmark de implementaciones del buffer acotado")
+    parser.add_argument("--buffers", nargs="+", choices=list(BUFFERS), default=list(BUFFERS))
+    parser.add_argument("--hilos", nargs="+", type=int, default=[1, 2, 4, 8],
+                        help="productores (= consumidores) por corrida")
+    parser.add_argument("-d", "--duracion", type=float, default=2.0)
+    parser.add_argument("--capacidad", type=int, default=CAPACIDAD_BUFFER)
+    parser.add_argument("--lotes", nargs="+", type=int, default=[TAMANO_LOTE],
+                        help="tamaños de lote a comparar")
+    args = parser.parse_args(argv)
+    print(f"{'buffer':<10} {'hilos':>5} {'lote':>5} {'items/s':>12}")
+    for lote in args.lotes:
+        for r in benchmark_buffers(args.buffers, args.hilos, args.duracion, args.capacidad, lote=lote):
+            print(f"{r['buffer']:<10} {r['hilos']:>5} {r['lote']:>5} {r['items_por_s']:>12,.1f}")
+
+# --- RÉPLICA (reproducción de trazas) ---
+# Contenido del buffer y estado de los actores reconstruidos solo a partir de
+# los eventos (ver reproduccion.py): sin buffer real ni procesos.
+class ReplicaProductor(Simulacion):
+    EVENTOS = ProductorConsumidor.EVENTOS
+
+    def __init__(self, capacidad=CAPACIDAD_BUFFER, productores=NUM_PRODUCTORES,
+                 consumidores=NUM_CONSUMIDORES, tipo_buffer=TIPO_BUFFER):
+        super().__init__(EntornoReproduccion())
+        self.capacidad = capacidad
+        self.productores = productores
+        self.consumidores = consumidores
+        self.tipo_buffer = tipo_buffer
+        self.buffer = [None] * capacidad
+        self.estado_productores = [TRABAJANDO] * productores
+        self.estado_consumidores = [TRABAJANDO] * consumidores
+
+    def actores(self):
+        return []
+
+    def aplicar(self, evento, actor, recurso, dato):
+        if evento == ITEM_PRODUCIDO:
+            self.buffer[recurso] = dato
+        elif evento == ITEM_CONSUMIDO:
+            self.buffer[recurso] = None
+        elif evento == PRODUCTOR_ESPERA:
+            self.estado_productores[actor] = ESPERANDO
+        elif evento == PRODUCTOR_TRABAJA:
+            self.estado_productores[actor] = TRABAJANDO
+        elif evento == CONSUMIDOR_ESPERA:
+            self.estado_consumidores[actor] = ESPERANDO
+        elif evento == CONSUMIDOR_TRABAJA:
+            self.estado_consumidores[actor] = TRABAJANDO
+
+    def estado(self):
+        return [list(self.buffer), list(self.estado_productores), list(self.estado_consumidores)]
+
+    def restaurar(self, estado):
+        self.buffer[:], self.estado_productores[:], self.estado_consumidores[:] = estado
+
+if __name__ == "__main__":
+    import sys
+    if sys.argv[1:2] == ["benchmark"]:
+        # python productor_sim.py benchmark --hilos 1 2 4 8
+        benchmark_cli(sys.argv[2:])
+    else:
+        ejecutar_cli(ProductorConsumidor, "Productor - Consumidor sin GUI", {
+            "capacidad": dict(type=int, help="slots del buffer"),
+            "productores": dict(type=int),
+            "consumidores": dict(type=int),
+            "tipo_buffer": dict(choices=list(BUFFERS), help="implementación del buffer"),
+            "tiempo_producir": dict(type=float, nargs=2, metavar=("MIN", "MAX")),
+            "tiempo_consumir": dict(type=float, nargs=2, metavar=("MIN", "MAX")),
+            "lote": dict(type=int, help="items por sección crítica"),
+        })
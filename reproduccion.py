@@ -0,0 +1,272 @@
+import json
+import mmap
+import os
+import struct
+import tempfile
+
+from traza import REGISTRO, LARGO, leer_cabecera
+from barbero_sim import ReplicaBarberia
+from filosofos_sim import ReplicaFilosofos
+from productor_sim import ReplicaProductor
+
+# --- REPRODUCCIÓN DE TRAZAS ---
+# Una traza (ver traza.py) se reproduce sobre una "réplica" del problema: un
+# objeto con el mismo estado observable que el motor (lo que leen las
+# vistas) que se actualiza aplicando los eventos grabados, sin hilos ni
+# primitivas. Las vistas la usan en lugar del motor.
+#
+# El archivo se mapea en memoria (mmap) y cada registro se lee con
+# unpack_from en su offset, así que tocar el registro i cuesta lo mismo al
+# principio que al final de una traza de varios GB. Para saltar a un tiempo
+# cualquiera sin re-aplicar todo desde el comienzo se guardan "claves":
+# instantáneas del estado de la réplica cada INTERVALO_CLAVE registros.
+# Saltar es entonces una búsqueda binaria del registro, restaurar la clave
+# anterior y aplicar a lo sumo INTERVALO_CLAVE eventos.
+#
+# Las claves se calculan con una pasada completa la primera vez y se guardan
+# junto a la traza (RUTA.idx, ver IndiceClaves); se recalculan si la traza
+# cambió.
+
+INTERVALO_CLAVE = 16384     # Registros entre instantáneas del estado
+MAX_EVENTOS_FRAME = 2000    # Más eventos que esto en un frame se saltan (sin notificar)
+EXTENSION_INDICE = ".idx"
+MAGIA_INDICE = b"IDX1"
+DESPLAZAMIENTO = struct.Struct("<Q")
+
+REPLICAS = {"Barberia": ReplicaBarberia, "CenaFilosofos": ReplicaFilosofos,
+            "ProductorConsumidor": ReplicaProductor}
+
+class TrazaMapeada:
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self._archivo = open(ruta, "rb")
+        self.cabecera, self.offset = leer_cabecera(self._archivo)
+        self.eventos = self.cabecera["eventos"]
+        self.meta = self.cabecera["meta"]
+        stat = os.fstat(self._archivo.fileno())
+        self.firma = [stat.st_size, stat.st_mtime_ns] # Para validar el índice guardado
+        # Una cola truncada (corrida cortada) no cuenta como registro
+        self.registros = (stat.st_size - self.offset) // REGISTRO.size
+        self._mapa = mmap.mmap(self._archivo.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def registro(self, i):
+        # -> (tiempo, actor, código de evento, recurso, dato)
+        return REGISTRO.unpack_from(self._mapa, self.offset + i * REGISTRO.size)
+
+    def tiempo(self, i):
+        return REGISTRO.unpack_from(self._mapa, self.offset + i * REGISTRO.size)[0]
+
+    def rango(self, desde, hasta):
+        # Registros [desde, hasta) como tuplas, leídos de a un bloque contiguo
+        inicio = self.offset + desde * REGISTRO.size
+        return REGISTRO.iter_unpack(self._mapa[inicio:self.offset + hasta * REGISTRO.size])
+
+    def indice_de_tiempo(self, t):
+        # Primer registro con tiempo > t (búsqueda binaria). Con hilos los
+        # registros pueden venir levemente desordenados en el tiempo; el
+        # resultado es entonces aproximado en esos pocos microsegundos.
+        bajo, alto = 0, self.registros
+        while bajo < alto:
+            medio = (bajo + alto) // 2
+            if self.tiempo(medio) <= t:
+                bajo = medio + 1
+            else:
+                alto = medio
+        return bajo
+
+    def cerrar(self):
+        self._mapa.close()
+        self._archivo.close()
+
+# --- ÍNDICE DE CLAVES ---
+# Con muchas claves de una traza de varios GB, tenerlas todas deserializadas
+# ocuparía cientos de MB de objetos de Python. El archivo se mapea y solo se
+# deserializa la clave a la que se salta:
+#
+#     MAGIA_INDICE | largo (uint32) | JSON {"firma", "intervalo", "claves"}
+#     | claves + 1 desplazamientos (uint64) | clave 0 (JSON) | clave 1 | ...
+#
+# La clave k ocupa los bytes entre los desplazamientos k y k + 1.
+
+class IndiceClaves:
+    def __init__(self, archivo, claves, tabla):
+        # archivo ya escrito; tabla = offset de los desplazamientos
+        self.claves = claves
+        self._tabla = tabla
+        self._mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        archivo.close() # El mapa conserva su propio descriptor
+
+    @classmethod
+    def abrir(cls, ruta, firma, intervalo):
+        # El índice guardado, o None si falta, es de otra traza o intervalo,
+        # o tiene otro formato (p. ej. el JSON de versiones anteriores)
+        try:
+            archivo = open(ruta, "rb")
+        except OSError:
+            return None
+        try:
+            if archivo.read(len(MAGIA_INDICE)) != MAGIA_INDICE:
+                raise ValueError("no es un índice de claves")
+            (largo,) = LARGO.unpack(archivo.read(LARGO.size))
+            cabecera = json.loads(archivo.read(largo).decode("utf-8"))
+            if cabecera.get("firma") != firma or cabecera.get("intervalo") != intervalo:
+                raise ValueError("índice de otra traza")
+            return cls(archivo, cabecera["claves"], archivo.tell())
+        except (ValueError, struct.error):
+            archivo.close()
+            return None
+
+    @classmethod
+    def escribir(cls, archivo, firma, intervalo, claves, cantidad):
+        # Escribe las `cantidad` claves del iterable de a una (sin juntarlas
+        # en memoria) en un archivo abierto "w+b" y lo devuelve como índice
+        cabecera = json.dumps({"firma": firma, "intervalo": intervalo, "claves": cantidad}).encode("utf-8")
+        archivo.write(MAGIA_INDICE + LARGO.pack(len(cabecera)) + cabecera)
+        tabla = archivo.tell()
+        archivo.write(bytes(DESPLAZAMIENTO.size * (cantidad + 1)))
+        desplazamientos = []
+        for clave in claves:
+            desplazamientos.append(archivo.tell())
+            archivo.write(json.dumps(clave, separators=(",", ":")).encode("utf-8"))
+        desplazamientos.append(archivo.tell())
+        archivo.seek(tabla)
+        archivo.write(b"".join(DESPLAZAMIENTO.pack(d) for d in desplazamientos))
+        archivo.flush()
+        return cls(archivo, cantidad, tabla)
+
+    def __len__(self):
+        return self.claves
+
+    def __getitem__(self, k):
+        if not 0 <= k < self.claves:
+            raise IndexError(k)
+        posicion = self._tabla + k * DESPLAZAMIENTO.size
+        (inicio,) = DESPLAZAMIENTO.unpack_from(self._mapa, posicion)
+        (fin,) = DESPLAZAMIENTO.unpack_from(self._mapa, posicion + DESPLAZAMIENTO.size)
+        return json.loads(self._mapa[inicio:fin])
+
+    def cerrar(self):
+        self._mapa.close()
+
+class Reproductor:
+    def __init__(self, ruta, intervalo=INTERVALO_CLAVE):
+        self.traza = TrazaMapeada(ruta)
+        meta = self.traza.meta
+        if meta.get("problema") not in REPLICAS:
+            raise ValueError(f"no se sabe reproducir el problema {meta.get('problema')!r}")
+        if "parametros" not in meta:
+            raise ValueError("la traza no guarda los parámetros de la simulación (grabada con una versión anterior)")
+        self.sim = REPLICAS[meta["problema"]](**meta["parametros"])
+        self.intervalo = intervalo
+        self.claves = self.cargar_indice() or self.construir_indice()
+
+        n = self.traza.registros
+        self.desde = self.traza.tiempo(0) if n else 0.0
+        self.hasta = self.traza.tiempo(n - 1) if n else 0.0
+        self.velocidad = 1.0
+        self.reproduciendo = False
+        self.tiempo = self.desde
+        # Construir el índice deja la réplica en el estado final: se vuelve
+        # al inicial antes de aplicar desde el registro 0
+        self.sim.restaurar(self.claves[0])
+        self.posicion = 0               # Próximo registro a aplicar
+        self.ir_a(self.desde)
+
+    # --- ÍNDICE DE CLAVES ---
+    def _estados(self):
+        # Una pasada por toda la traza: clave k = estado tras aplicar los
+        # primeros k * intervalo registros
+        sim, eventos, intervalo = self.sim, self.traza.eventos, self.intervalo
+        reloj = sim.entorno
+        yield sim.estado()
+        n = self.traza.registros
+        for bloque in range(0, n, intervalo):
+            for t, actor, codigo, recurso, dato in self.traza.rango(bloque, min(n, bloque + intervalo)):
+                reloj.tiempo = t
+                sim.aplicar(eventos[codigo], actor, recurso, dato)
+            if bloque + intervalo <= n:
+                yield sim.estado()
+
+    def construir_indice(self):
+        # Se escribe a un temporal y se renombra, así un índice a medio
+        # escribir (corte, disco lleno) nunca pasa por válido
+        ruta = self.traza.ruta + EXTENSION_INDICE
+        cantidad = self.traza.registros // self.intervalo + 1
+        try:
+            archivo = open(ruta + ".tmp", "w+b")
+        except OSError:
+            archivo = tempfile.TemporaryFile() # Directorio de solo lectura: se recalcula la próxima vez
+            ruta = None
+        indice = IndiceClaves.escribir(archivo, self.traza.firma, self.intervalo, self._estados(), cantidad)
+        if ruta is not None:
+            os.replace(ruta + ".tmp", ruta)
+        return indice
+
+    def cargar_indice(self):
+        return IndiceClaves.abrir(self.traza.ruta + EXTENSION_INDICE, self.traza.firma, self.intervalo)
+
+    # --- NAVEGACIÓN ---
+    def _aplicar(self, hasta, notificar):
+        sim, eventos, reloj = self.sim, self.traza.eventos, self.sim.entorno
+        for t, actor, codigo, recurso, dato in self.traza.rango(self.posicion, hasta):
+            evento = eventos[codigo]
+            reloj.tiempo = t
+            sim.aplicar(evento, actor, recurso, dato)
+            if notificar:
+                sim.notificar(evento, actor, recurso, dato)
+        self.posicion = hasta
+
+    def ir_a(self, t):
+        # Salto sin notificar: clave anterior + los eventos que faltan
+        t = min(max(t, self.desde), self.hasta)
+        destino = self.traza.indice_de_tiempo(t)
+        if not self.posicion <= destino < self.posicion + self.intervalo:
+            # Hacia atrás o lejos hacia adelante: restaurar desde una clave
+            k = destino // self.intervalo
+            self.sim.restaurar(self.claves[k])
+            self.posicion = k * self.intervalo
+        self._aplicar(destino, False)
+        self.tiempo = self.sim.entorno.tiempo = t
+
+    def avanzar(self, dt):
+        # dt segundos reales de reproducción; los eventos del tramo se
+        # notifican (la bitácora de la vista los muestra) salvo que sean
+        # demasiados para un frame, en cuyo caso se salta
+        if not self.reproduciendo:
+            return
+        t = min(self.tiempo + dt * self.velocidad, self.hasta)
+        destino = self.traza.indice_de_tiempo(t)
+        if destino - self.posicion > MAX_EVENTOS_FRAME:
+            self.ir_a(t)
+        else:
+            self._aplicar(destino, True)
+            self.tiempo = self.sim.entorno.tiempo = t
+        if t >= self.hasta:
+            self.reproduciendo = False
+
+    def cerrar(self):
+        self.claves.cerrar()
+        self.traza.cerrar()
+
+def main(argv=None):
+    # Prueba sin GUI: construye (o valida) el índice y mide un salto
+    import argparse
+    import time
+    parser = argparse.ArgumentParser(description="Índice de claves y saltos sobre una traza")
+    parser.add_argument("ruta")
+    parser.add_argument("--ir-a", type=float, metavar="T", help="tiempo al que saltar")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    reproductor = Reproductor(args.ruta)
+    print(f"{reproductor.traza.registros} registros, {len(reproductor.claves)} claves, "
+          f"t = {reproductor.desde:.3f} .. {reproductor.hasta:.3f} ({time.perf_counter() - t0:.3f} s)")
+    if args.ir_a is not None:
+        t0 = time.perf_counter()
+        reproductor.ir_a(args.ir_a)
+        print(f"salto a t={args.ir_a}: {1000 * (time.perf_counter() - t0):.2f} ms")
+        print(reproductor.sim.estado())
+    reproductor.cerrar()
+
+if __name__ == "__main__":
+    main()
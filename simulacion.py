@@ -0,0 +1,708 @@
+import threading
+import asyncio
+import time
+import random
+import heapq
+import itertools
+import weakref
+from collections import deque
+
+# --- NÚCLEO COMÚN DE LAS SIMULACIONES ---
+# Cada problema clásico se modela como un "motor" sin ninguna dependencia de
+# Tkinter. La lógica de sincronización vive aquí; las vistas (o cualquier otro
+# consumidor: consola, métricas, trazas) se suscriben como observadores y
+# reciben cada transición de estado como un evento:
+#
+#     observador(evento, actor, recurso, dato)
+#
+#   evento  -> constante del módulo del problema (p. ej. CLIENTE_SIENTA)
+#   actor   -> índice del hilo que provoca el evento (cliente, filósofo...)
+#   recurso -> silla / tenedor / slot involucrado (-1 si no aplica)
+#   dato    -> valor extra del evento (-1 si no aplica)
+#
+# Los observadores se ejecutan en el hilo del actor, así que deben ser
+# rápidos y no tocar widgets directamente.
+#
+# --- PROCESOS Y ENTORNOS ---
+# Cada actor se escribe UNA sola vez como generador ("proceso") que cede el
+# control cuando tendría que bloquearse:
+#
+#     yield 1.5                 -> dormir 1.5 segundos
+#     yield self.sem_algo       -> acquire() del semáforo / lock
+#     pedido = sem.hasta(k)     -> acquire por lotes: bloquea hasta que haya
+#     yield pedido                 al menos 1 permiso y toma hasta k de una
+#     n = pedido.obtenidos         vez (se devuelven con sem.release(n))
+#
+# Los release() y los `with mutex:` (sin yield dentro) se llaman directo.
+# Quién interpreta esos yield es el entorno:
+#   * EntornoHilos: un hilo por proceso, esperas reales y primitivas de
+#     threading. Es el modo de la demo visual.
+#   * EntornoVirtual: simulación de eventos discretos con reloj virtual y un
+#     calendario de eventos (cola de prioridad). Un solo hilo, sin esperas
+#     reales y reproducible para una semilla dada.
+#   * EntornoAsyncio: tiempo real, pero cada proceso es una corrutina de un
+#     único event loop. Crear un actor cuesta una Task, no un hilo del SO, así
+#     que se sostienen muchos más actores concurrentes que con hilos.
+#
+# --- DETENCIÓN Y REINICIO ---
+# detener() corta la corrida de verdad: en modo hilos despierta a todos los
+# procesos dormidos o bloqueados en una primitiva (la espera lanza Cancelado
+# y el generador se cierra) y une cada hilo, con un tiempo máximo. reiniciar()
+# vuelve a construir el estado en el mismo objeto para correr otra vez sin
+# crear la simulación (ni la ventana) de nuevo.
+
+PASO_CANCELACION = 0.1  # Cada cuánto mira la cancelación un hilo bloqueado en un Lock
+ESPERA_DETENER = 2.0    # Segundos máximos para unir los hilos al detener
+
+class Cancelado(Exception):
+    # La espera de un proceso se interrumpió porque el entorno se detuvo
+    pass
+
+class PedidoLote:
+    # Acquire de hasta k permisos en una sola operación (ver sem.hasta(k))
+    __slots__ = ("semaforo", "k", "obtenidos")
+
+    def __init__(self, semaforo, k):
+        self.semaforo = semaforo
+        self.k = k
+        self.obtenidos = 0
+
+    def acquire(self):
+        # Modo hilos: bloqueante
+        self.obtenidos = self.semaforo.adquirir_hasta(self.k)
+
+class SemaforoHilos(threading.Semaphore):
+    # threading.Semaphore + acquire por lotes (release(n) ya existe) + espera
+    # cancelable: `cancelado` es el Event del entorno y despertar() saca de
+    # la espera a todos para que lo vean
+    def __init__(self, valor=1, cancelado=None):
+        super().__init__(valor)
+        self._cancelado = cancelado
+
+    def acquire(self, blocking=True, timeout=None):
+        # Como el de threading, pero una espera cancelada lanza Cancelado
+        limite = None
+        with self._cond:
+            while self._value == 0:
+                if self._cancelado is not None and self._cancelado.is_set():
+                    raise Cancelado()
+                if not blocking:
+                    return False
+                if timeout is not None:
+                    if limite is None:
+                        limite = time.monotonic() + timeout
+                    else:
+                        timeout = limite - time.monotonic()
+                        if timeout <= 0:
+                            return False
+                self._cond.wait(timeout)
+            self._value -= 1
+            return True
+
+    __enter__ = acquire
+
+    def hasta(self, k):
+        return PedidoLote(self, k)
+
+    def adquirir_hasta(self, k):
+        with self._cond:
+            while self._value == 0:
+                if self._cancelado is not None and self._cancelado.is_set():
+                    raise Cancelado()
+                self._cond.wait()
+            n = min(k, self._value)
+            self._value -= n
+            return n
+
+    def disponibles(self):
+        # Lectura sin lock: solo para estadísticas
+        return self._value
+
+    def despertar(self):
+        with self._cond:
+            self._cond.notify_all()
+
+TIPO_LOCK = type(threading.Lock())
+
+class LockHilos:
+    # threading.Lock con espera cancelable, para cuando el entorno lo envuelve
+    # (contención, vigilante): un Lock de C no se puede despertar desde
+    # afuera, así que el que se bloquea espera de a PASO_CANCELACION y entre
+    # paso y paso mira si el entorno se detuvo. Sin contención es un solo
+    # acquire(False), pero cada acquire es código Python.
+    __slots__ = ("_lock", "_cancelado")
+
+    def __init__(self, cancelado):
+        self._lock = threading.Lock()
+        self._cancelado = cancelado
+
+    def acquire(self, blocking=True, timeout=-1):
+        lock = self._lock
+        if lock.acquire(False):
+            return True
+        if not blocking:
+            return False
+        limite = None if timeout < 0 else time.monotonic() + timeout
+        paso = PASO_CANCELACION
+        while True:
+            if limite is not None:
+                paso = min(PASO_CANCELACION, limite - time.monotonic())
+                if paso <= 0:
+                    return False
+            if lock.acquire(True, paso):
+                return True
+            if self._cancelado.is_set():
+                raise Cancelado()
+
+    def release(self):
+        self._lock.release()
+
+    def locked(self):
+        return self._lock.locked()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self._lock.release()
+
+def nombre_proceso(proceso):
+    # "proceso_filosofo(3)": la función del generador y su primer argumento
+    # (después de self), para reconocer a cada actor en alertas y depuradores
+    codigo = proceso.gi_code
+    if codigo.co_argcount > 1:
+        return f"{proceso.__name__}({proceso.gi_frame.f_locals.get(codigo.co_varnames[1])})"
+    return proceso.__name__
+
+class EntornoHilos:
+    virtual = False
+
+    def __init__(self, contencion=None, vigilante=None):
+        self.contencion = contencion # contencion.Contencion para medir las primitivas
+        self.vigilante = vigilante   # vigilancia.Vigilante para detectar deadlocks / inanición
+        # Los clientes crean semáforos mientras cancelar() recorre el WeakSet:
+        # sin el lock, la copia puede fallar con "set changed size during iteration"
+        self._lock_semaforos = threading.Lock()
+        self.reiniciar()
+
+    def reiniciar(self):
+        # Reloj a cero y cancelación apagada, para una corrida nueva
+        self.inicio = time.monotonic()
+        self.cancelado = threading.Event()
+        self._semaforos = weakref.WeakSet() # Para despertarlos al cancelar
+        if self.contencion is not None:
+            self.contencion.reiniciar()
+
+    def ahora(self):
+        return time.monotonic() - self.inicio
+
+    # --- PRIMITIVAS ---
+    # `nombre` identifica la primitiva en las mediciones de contención y en
+    # las alertas del vigilante; sin ninguno de los dos se ignora.
+    def Lock(self, nombre=None):
+        if self.contencion is None and self.vigilante is None:
+            # Camino rápido: el Lock de threading tal cual. Un `with` no
+            # necesita cancelarse (el dueño lo suelta siempre, aun con
+            # Cancelado); un `yield lock` lo espera _correr de a pasos.
+            return threading.Lock()
+        # La medición va por fuera: el vigilante prueba la primitiva con un
+        # acquire(False) antes de bloquearse, y adentro de la medición ese
+        # intento contaría como otra adquisición
+        lock = LockHilos(self.cancelado)
+        if self.vigilante is not None:
+            lock = self.vigilante.lock(lock, nombre or "lock")
+        if self.contencion is not None:
+            lock = self.contencion.lock(lock, nombre or "lock")
+        return lock
+
+    def Semaphore(self, valor=1, nombre=None):
+        sem = SemaforoHilos(valor, self.cancelado)
+        with self._lock_semaforos:
+            self._semaforos.add(sem)
+        if self.vigilante is not None:
+            sem = self.vigilante.semaforo(sem, nombre or "semaforo")
+        if self.contencion is not None:
+            sem = self.contencion.semaforo(sem, nombre or "semaforo")
+        return sem
+
+    # --- PROCESOS ---
+    def lanzar(self, proceso):
+        t = threading.Thread(target=self._correr, args=(proceso,), name=nombre_proceso(proceso), daemon=True)
+        t.start()
+        return t
+
+    def _correr(self, proceso):
+        cancelado = self.cancelado
+        try:
+            for orden in proceso:
+                tipo = orden.__class__
+                if tipo is float or tipo is int:
+                    if cancelado.wait(orden): # Dormir, salvo que se detenga antes
+                        break
+                elif tipo is TIPO_LOCK:
+                    # Lock de C: se espera de a pasos para ver la cancelación
+                    while not orden.acquire(True, PASO_CANCELACION):
+                        if cancelado.is_set():
+                            raise Cancelado()
+                else:
+                    orden.acquire()
+        except Cancelado:
+            pass
+        finally:
+            proceso.close()
+
+    def cancelar(self):
+        # Despierta a todos: los que duermen salen del wait, los bloqueados en
+        # un semáforo reciben Cancelado ya y los de un Lock (yield lock) al
+        # próximo paso
+        self.cancelado.set()
+        with self._lock_semaforos:
+            semaforos = list(self._semaforos)
+        for sem in semaforos:
+            sem.despertar()
+
+    def unir(self, hilos, espera):
+        # join de cada hilo con un límite total; devuelve los que siguen vivos
+        limite = time.monotonic() + espera
+        actual = threading.current_thread()
+        for hilo in hilos:
+            if hilo is not actual:
+                hilo.join(max(0.0, limite - time.monotonic()))
+        return [hilo for hilo in hilos if hilo.is_alive() and hilo is not actual]
+
+    def ejecutar_simulacion(self, sim, duracion):
+        sim.iniciar()
+        try:
+            time.sleep(duracion)
+        except KeyboardInterrupt:
+            pass
+        sim.detener()
+
+class SemaforoVirtual:
+    # Semáforo del reloj virtual: los procesos bloqueados esperan en FIFO
+    # (como pares (proceso, pedido_lote o None)) y el release() les entrega
+    # los permisos y los reagenda en el instante actual.
+    def __init__(self, entorno, valor=1):
+        self.entorno = entorno
+        self.valor = valor
+        self.esperando = deque()
+
+    def hasta(self, k):
+        return PedidoLote(self, k)
+
+    def release(self, n=1):
+        self.valor += n
+        while self.valor > 0 and self.esperando:
+            proceso, pedido = self.esperando.popleft()
+            self._entregar(pedido)
+            self.entorno.listos.append(proceso)
+
+    def _entregar(self, pedido):
+        if pedido is None:
+            self.valor -= 1
+        else:
+            pedido.obtenidos = min(pedido.k, self.valor)
+            self.valor -= pedido.obtenidos
+
+    def acquire(self, blocking=True):
+        # Solo para usos sin bloqueo (`with mutex:`) dentro de un proceso
+        if self.valor > 0:
+            self.valor -= 1
+            return True
+        if blocking:
+            raise RuntimeError("acquire() bloqueante en modo virtual: use 'yield primitiva'")
+        return False
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+class EntornoVirtual:
+    virtual = True
+
+    def __init__(self):
+        self.reiniciar()
+
+    def reiniciar(self):
+        self.tiempo = 0.0
+        self.eventos = 0            # Pasos de proceso ejecutados
+        self._calendario = []       # heap de (tiempo, secuencia, proceso)
+        self._secuencia = itertools.count()
+        self.listos = deque()       # Procesos despertados en el instante actual (FIFO)
+
+    def ahora(self):
+        return self.tiempo
+
+    # Un solo hilo: cuando ejecutar() vuelve no queda nada corriendo, y lo
+    # que quedó agendado se descarta al reiniciar
+    def cancelar(self):
+        pass
+
+    def unir(self, hilos, espera):
+        return []
+
+    # --- PRIMITIVAS ---
+    def Lock(self, nombre=None):
+        return SemaforoVirtual(self, 1)
+
+    def Semaphore(self, valor=1, nombre=None):
+        return SemaforoVirtual(self, valor)
+
+    # --- PROCESOS ---
+    def lanzar(self, proceso):
+        self.listos.append(proceso)
+
+    def agendar(self, retardo, proceso):
+        heapq.heappush(self._calendario, (self.tiempo + retardo, next(self._secuencia), proceso))
+
+    def ejecutar(self, hasta=None):
+        # Avanza el reloj evento por evento hasta vaciar el calendario o
+        # alcanzar el tiempo `hasta`
+        calendario, listos = self._calendario, self.listos
+        heappop, heappush, popleft = heapq.heappop, heapq.heappush, listos.popleft
+        secuencia = self._secuencia
+        eventos = 0
+        while True:
+            if listos:
+                # Primero los despertados "ahora": no avanzan el reloj
+                proceso = popleft()
+            elif calendario:
+                if hasta is not None and calendario[0][0] > hasta:
+                    self.tiempo = hasta
+                    break
+                self.tiempo, _, proceso = heappop(calendario)
+            else:
+                break
+            # Un proceso corre hasta que duerme, se bloquea o termina
+            while True:
+                eventos += 1
+                try:
+                    orden = proceso.send(None)
+                except StopIteration:
+                    break
+                tipo = orden.__class__
+                if tipo is float or tipo is int:
+                    heappush(calendario, (self.tiempo + orden, next(secuencia), proceso))
+                    break
+                if tipo is PedidoLote:
+                    semaforo = orden.semaforo
+                    if semaforo.valor > 0:
+                        semaforo._entregar(orden)
+                        continue
+                    semaforo.esperando.append((proceso, orden))
+                    break
+                if orden.valor > 0:
+                    orden.valor -= 1
+                    continue
+                orden.esperando.append((proceso, None))
+                break
+        self.eventos += eventos
+        return eventos
+
+    def ejecutar_simulacion(self, sim, duracion):
+        if not sim.running:
+            sim.iniciar()
+        return self.ejecutar(hasta=self.tiempo + duracion)
+
+class SemaforoAsyncio(SemaforoVirtual):
+    # Igual que el virtual, pero los procesos bloqueados son futures del loop
+    def release(self, n=1):
+        self.valor += n
+        while self.valor > 0 and self.esperando:
+            futuro, pedido = self.esperando.popleft()
+            if futuro.done(): # Saltar corrutinas canceladas
+                continue
+            self._entregar(pedido)
+            futuro.set_result(None)
+
+class EntornoAsyncio:
+    virtual = False
+
+    def __init__(self):
+        self.reiniciar()
+
+    def reiniciar(self):
+        self.inicio = time.monotonic()
+        self.eventos = 0
+        self.loop = None
+        self._tareas = set()
+
+    def ahora(self):
+        return time.monotonic() - self.inicio
+
+    def cancelar(self):
+        # Desde dentro del loop (el detener() de _principal); _principal
+        # espera después a que las tareas canceladas terminen
+        for tarea in list(self._tareas):
+            tarea.cancel()
+
+    def unir(self, hilos, espera):
+        return []
+
+    # --- PRIMITIVAS ---
+    def Lock(self, nombre=None):
+        return SemaforoAsyncio(self, 1)
+
+    def Semaphore(self, valor=1, nombre=None):
+        return SemaforoAsyncio(self, valor)
+
+    # --- PROCESOS ---
+    def lanzar(self, proceso):
+        tarea = self.loop.create_task(self._correr(proceso))
+        self._tareas.add(tarea) # Referencia fuerte mientras viva
+        tarea.add_done_callback(self._tareas.discard)
+
+    async def _correr(self, proceso):
+        loop = self.loop
+        for orden in proceso:
+            self.eventos += 1
+            tipo = orden.__class__
+            if tipo is float or tipo is int:
+                await asyncio.sleep(orden)
+                continue
+            if tipo is PedidoLote:
+                semaforo, pedido = orden.semaforo, orden
+            else:
+                semaforo, pedido = orden, None
+            if semaforo.valor > 0:
+                semaforo._entregar(pedido)
+            else:
+                futuro = loop.create_future()
+                semaforo.esperando.append((futuro, pedido))
+                await futuro
+
+    def ejecutar_simulacion(self, sim, duracion):
+        return asyncio.run(self._principal(sim, duracion))
+
+    async def _principal(self, sim, duracion):
+        self.loop = asyncio.get_running_loop()
+        self.inicio = time.monotonic()
+        inicio_eventos = self.eventos
+        sim.iniciar()
+        try:
+            await asyncio.sleep(duracion)
+        finally:
+            sim.detener()
+            await asyncio.gather(*self._tareas, return_exceptions=True)
+        return self.eventos - inicio_eventos
+
+class EntornoReproduccion:
+    # Sin procesos ni primitivas: el reloj lo mueve quien reproduce una traza
+    # (ver reproduccion.py) y las réplicas solo lo leen
+    virtual = True
+
+    def __init__(self):
+        self.tiempo = 0.0
+
+    def ahora(self):
+        return self.tiempo
+
+    def cancelar(self):
+        pass
+
+    def unir(self, hilos, espera):
+        return []
+
+MIN_PURGA_HILOS = 256
+
+class Simulacion:
+    EVENTOS = () # Constantes de evento del problema (fijan los códigos de la traza)
+
+    def __new__(cls, *args, **kwargs):
+        # Se guardan los argumentos del constructor para reiniciar()
+        sim = super().__new__(cls)
+        sim._argumentos = (args, kwargs)
+        return sim
+
+    def __init__(self, entorno=None, semilla=None):
+        self.entorno = entorno if entorno is not None else EntornoHilos()
+        self.semilla = semilla
+        self.rng = random.Random(semilla)
+        self.running = False
+        self.fin = None # Tiempo del entorno al pedir detener (ver tiempo_medido)
+        self.hilos = []
+        self._purgar_en = MIN_PURGA_HILOS
+        self._observadores = []
+
+    # --- OBSERVADORES ---
+    def agregar_observador(self, observador):
+        # Copia al escribir: los hilos pueden estar recorriendo la lista
+        self._observadores = self._observadores + [observador]
+
+    def quitar_observador(self, observador):
+        self._observadores = [o for o in self._observadores if o is not observador]
+
+    def observado(self):
+        # Para saltear trabajo que solo sirve a los observadores
+        return bool(self._observadores)
+
+    def notificar(self, evento, actor=0, recurso=-1, dato=-1):
+        for observador in self._observadores:
+            observador(evento, actor, recurso, dato)
+
+    # --- ALEATORIEDAD ---
+    def rng_actor(self, *clave):
+        # Flujo propio para cada actor, derivado de la semilla y de su clave
+        # (p. ej. ("barbero", 2)): la secuencia de cada actor no depende de en
+        # qué orden el planificador intercale a los demás.
+        if self.semilla is None:
+            return random.Random(self.rng.getrandbits(64))
+        return random.Random("/".join(map(str, (self.semilla,) + clave)))
+
+    # --- CICLO DE VIDA ---
+    def actores(self):
+        # Lista de procesos (generadores) que se lanzan al iniciar
+        raise NotImplementedError
+
+    def lanzar(self, proceso):
+        # También los actores lanzados durante la corrida (los clientes del
+        # barbero) quedan en self.hilos para que detener() los una; los ya
+        # terminados se purgan cada vez que la lista duplica su tamaño
+        t = self.entorno.lanzar(proceso)
+        if t is not None:
+            self.hilos.append(t)
+            if len(self.hilos) >= self._purgar_en:
+                self.hilos = [h for h in self.hilos if h.is_alive()]
+                self._purgar_en = max(MIN_PURGA_HILOS, 2 * len(self.hilos))
+        return t
+
+    def iniciar(self):
+        self.running = True
+        self.fin = None
+        for proceso in self.actores():
+            self.lanzar(proceso)
+
+    def ejecutar(self, duracion):
+        # Corre `duracion` segundos (virtuales o reales, según el entorno) y
+        # devuelve los pasos de proceso ejecutados (None con hilos)
+        return self.entorno.ejecutar_simulacion(self, duracion)
+
+    def detener(self, espera=ESPERA_DETENER):
+        # Los procesos ven running = False en su próxima vuelta; los que están
+        # esperando se despiertan con la cancelación del entorno. Devuelve los
+        # hilos que no terminaron dentro de `espera` segundos.
+        if self.running:
+            # La corrida medida termina acá: lo que tarden en cancelarse y
+            # unirse los procesos no es tiempo de simulación
+            self.fin = self.entorno.ahora()
+        self.running = False
+        self.entorno.cancelar()
+        self.hilos = self.entorno.unir(self.hilos, espera)
+        return self.hilos
+
+    def reiniciar(self):
+        # Detiene la corrida y vuelve a construir el estado en este mismo
+        # objeto, con los mismos argumentos y el mismo entorno (vuelto a cero).
+        # Los observadores se conservan; después hay que llamar a iniciar().
+        pendientes = self.detener()
+        self.entorno.reiniciar()
+        observadores = self._observadores
+        args, kwargs = self._argumentos
+        self.__init__(*args, **kwargs)
+        self._observadores = observadores
+        return pendientes
+
+    def parametros(self):
+        # Lo que hace falta para reconstruir el estado observable (trazas)
+        return {}
+
+    def tiempo_medido(self):
+        # Hasta dónde se calculan tasas y fracciones de tiempo: el pedido de
+        # detener, o el reloj del entorno si la corrida sigue (o es virtual)
+        return self.fin if self.fin is not None else self.entorno.ahora()
+
+    def resumen(self):
+        # Estado final (contadores) para comparar corridas
+        return {"tiempo": round(self.tiempo_medido(), 6)}
+
+    def por_segundo(self, contadores):
+        # Tasas de los contadores dados sobre el tiempo medido
+        t = max(self.tiempo_medido(), 1e-9)
+        return {f"{nombre}_por_s": round(getattr(self, nombre) / t, 3) for nombre in contadores}
+
+# --- MODO CONSOLA (sin GUI) ---
+ENTORNOS = {"hilos": EntornoHilos, "virtual": EntornoVirtual, "asyncio": EntornoAsyncio}
+
+def ejecutar_cli(fabrica, descripcion, parametros=None):
+    # Punto de entrada común de los motores:
+    #   python barbero_sim.py                      -> tiempo real, imprime eventos
+    #   python barbero_sim.py --virtual -d 3600    -> reloj virtual, imprime resumen
+    #   python barbero_sim.py --asyncio -q -d 10   -> corrutinas en tiempo real
+    # `parametros` = {argumento_de_fabrica: kwargs de add_argument}
+    import argparse
+    parser = argparse.ArgumentParser(description=descripcion)
+    modo = parser.add_mutually_exclusive_group()
+    modo.add_argument("--virtual", dest="entorno", action="store_const", const="virtual",
+                      help="usar reloj virtual (eventos discretos)")
+    modo.add_argument("--asyncio", dest="entorno", action="store_const", const="asyncio",
+                      help="un event loop de asyncio en lugar de un hilo por actor")
+    parser.add_argument("-d", "--duracion", type=float, default=60.0, help="segundos simulados")
+    parser.add_argument("-s", "--semilla", type=int, default=None)
+    parser.add_argument("-q", "--silencioso", action="store_true", help="no imprimir cada evento")
+    parser.add_argument("--bitacora", metavar="RUTA", help="escribir los eventos a un archivo (memoria constante)")
+    parser.add_argument("--traza", metavar="RUTA", help="grabar los eventos en una traza binaria (ver traza.py)")
+    parser.add_argument("--contencion", metavar="RUTA",
+                        help="medir espera/retención de locks y semáforos y guardarlas en JSON (solo hilos)")
+    parser.add_argument("--vigilar", action="store_true",
+                        help="detectar deadlocks e inanición con un grafo de espera (solo hilos)")
+    parser.add_argument("--umbral-inanicion", type=float, default=None, metavar="SEG",
+                        help="espera que se reporta como inanición con --vigilar")
+    for nombre, opciones in (parametros or {}).items():
+        parser.add_argument("--" + nombre.replace("_", "-"), dest=nombre, default=None, **opciones)
+    args = parser.parse_args()
+
+    contencion = vigilante = None
+    if args.contencion or args.vigilar:
+        if args.entorno:
+            parser.error("--contencion y --vigilar miden hilos reales; no se combinan con --virtual ni --asyncio")
+        if args.contencion:
+            from contencion import Contencion
+            contencion = Contencion()
+        if args.vigilar:
+            import vigilancia
+            vigilante = vigilancia.Vigilante(args.umbral_inanicion or vigilancia.UMBRAL_INANICION)
+            vigilante.al_detectar(vigilancia.imprimir_alerta)
+            vigilante.iniciar()
+        entorno = EntornoHilos(contencion, vigilante)
+    else:
+        entorno = ENTORNOS[args.entorno or "hilos"]()
+    extra = {n: getattr(args, n) for n in (parametros or {}) if getattr(args, n) is not None}
+    try:
+        sim = fabrica(entorno=entorno, semilla=args.semilla, **extra)
+    except ValueError as e:
+        parser.error(str(e))
+    bitacora = None
+    if args.bitacora:
+        from bitacora import Bitacora
+        bitacora = Bitacora()
+        bitacora.exportar(args.bitacora)
+        sim.agregar_observador(lambda evento, actor, recurso, dato: bitacora.registrar(
+            f"{sim.entorno.ahora():10.3f}  {evento:<20} actor={actor} recurso={recurso} dato={dato}"))
+    elif not args.silencioso:
+        sim.agregar_observador(lambda evento, actor, recurso, dato: print(
+            f"{sim.entorno.ahora():10.3f}  {evento:<20} actor={actor} recurso={recurso} dato={dato}"))
+    traza = None
+    if args.traza:
+        from traza import EscritorTraza
+        traza = EscritorTraza.para(sim, args.traza)
+
+    t0 = time.perf_counter()
+    eventos = sim.ejecutar(args.duracion)
+    seg = time.perf_counter() - t0
+    if eventos is not None:
+        print(f"{eventos} eventos en {seg:.3f}s reales ({eventos / max(seg, 1e-9):,.0f} eventos/s)")
+    if bitacora is not None:
+        bitacora.cerrar()
+    if traza is not None:
+        traza.cerrar()
+        print(f"{traza.registros} registros en {args.traza}")
+    if contencion is not None:
+        contencion.exportar(args.contencion)
+    if vigilante is not None:
+        vigilante.detener()
+        print(vigilante.resumen())
+    print(sim.resumen())
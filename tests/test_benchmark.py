@@ -0,0 +1,27 @@
+import benchmark
+
+def _fila(entorno="virtual", **metricas):
+    fila = {"caso": "barbero", "tamano": 1, "entorno": entorno, "throughput": 1.0, "cpu_s": 1.0,
+            "pasos_por_s_cpu": 1000.0}
+    fila.update(metricas)
+    return fila
+
+def _marcadas(nueva, base):
+    return {metrica for _, metrica, _, _, _ in benchmark.comparar([nueva], [base])}
+
+def test_metricas_deterministas_usan_la_tolerancia_ajustada():
+    assert _marcadas(_fila(throughput=0.85), _fila()) == {"throughput"}
+    assert _marcadas(_fila(throughput=0.95), _fila()) == set()
+
+def test_ruido_de_cpu_no_es_regresion():
+    # Corridas seguidas del mismo código: +50% de CPU (y -33% de pasos/s)
+    assert _marcadas(_fila(cpu_s=1.5, pasos_por_s_cpu=667.0), _fila()) == set()
+    assert _marcadas(_fila(cpu_s=2.0, pasos_por_s_cpu=500.0), _fila()) == {"cpu_s", "pasos_por_s_cpu"}
+
+def test_umbral_crece_con_la_dispersion_entre_repeticiones():
+    ruidosa = _fila(cpu_s=2.0, dispersion={"cpu_s": 0.6})
+    assert _marcadas(ruidosa, _fila()) == set()
+
+def test_con_hilos_todo_es_tiempo():
+    assert _marcadas(_fila("hilos", throughput=0.85), _fila("hilos")) == set()
+    assert _marcadas(_fila("hilos", throughput=0.5), _fila("hilos")) == {"throughput"}
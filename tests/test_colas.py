@@ -0,0 +1,24 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+import colas
+
+def test_mmck_sin_llegadas_da_el_sistema_vacio():
+    r = colas.mmck([0.0, 0.5], 1.0, [2, 2], [5, 5])
+    for medida in ("p_bloqueo", "throughput", "utilizacion", "L", "Lq", "W", "Wq"):
+        assert not np.isnan(r[medida]).any()
+        assert r[medida][0] == 0.0
+    assert r["throughput"][1] > 0
+
+def test_mm1k_sin_llegadas_da_el_sistema_vacio():
+    r = colas.mm1k([0.0, 0.5], 1.0, 4)
+    for medida in ("p_bloqueo", "throughput", "L", "W"):
+        assert not np.isnan(r[medida]).any()
+        assert r[medida][0] == 0.0
+
+def test_mm1k_coincide_con_mmck_de_un_servidor():
+    lam = np.array([0.0, 0.3, 1.0, 2.5])
+    a = colas.mm1k(lam, 1.0, 6)
+    b = colas.mmck(lam, 1.0, 1, 6)
+    for medida in a:
+        assert np.allclose(a[medida], b[medida])
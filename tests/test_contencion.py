@@ -0,0 +1,34 @@
+import threading
+import time
+
+from contencion import Contencion
+from simulacion import EntornoHilos
+from vigilancia import Vigilante
+
+HILOS = 4
+
+def contender(primitiva):
+    # La primitiva está tomada mientras HILOS hilos la piden: todos se
+    # bloquean una vez y la consiguen de a uno
+    primitiva.acquire()
+    def pedir():
+        with primitiva:
+            pass
+    hilos = [threading.Thread(target=pedir) for _ in range(HILOS)]
+    for h in hilos:
+        h.start()
+    time.sleep(0.1)
+    primitiva.release()
+    for h in hilos:
+        h.join()
+
+def test_contencion_con_vigilante_cuenta_cada_acquire_una_vez():
+    contencion = Contencion()
+    entorno = EntornoHilos(contencion, Vigilante())
+    contender(entorno.Lock("lock"))
+    contender(entorno.Semaphore(1, "sem"))
+
+    resumen = contencion.resumen()
+    for nombre in ("lock", "sem"):
+        assert resumen[nombre]["adquisiciones"] == HILOS + 1
+        assert resumen[nombre]["contendidas"] == HILOS
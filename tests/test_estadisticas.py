@@ -0,0 +1,18 @@
+import pytest
+
+from estadisticas import HistogramaTiempo, MAX_CUBETAS
+
+def test_distribucion_agrupada_chica_es_la_distribucion():
+    h = HistogramaTiempo(5)
+    h.cambiar(1.0, 3)
+    h.cerrar(4.0)
+    assert h.distribucion_agrupada() == h.distribucion() == {0: 0.25, 3: 0.75}
+
+def test_distribucion_agrupada_acota_las_entradas():
+    h = HistogramaTiempo(100000)
+    for t in range(1, 100001):
+        h.cambiar(float(t), t)
+    h.cerrar(100001.0)
+    r = h.distribucion_agrupada()
+    assert len(r) <= MAX_CUBETAS
+    assert sum(r.values()) == pytest.approx(1.0, abs=1e-4)
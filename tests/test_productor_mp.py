@@ -0,0 +1,19 @@
+import time
+
+from productor_mp import ProductorConsumidorMP
+
+def test_buffer_muestra_vacios_los_slots_consumidos():
+    # Consumidor mucho más rápido que el productor: casi siempre vacío
+    sim = ProductorConsumidorMP(capacidad=4, productores=1, consumidores=2, tam_slot=256, backend="hilos")
+    try:
+        sim.iniciar()
+        time.sleep(0.3)
+        sim.buf.parar()
+        for actor in sim.actores:
+            actor.join(2.0)
+        # Sin nadie corriendo, cada slot publicado y no tomado está marcado lleno
+        ocupados = [x for x in sim.buffer if x is not None]
+        assert len(ocupados) == sim.producidos - sim.consumidos
+        assert sim.consumidos > 0
+    finally:
+        sim.cerrar()
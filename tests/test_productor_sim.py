@@ -0,0 +1,81 @@
+import threading
+
+import pytest
+
+from contencion import Contencion
+from simulacion import EntornoHilos, EntornoVirtual
+from productor_sim import ProductorConsumidor, ITEM_PRODUCIDO, ITEM_CONSUMIDO
+
+def correr_con_limite(funcion, limite=10.0):
+    # Corre funcion() en otro hilo: si no vuelve en `limite` segundos, falla
+    resultado = {}
+    def correr():
+        try:
+            resultado["valor"] = funcion()
+        except Exception as e:
+            resultado["error"] = e
+    hilo = threading.Thread(target=correr, daemon=True)
+    hilo.start()
+    hilo.join(limite)
+    assert not hilo.is_alive(), "la simulación no volvió"
+    if "error" in resultado:
+        raise resultado["error"]
+    return resultado.get("valor")
+
+def test_virtual_sin_tiempos_se_rechaza():
+    # Sin ningún tiempo de trabajo el reloj virtual no avanzaría nunca
+    with pytest.raises(ValueError):
+        correr_con_limite(lambda: ProductorConsumidor(entorno=EntornoVirtual(), tiempo_producir=(0, 0),
+                                                      tiempo_consumir=(0, 0)).ejecutar(1.0))
+
+@pytest.mark.parametrize("lote", [1, 4])
+def test_virtual_con_un_lado_sin_tiempo_termina(lote):
+    sim = ProductorConsumidor(entorno=EntornoVirtual(), semilla=0, tiempo_producir=(0, 0),
+                              tiempo_consumir=(0.1, 0.2), lote=lote)
+    correr_con_limite(lambda: sim.ejecutar(10.0))
+    assert sim.entorno.ahora() == 10.0
+    assert sim.consumidos > 0
+
+def test_dos_locks_no_crea_el_mutex_de_un_lock():
+    contencion = Contencion()
+    ProductorConsumidor(entorno=EntornoHilos(contencion), tipo_buffer="dos_locks")
+    assert set(contencion.primitivas) == {"sem_espacios_vacios", "sem_items_disponibles", "lock_cola", "lock_cabeza"}
+
+def correr_proceso(proceso):
+    # Un proceso de modo hilos en este mismo hilo: cada orden es un acquire
+    try:
+        orden = next(proceso)
+        while True:
+            orden.acquire()
+            orden = proceso.send(None)
+    except StopIteration as fin:
+        return fin.value
+
+@pytest.mark.parametrize("tipo_buffer", ["un_lock", "dos_locks"])
+def test_lotes_que_dan_la_vuelta_al_anillo(tipo_buffer):
+    sim = ProductorConsumidor(capacidad=5, entorno=EntornoHilos(), tipo_buffer=tipo_buffer)
+    cola = sim.cola
+    eventos = []
+    sim.agregar_observador(lambda evento, actor, recurso, dato: eventos.append((evento, recurso, dato)))
+    assert correr_proceso(cola.poner_lote([1, 2, 3], 0)) == 3
+    assert correr_proceso(cola.sacar_lote(3, 0)) == [1, 2, 3]
+
+    # Índices en 3: un lote de 4 ocupa los slots 3, 4, 0, 1
+    assert correr_proceso(cola.poner_lote([4, 5, 6, 7], 0)) == 4
+    assert sim.buffer == [6, 7, None, 4, 5]
+    # Se piden 5 y hay 4: salen los 4, en orden FIFO, y los slots quedan vacíos
+    assert correr_proceso(cola.sacar_lote(5, 0)) == [4, 5, 6, 7]
+    assert sim.buffer == [None] * 5
+    assert cola.idx_productor == cola.idx_consumidor == 2
+
+    # Lote más grande que el lugar libre: entran 5 (slots 2, 3, 4, 0, 1)
+    assert correr_proceso(cola.poner_lote([8, 9, 10, 11, 12, 13], 0)) == 5
+    assert sim.buffer == [11, 12, 8, 9, 10]
+    assert correr_proceso(cola.sacar_lote(2, 0)) == [8, 9]
+    assert sim.buffer == [11, 12, None, None, 10]
+
+    producidos = [(recurso, dato) for evento, recurso, dato in eventos if evento == ITEM_PRODUCIDO]
+    consumidos = [(recurso, dato) for evento, recurso, dato in eventos if evento == ITEM_CONSUMIDO]
+    assert producidos[3:] == [(3, 4), (4, 5), (0, 6), (1, 7), (2, 8), (3, 9), (4, 10), (0, 11), (1, 12)]
+    assert consumidos[3:] == [(3, 4), (4, 5), (0, 6), (1, 7), (2, 8), (3, 9)]
+    assert sim.ocupados == 3
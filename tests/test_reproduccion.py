@@ -0,0 +1,60 @@
+import pytest
+
+from barbero_sim import Barberia, ReplicaBarberia
+from filosofos_sim import CenaFilosofos, ReplicaFilosofos
+from productor_sim import ProductorConsumidor, ReplicaProductor
+from reproduccion import Reproductor, EXTENSION_INDICE
+from simulacion import EntornoVirtual
+from traza import EscritorTraza
+
+INTERVALO = 64                              # Claves chicas: varias por tramo
+TIEMPOS = [3.7, 11.2, 18.05, 26.9, 41.3]    # Instantáneas del motor en vivo
+
+CASOS = {
+    "barbero": (lambda: Barberia(sillas_espera=3, entorno=EntornoVirtual(), semilla=3, barberos=2,
+                                 tiempo_corte=(0.5, 1.5), llegada=(0.1, 0.8)), ReplicaBarberia),
+    "filosofos": (lambda: CenaFilosofos(7, EntornoVirtual(), 3, estrategia="camarero"), ReplicaFilosofos),
+    "productor": (lambda: ProductorConsumidor(capacidad=4, entorno=EntornoVirtual(), semilla=3,
+                                              productores=2, consumidores=3, lote=2), ReplicaProductor),
+}
+
+@pytest.mark.parametrize("caso", list(CASOS))
+def test_saltar_da_el_estado_del_motor_en_ese_tiempo(tmp_path, caso):
+    crear, replica = CASOS[caso]
+    sim = crear()
+    ruta = str(tmp_path / f"{caso}.trz")
+    escritor = EscritorTraza.para(sim, ruta)
+    instantaneas = []
+    for t in TIEMPOS:
+        sim.ejecutar(t - sim.entorno.ahora())
+        # El estado observable del motor, con la misma forma que el de la réplica
+        instantaneas.append((t, replica.estado(sim)))
+    sim.ejecutar(5.0) # Que la traza siga después de la última instantánea
+    escritor.cerrar()
+
+    reproductor = Reproductor(ruta, intervalo=INTERVALO)
+    assert len(reproductor.claves) > len(TIEMPOS)
+    # Hacia adelante, hacia atrás y desde el final: cada salto restaura otra clave
+    for t, esperado in instantaneas + instantaneas[::-1]:
+        reproductor.ir_a(t)
+        assert reproductor.sim.estado() == esperado, t
+    reproductor.cerrar()
+
+    # El índice quedó guardado junto a la traza y se reutiliza
+    guardado = Reproductor(ruta, intervalo=INTERVALO)
+    for t, esperado in instantaneas[::2]:
+        guardado.ir_a(t)
+        assert guardado.sim.estado() == esperado, t
+    guardado.cerrar()
+
+def test_indice_de_otro_formato_se_reconstruye(tmp_path):
+    sim = ProductorConsumidor(entorno=EntornoVirtual(), semilla=0)
+    ruta = str(tmp_path / "productor.trz")
+    escritor = EscritorTraza.para(sim, ruta)
+    sim.ejecutar(30.0)
+    escritor.cerrar()
+    with open(ruta + EXTENSION_INDICE, "w", encoding="utf-8") as archivo:
+        archivo.write('{"firma": [], "intervalo": 16384, "claves": []}') # Índice JSON anterior
+    reproductor = Reproductor(ruta, intervalo=INTERVALO)
+    assert len(reproductor.claves) == reproductor.traza.registros // INTERVALO + 1
+    reproductor.cerrar()
@@ -0,0 +1,48 @@
+import threading
+import time
+
+from simulacion import EntornoHilos
+from filosofos_sim import CenaFilosofos
+
+def test_detener_une_hilos_bloqueados_en_locks():
+    # Jerarquía: filósofos bloqueados con `yield lock` en tenedores de C
+    sim = CenaFilosofos(num_filosofos=10, entorno=EntornoHilos(), semilla=0, estrategia="jerarquia",
+                        tiempo_pensar=(0, 0.001), tiempo_comer=(0.5, 1.0))
+    sim.iniciar()
+    time.sleep(0.3)
+    assert sim.detener(espera=2.0) == []
+    assert not any(h.name.startswith("proceso_filosofo") for h in threading.enumerate())
+
+def test_resumen_mide_hasta_el_pedido_de_detener():
+    # La espera de unir los hilos (aquí hasta ~1 s de comida cancelada) no
+    # entra en el tiempo sobre el que se calculan las tasas
+    sim = CenaFilosofos(num_filosofos=5, entorno=EntornoHilos(), semilla=0,
+                        tiempo_pensar=(0, 0.001), tiempo_comer=(0.5, 1.0))
+    sim.iniciar()
+    time.sleep(0.3)
+    sim.detener(espera=2.0)
+    time.sleep(0.2)
+    assert sim.resumen()["tiempo"] < 0.45
+    assert sim.tiempo_medido() == sim.fin
+
+def test_cancelar_mientras_se_crean_semaforos():
+    # Como los clientes del barbero: semáforos nuevos (y otros que se
+    # liberan) mientras se cancela
+    entorno = EntornoHilos()
+    fin = threading.Event()
+
+    def crear():
+        while not fin.is_set():
+            guardados = [entorno.Semaphore(0) for _ in range(50)]
+            del guardados
+
+    hilos = [threading.Thread(target=crear) for _ in range(4)]
+    for hilo in hilos:
+        hilo.start()
+    try:
+        for _ in range(2000):
+            entorno.cancelar()
+    finally:
+        fin.set()
+        for hilo in hilos:
+            hilo.join()
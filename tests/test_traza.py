@@ -0,0 +1,25 @@
+import threading
+import time
+
+from traza import EscritorTraza, leer_traza
+
+HILOS = 8
+EVENTOS_POR_HILO = 20000
+
+def test_registros_de_varios_hilos_quedan_ordenados_por_tiempo(tmp_path):
+    ruta = tmp_path / "hilos.trz"
+    escritor = EscritorTraza(ruta, ["EVENTO"], time.monotonic)
+
+    def grabar(actor):
+        for i in range(EVENTOS_POR_HILO):
+            escritor.observador("EVENTO", actor, -1, i)
+
+    hilos = [threading.Thread(target=grabar, args=(actor,)) for actor in range(HILOS)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    escritor.cerrar()
+    tiempos = [t for t, _, _, _, _ in leer_traza(ruta)]
+    assert len(tiempos) == HILOS * EVENTOS_POR_HILO
+    assert all(a <= b for a, b in zip(tiempos, tiempos[1:]))
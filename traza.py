@@ -0,0 +1,134 @@
+import json
+import struct
+import threading
+from collections import Counter
+
+# --- TRAZA BINARIA DE EVENTOS ---
+# Cada evento del motor se graba como un registro de tamaño fijo:
+#
+#     tiempo (float64) | actor (int32) | evento (uint16) | relleno | recurso (int32) | dato (int32)
+#
+# 24 bytes por evento, alineados a 8, así que un millón de eventos ocupa
+# ~23 MB y la traza se puede recorrer con struct.iter_unpack o mapear (mmap)
+# sin parsear texto. El archivo empieza con una cabecera:
+#
+#     MAGIA (4 bytes) | largo (uint32) | JSON {"version", "registro", "eventos", "meta"}
+#
+# donde "eventos" es la tabla código -> nombre (el código es el índice en
+# Simulacion.EVENTOS) y "meta" describe la corrida (problema, semilla...).
+#
+# Los registros se acumulan en un bloque preasignado y se escriben de a
+# REGISTROS_POR_BLOQUE, así que grabar cuesta un pack_into por evento y una
+# escritura cada varios miles.
+
+MAGIA = b"TRZ1"
+VERSION = 1
+REGISTRO = struct.Struct("<diH2xii")
+LARGO = struct.Struct("<I")
+REGISTROS_POR_BLOQUE = 4096
+
+class EscritorTraza:
+    def __init__(self, ruta, eventos, reloj, meta=None):
+        # eventos: nombres en orden de código; reloj() -> tiempo del evento
+        self.codigos = {nombre: i for i, nombre in enumerate(eventos)}
+        self.reloj = reloj
+        self.registros = 0
+        self._bloque = bytearray(REGISTRO.size * REGISTROS_POR_BLOQUE)
+        self._usados = 0
+        self._lock = threading.Lock() # Los observadores corren en los hilos de los actores
+        self._archivo = open(ruta, "wb")
+        cabecera = json.dumps({"version": VERSION, "registro": REGISTRO.format,
+                               "eventos": list(eventos), "meta": meta or {}},
+                              ensure_ascii=False).encode("utf-8")
+        self._archivo.write(MAGIA + LARGO.pack(len(cabecera)) + cabecera)
+
+    @classmethod
+    def para(cls, sim, ruta):
+        # Traza de una simulación: se suscribe como observador
+        meta = {"problema": sim.__class__.__name__, "semilla": sim.semilla,
+                "entorno": sim.entorno.__class__.__name__, "parametros": sim.parametros()}
+        escritor = cls(ruta, sim.EVENTOS, sim.entorno.ahora, meta)
+        sim.agregar_observador(escritor.observador)
+        return escritor
+
+    def observador(self, evento, actor, recurso, dato):
+        codigo = self.codigos[evento]
+        with self._lock:
+            if self._archivo is None:
+                return # Eventos rezagados después de cerrar
+            # El reloj se lee con el lock tomado: leído antes, dos hilos
+            # podrían grabar en un orden distinto al de sus tiempos, y la
+            # búsqueda binaria de la reproducción supone la traza ordenada
+            t = self.reloj()
+            REGISTRO.pack_into(self._bloque, self._usados * REGISTRO.size, t, actor, codigo, recurso, dato)
+            self._usados += 1
+            self.registros += 1
+            if self._usados == REGISTROS_POR_BLOQUE:
+                self._volcar()
+
+    def _volcar(self):
+        self._archivo.write(memoryview(self._bloque)[:self._usados * REGISTRO.size])
+        self._usados = 0
+
+    def cerrar(self):
+        with self._lock:
+            if self._archivo is not None:
+                self._volcar()
+                self._archivo.close()
+                self._archivo = None
+
+# --- LECTURA ---
+def leer_cabecera(archivo):
+    # -> (cabecera, offset del primer registro)
+    if archivo.read(len(MAGIA)) != MAGIA:
+        raise ValueError("no es una traza (falta la marca TRZ1)")
+    (largo,) = LARGO.unpack(archivo.read(LARGO.size))
+    cabecera = json.loads(archivo.read(largo).decode("utf-8"))
+    if cabecera["version"] != VERSION:
+        raise ValueError(f"versión de traza no soportada: {cabecera['version']}")
+    return cabecera, len(MAGIA) + LARGO.size + largo
+
+def leer_traza(ruta, bloque=REGISTROS_POR_BLOQUE):
+    # Generador de (tiempo, actor, nombre_evento, recurso, dato), leyendo por bloques
+    with open(ruta, "rb") as archivo:
+        cabecera, _ = leer_cabecera(archivo)
+        eventos = cabecera["eventos"]
+        while True:
+            datos = archivo.read(REGISTRO.size * bloque)
+            if not datos:
+                break
+            datos = datos[:len(datos) - len(datos) % REGISTRO.size] # Cola truncada (corrida cortada)
+            for t, actor, codigo, recurso, dato in REGISTRO.iter_unpack(datos):
+                yield t, actor, eventos[codigo], recurso, dato
+
+def resumen_traza(ruta):
+    with open(ruta, "rb") as archivo:
+        cabecera, _ = leer_cabecera(archivo)
+    por_evento = Counter()
+    primero = ultimo = None
+    for t, _, evento, _, _ in leer_traza(ruta):
+        por_evento[evento] += 1
+        if primero is None:
+            primero = t
+        ultimo = t
+    total = sum(por_evento.values())
+    return {"meta": cabecera["meta"], "registros": total,
+            "desde": primero, "hasta": ultimo,
+            "por_evento": dict(por_evento.most_common())}
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Leer una traza binaria de eventos")
+    parser.add_argument("ruta")
+    parser.add_argument("--volcar", type=int, metavar="N", help="imprimir los primeros N registros")
+    args = parser.parse_args(argv)
+    if args.volcar:
+        for i, (t, actor, evento, recurso, dato) in enumerate(leer_traza(args.ruta)):
+            if i >= args.volcar:
+                break
+            print(f"{t:10.3f}  {evento:<20} actor={actor} recurso={recurso} dato={dato}")
+    else:
+        print(resumen_traza(args.ruta))
+
+if __name__ == "__main__":
+    main()
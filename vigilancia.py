@@ -0,0 +1,228 @@
+import sys
+import threading
+import time
+from collections import Counter, deque
+
+from simulacion import PedidoLote
+
+# --- VIGILANCIA DE DEADLOCKS E INANICIÓN ---
+# Grafo de espera ("quién espera a quién") mantenido incrementalmente por
+# envolturas de Lock y Semaphore para el modo hilos, igual que las de
+# contencion.py. Se activa pasando un Vigilante al EntornoHilos.
+#
+#   * Un acquire que consigue la primitiva al primer intento solo anota el
+#     dueño (una asignación): el camino común no toma ningún lock extra.
+#   * Un acquire que se va a bloquear agrega la arista hilo -> primitiva ->
+#     dueño y recorre la cadena de dueños desde ahí. Cada hilo espera a lo
+#     sumo una primitiva y cada lock tiene a lo sumo un dueño, así que el
+#     grafo es una cadena por hilo y el recorrido cuesta el largo de la
+#     cadena de bloqueos (casi siempre 1 o 2), no el tamaño del grafo. Si
+#     la cadena vuelve al hilo que pide, hay un ciclo: deadlock.
+#   * Un hilo de vigilancia revisa cada `periodo` segundos las esperas en
+#     curso y avisa de las que superan `umbral` (inanición), con su cadena.
+#
+# Los semáforos no tienen dueño (los libera otro hilo), así que una espera
+# en un semáforo corta la cadena: solo puede aparecer como inanición. El
+# dueño de un lock se borra ANTES de soltarlo, así que el que recorre la
+# cadena nunca ve un dueño que ya no lo tiene y un ciclo detectado es real.
+
+UMBRAL_INANICION = 30.0     # Segundos de espera que se consideran inanición
+PERIODO_VIGILANCIA = 1.0
+MAX_ALERTAS = 100           # Alertas que se conservan (las demás solo se cuentan)
+
+DEADLOCK = "deadlock"
+INANICION = "inanicion"
+
+class LockVigilado:
+    def __init__(self, lock, vigilante, nombre):
+        self._lock = lock
+        self._vigilante = vigilante
+        self.nombre = nombre
+        self.dueno = None       # Hilo que lo tiene (lo escribe solo el dueño)
+
+    def acquire(self, blocking=True, timeout=-1):
+        if self._lock.acquire(False):
+            self.dueno = threading.current_thread()
+            return True
+        if not blocking:
+            return False
+        hilo = self._vigilante.esperar(self)
+        try:
+            obtenido = self._lock.acquire(True, timeout)
+        finally:
+            self._vigilante.dejar_de_esperar(hilo)
+        if obtenido:
+            self.dueno = hilo
+        return obtenido
+
+    def release(self):
+        self.dueno = None
+        self._lock.release()
+
+    def locked(self):
+        return self._lock.locked()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+class SemaforoVigilado:
+    # Envuelve un SemaforoHilos (la medición de contencion.py va por fuera)
+    dueno = None
+
+    def __init__(self, semaforo, vigilante, nombre):
+        self._sem = semaforo
+        self._vigilante = vigilante
+        self.nombre = nombre
+
+    def acquire(self, blocking=True, timeout=None):
+        if self._sem.acquire(False):
+            return True
+        if not blocking:
+            return False
+        hilo = self._vigilante.esperar(self)
+        try:
+            return self._sem.acquire(True, timeout)
+        finally:
+            self._vigilante.dejar_de_esperar(hilo)
+
+    def release(self, n=1):
+        self._sem.release(n)
+
+    def hasta(self, k):
+        return PedidoLote(self, k)
+
+    def disponibles(self):
+        return self._sem.disponibles()
+
+    def adquirir_hasta(self, k):
+        hilo = self._vigilante.esperar(self)
+        try:
+            return self._sem.adquirir_hasta(k)
+        finally:
+            self._vigilante.dejar_de_esperar(hilo)
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+class Vigilante:
+    def __init__(self, umbral=UMBRAL_INANICION, periodo=PERIODO_VIGILANCIA):
+        self.umbral = umbral
+        self.periodo = periodo
+        self.inicio = time.monotonic()
+        self.esperando = {}     # hilo -> (primitiva, desde)
+        self.alertas = deque(maxlen=MAX_ALERTAS)
+        self.totales = Counter()
+        self._lock = threading.Lock()
+        self._avisados = set()  # Esperas ya reportadas: (hilo, desde)
+        self._avisar = []
+        self._detener = threading.Event()
+        self._hilo = None
+
+    # --- PRIMITIVAS ---
+    def lock(self, lock, nombre):
+        return LockVigilado(lock, self, nombre)
+
+    def semaforo(self, semaforo, nombre):
+        return SemaforoVigilado(semaforo, self, nombre)
+
+    # --- GRAFO DE ESPERA ---
+    def esperar(self, primitiva):
+        # El hilo actual va a bloquearse en `primitiva`: arista nueva y
+        # búsqueda de un ciclo que pase por ella
+        hilo = threading.current_thread()
+        with self._lock:
+            self.esperando[hilo] = (primitiva, time.monotonic())
+            cadena, ciclo = self._cadena(hilo)
+        if ciclo:
+            self._alertar(DEADLOCK, cadena)
+        return hilo
+
+    def dejar_de_esperar(self, hilo):
+        with self._lock:
+            del self.esperando[hilo]
+
+    def _cadena(self, hilo):
+        # Con self._lock tomado: [(hilo, primitiva, dueño, desde)] siguiendo
+        # las esperas desde `hilo`, y si la cadena vuelve a él
+        cadena = []
+        vistos = set()
+        actual = hilo
+        while actual in self.esperando and actual not in vistos:
+            vistos.add(actual)
+            primitiva, desde = self.esperando[actual]
+            dueno = primitiva.dueno
+            cadena.append((actual, primitiva, dueno, desde))
+            if dueno is None:
+                break
+            actual = dueno
+        return cadena, bool(cadena) and cadena[-1][2] is hilo
+
+    # --- ALERTAS ---
+    def al_detectar(self, funcion):
+        # funcion(alerta) desde el hilo que detecta: debe ser rápida
+        self._avisar.append(funcion)
+
+    def _alertar(self, tipo, cadena):
+        ahora = time.monotonic()
+        alerta = {"tipo": tipo, "tiempo": round(ahora - self.inicio, 3),
+                  "cadena": [{"hilo": h.name, "espera": p.nombre, "dueno": d.name if d is not None else None,
+                              "hace": round(ahora - desde, 3)} for h, p, d, desde in cadena]}
+        self.totales[tipo] += 1
+        self.alertas.append(alerta)
+        for funcion in self._avisar:
+            funcion(alerta)
+
+    def revisar(self):
+        # Esperas que superan el umbral (cada una se avisa una sola vez)
+        limite = time.monotonic() - self.umbral
+        encontradas = []
+        with self._lock:
+            for hilo, (primitiva, desde) in list(self.esperando.items()):
+                if desde < limite and (hilo, desde) not in self._avisados:
+                    self._avisados.add((hilo, desde))
+                    encontradas.append(self._cadena(hilo)[0])
+            # Olvidar las esperas avisadas que ya terminaron
+            vigentes = {(h, d) for h, (_, d) in self.esperando.items()}
+            self._avisados &= vigentes
+        for cadena in encontradas:
+            self._alertar(INANICION, cadena)
+        return len(encontradas)
+
+    # --- HILO DE VIGILANCIA ---
+    def iniciar(self):
+        if self._hilo is None:
+            self._hilo = threading.Thread(target=self._vigilar, name="vigilante", daemon=True)
+            self._hilo.start()
+
+    def _vigilar(self):
+        while not self._detener.wait(self.periodo):
+            self.revisar()
+
+    def detener(self):
+        self._detener.set()
+
+    def resumen(self):
+        with self._lock:
+            bloqueados = len(self.esperando)
+        return {"deadlocks": self.totales[DEADLOCK], "inanicion": self.totales[INANICION],
+                "bloqueados_ahora": bloqueados}
+
+def describir(alerta):
+    # Texto de una alerta, con la cadena de bloqueos (una línea por eslabón)
+    titulo = "DEADLOCK" if alerta["tipo"] == DEADLOCK else "INANICIÓN"
+    lineas = [f"[{alerta['tiempo']:.3f}s] {titulo}:"]
+    for eslabon in alerta["cadena"]:
+        dueno = f" (la tiene {eslabon['dueno']})" if eslabon["dueno"] else ""
+        lineas.append(f"  {eslabon['hilo']} espera {eslabon['espera']} hace {eslabon['hace']:.3f}s{dueno}")
+    return "\n".join(lineas)
+
+def imprimir_alerta(alerta):
+    print(describir(alerta), file=sys.stderr)
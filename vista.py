@@ -0,0 +1,315 @@
+# --- BUCLE DE RENDER COMÚN DE LAS VISTAS ---
+# En lugar de encolar un root.after() por cada transición del motor (lo que
+# inunda la cola de Tk cuando la simulación va rápido), cada vista toma una
+# "instantánea" del estado compartido a una tasa fija y solo repinta los
+# widgets cuyo valor cambió desde el frame anterior. Así el costo de la GUI
+# queda acotado por FPS x widgets, sin importar cuántos eventos ocurran.
+
+import threading
+import time
+import tkinter as tk
+from tkinter import filedialog
+
+from bitacora import NOMBRES_NIVEL, AVISO
+from contencion import Contencion
+from reproduccion import Reproductor
+from simulacion import EntornoHilos
+from vigilancia import Vigilante, describir
+
+FPS = 30
+MAX_LINEAS_LOG = 1000       # Líneas que conserva el widget de log
+MAX_LOTE_LOG = 200          # Líneas que se insertan como máximo por frame
+
+class BucleRender:
+    def __init__(self, root, instantanea, pintar, fps=FPS):
+        # instantanea() -> lista de valores (uno por widget)
+        # pintar(indice, valor) -> aplica un valor a su widget
+        self.root = root
+        self.instantanea = instantanea
+        self.pintar = pintar
+        self.periodo_ms = max(1, int(1000 / fps))
+        self.activo = False
+        self._ultimo = None
+        self._after_id = None
+        self._extras = []
+
+    def en_cada_frame(self, funcion):
+        # Trabajo adicional acotado por frame (p. ej. volcar la bitácora)
+        self._extras.append(funcion)
+
+    def iniciar(self):
+        self.activo = True
+        self._frame()
+
+    def detener(self):
+        self.activo = False
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def forzar(self):
+        # Repinta todo en el próximo frame (p. ej. tras recrear widgets)
+        self._ultimo = None
+
+    def _frame(self):
+        if not self.activo:
+            return
+        nuevo = self.instantanea()
+        viejo = self._ultimo
+        if viejo is None or len(viejo) != len(nuevo):
+            for i, valor in enumerate(nuevo):
+                self.pintar(i, valor)
+        else:
+            for i, valor in enumerate(nuevo):
+                if valor != viejo[i]:
+                    self.pintar(i, valor)
+        self._ultimo = nuevo
+        for funcion in self._extras:
+            funcion()
+        self._after_id = self.root.after(self.periodo_ms, self._frame)
+
+# --- PANEL DE BITÁCORA ---
+# Muestra una Bitacora en un ScrolledText: una sola inserción por frame con
+# todo lo nuevo, un solo see(END) y el widget recortado a MAX_LINEAS_LOG.
+
+class PanelBitacora:
+    def __init__(self, log_box, bitacora):
+        self.log_box = log_box
+        self.bitacora = bitacora
+        self._desde = 0
+
+    def volcar(self):
+        registros, perdidos, self._desde = self.bitacora.pendientes(self._desde, MAX_LOTE_LOG)
+        if not registros:
+            return
+        lineas = [mensaje for _, _, mensaje in registros]
+        if perdidos:
+            lineas.insert(0, f"... ({perdidos} mensajes omitidos)")
+        self.log_box.config(state='normal')
+        self.log_box.insert(tk.END, "\n".join(lineas) + "\n")
+        total_lineas = int(self.log_box.index("end-1c").split(".")[0])
+        if total_lineas > MAX_LINEAS_LOG:
+            self.log_box.delete("1.0", f"{total_lineas - MAX_LINEAS_LOG + 1}.0")
+        self.log_box.see(tk.END) # Auto-scroll al final
+        self.log_box.config(state='disabled')
+
+    def controles(self, parent):
+        # Selector de nivel + botón de exportación
+        frame = tk.Frame(parent)
+        tk.Label(frame, text="Nivel:").pack(side=tk.LEFT)
+        nombres = {nombre: nivel for nivel, nombre in NOMBRES_NIVEL.items()}
+        self.var_nivel = tk.StringVar(value=NOMBRES_NIVEL[self.bitacora.nivel])
+        menu = tk.OptionMenu(frame, self.var_nivel, *nombres,
+                             command=lambda nombre: setattr(self.bitacora, "nivel", nombres[nombre]))
+        menu.pack(side=tk.LEFT)
+        tk.Button(frame, text="Exportar...", command=self.exportar).pack(side=tk.LEFT, padx=5)
+        return frame
+
+    def exportar(self):
+        ruta = filedialog.asksaveasfilename(defaultextension=".log",
+                                            filetypes=[("Log", "*.log"), ("Texto", "*.txt")])
+        if ruta:
+            self.bitacora.exportar(ruta)
+
+# --- PANEL DE CONTENCIÓN ---
+# Tabla con las primitivas que más espera acumulan (contencion.Contencion).
+# Sumar los contadores de todos los hilos cuesta O(primitivas x hilos), así
+# que se refresca cada PERIODO_CONTENCION segundos, no en cada frame.
+
+PERIODO_CONTENCION = 0.5
+FILAS_CONTENCION = 6
+
+class PanelContencion:
+    def __init__(self, parent, contencion, filas=FILAS_CONTENCION):
+        self.contencion = contencion
+        self.filas = filas
+        self._cada = max(1, int(PERIODO_CONTENCION * FPS))
+        self._frames = 0
+
+        self.frame = tk.LabelFrame(parent, text=" Contención (espera / retención) ", padx=5, pady=5)
+        self.texto = tk.Label(self.frame, text="", font=("Consolas", 9), justify=tk.LEFT, anchor="w")
+        self.texto.pack(side=tk.LEFT, fill="x", expand=True)
+        tk.Button(self.frame, text="Exportar JSON...", command=self.exportar).pack(side=tk.RIGHT, padx=5)
+
+    def refrescar(self):
+        self._frames += 1
+        if self._frames % self._cada:
+            return
+        lineas = [f"{'primitiva':<22}{'acq':>8}{'cont.':>8}{'espera':>10}{'máx':>9}{'retención':>11}"]
+        for nombre, r in self.contencion.ranking(self.filas):
+            retencion = f"{r['retencion_total']:>11.3f}" if "retencion_total" in r else f"{'-':>11}"
+            lineas.append(f"{nombre[:21]:<22}{r['adquisiciones']:>8}{r['contendidas']:>8}"
+                          f"{r['espera_total']:>10.3f}{r['espera_max']:>9.3f}{retencion}")
+        self.texto.config(text="\n".join(lineas))
+
+    def exportar(self):
+        ruta = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON", "*.json")])
+        if ruta:
+            self.contencion.exportar(ruta)
+
+# --- PANEL DE REPRODUCCIÓN ---
+# Controles de un reproduccion.Reproductor: play/pausa, velocidad y una barra
+# para saltar a cualquier tiempo. Avanza una vez por frame según el tiempo
+# real transcurrido, así la velocidad no depende del FPS logrado.
+
+VELOCIDADES = ["0.1", "0.5", "1", "2", "5", "10", "100", "1000"]
+
+class PanelReproduccion:
+    def __init__(self, parent, reproductor):
+        self.reproductor = reproductor
+        self._ultimo = None
+
+        self.frame = tk.LabelFrame(parent, text=" Reproducción de traza ", padx=5, pady=5)
+        self.boton = tk.Button(self.frame, text="▶ Reproducir", width=12, command=self.alternar)
+        self.boton.pack(side=tk.LEFT)
+        tk.Label(self.frame, text="x").pack(side=tk.LEFT, padx=(5, 0))
+        self.var_velocidad = tk.StringVar(value="1")
+        tk.OptionMenu(self.frame, self.var_velocidad, *VELOCIDADES,
+                      command=lambda v: setattr(reproductor, "velocidad", float(v))).pack(side=tk.LEFT)
+        self.var_tiempo = tk.DoubleVar(value=reproductor.desde)
+        self.paso = max((reproductor.hasta - reproductor.desde) / 1000, 1e-3)
+        tk.Scale(self.frame, variable=self.var_tiempo, from_=reproductor.desde, to=reproductor.hasta,
+                 resolution=self.paso, orient=tk.HORIZONTAL, showvalue=False,
+                 command=self.saltar).pack(side=tk.LEFT, fill="x", expand=True, padx=5)
+        self.lbl_tiempo = tk.Label(self.frame, text="", font=("Consolas", 9))
+        self.lbl_tiempo.pack(side=tk.RIGHT)
+
+    def alternar(self):
+        r = self.reproductor
+        if not r.reproduciendo and r.tiempo >= r.hasta:
+            r.ir_a(r.desde) # Terminó: volver a empezar
+        r.reproduciendo = not r.reproduciendo
+        self._ultimo = None
+
+    def saltar(self, valor):
+        # La barra también llama acá cuando la mueve el propio avance
+        t = float(valor)
+        if abs(t - self.reproductor.tiempo) > self.paso:
+            self.reproductor.ir_a(t)
+
+    def avanzar(self):
+        # En cada frame
+        r = self.reproductor
+        ahora = time.perf_counter()
+        if r.reproduciendo and self._ultimo is not None:
+            r.avanzar(ahora - self._ultimo)
+        self._ultimo = ahora
+        self.var_tiempo.set(r.tiempo)
+        self.boton.config(text="⏸ Pausa" if r.reproduciendo else "▶ Reproducir")
+        self.lbl_tiempo.config(text=f"t = {r.tiempo:10.3f} / {r.hasta:.3f} s  "
+                                    f"[{r.posicion}/{r.traza.registros}]")
+
+# --- REINICIO ---
+# Botón "Reiniciar": misma configuración desde cero sin cerrar la ventana.
+# sim.reiniciar() detiene y une los hilos de la corrida (hasta ESPERA_DETENER
+# segundos), así que corre en un hilo aparte para no congelar la ventana; la
+# corrida nueva se lanza desde el hilo de Tk, en el primer frame después de
+# que ese hilo termina (revisar() va en BucleRender.en_cada_frame).
+
+class Reinicio:
+    def __init__(self, sim, log):
+        # log(mensaje, nivel) -> la bitácora de la vista
+        self.sim = sim
+        self.log = log
+        self.boton = None
+        self._hilo = None
+        self._pendientes = []
+
+    def crear_boton(self, parent):
+        self.boton = tk.Button(parent, text="Reiniciar", command=self.pedir)
+        return self.boton
+
+    def pedir(self):
+        if self._hilo is not None:
+            return # Ya hay un reinicio en curso
+        if self.boton is not None:
+            self.boton.config(state="disabled")
+        self._hilo = threading.Thread(target=self._reiniciar, name="reinicio", daemon=True)
+        self._hilo.start()
+
+    def _reiniciar(self):
+        self._pendientes = self.sim.reiniciar()
+
+    def revisar(self):
+        # En cada frame (hilo de Tk)
+        if self._hilo is None or self._hilo.is_alive():
+            return
+        self._hilo = None
+        if self._pendientes:
+            self.log(f"{len(self._pendientes)} hilos no terminaron a tiempo", AVISO)
+        self.log("--- Simulación reiniciada ---")
+        self.sim.iniciar()
+        if self.boton is not None:
+            self.boton.config(state="normal")
+
+# --- MOTOR DE UNA VISTA ---
+# Lo que las tres vistas arman igual alrededor del motor (sin Tkinter, la GUI
+# solo lo observa): la simulación con hilos, con la medición de contención y
+# el vigilante pedidos, o con una traza la réplica que la reproduce, sin
+# hilos; los paneles y el botón que dependen de ese modo; el arranque junto
+# con el BucleRender de la vista y el cierre de la ventana.
+
+class MotorVista:
+    def __init__(self, crear, log, traza=None, medir_contencion=True, vigilar=False):
+        # crear(entorno) -> simulación; log(mensaje, nivel) -> bitácora de la vista
+        self.log = log
+        self.reproductor = Reproductor(traza) if traza else None
+        self.contencion = Contencion() if medir_contencion and not traza else None
+        self.vigilante = None
+        if vigilar and not traza:
+            # Deadlocks e inanición: las alertas van a la bitácora
+            self.vigilante = Vigilante()
+            self.vigilante.al_detectar(lambda alerta: self.log(describir(alerta), AVISO))
+        if self.reproductor is not None:
+            self.sim = self.reproductor.sim
+            self.reinicio = None
+        else:
+            self.sim = crear(EntornoHilos(self.contencion, self.vigilante))
+            self.reinicio = Reinicio(self.sim, log)
+        self.panel_contencion = None
+        self.panel_reproduccion = None
+        self.render = None
+
+    def crear_paneles(self, parent, **pack):
+        # Contención (motor) o reproducción (traza), empaquetado con `pack`
+        if self.contencion is not None:
+            self.panel_contencion = PanelContencion(parent, self.contencion)
+            self.panel_contencion.frame.pack(**pack)
+        if self.reproductor is not None:
+            self.panel_reproduccion = PanelReproduccion(parent, self.reproductor)
+            self.panel_reproduccion.frame.pack(**pack)
+
+    def crear_controles(self, frame):
+        # Se suman a los controles de la bitácora (PanelBitacora.controles)
+        if self.reinicio is not None:
+            self.reinicio.crear_boton(frame).pack(side=tk.LEFT)
+
+    def iniciar(self, root, render, bitacora):
+        # Lanza el motor (o deja la reproducción en pausa) y el render; al
+        # cerrar la ventana detiene todo y cierra la bitácora
+        self.render = render
+        if self.panel_contencion is not None:
+            render.en_cada_frame(self.panel_contencion.refrescar)
+        if self.panel_reproduccion is not None:
+            render.en_cada_frame(self.panel_reproduccion.avanzar)
+        else:
+            render.en_cada_frame(self.reinicio.revisar)
+            if self.vigilante is not None:
+                self.vigilante.iniciar()
+            self.sim.iniciar()
+        render.iniciar()
+
+        def cerrar():
+            if self.reproductor is None:
+                self.log("Cerrando aplicación... Espere a que terminen los hilos activos.")
+            self.detener()
+            bitacora.cerrar()
+            root.destroy()
+        root.protocol("WM_DELETE_WINDOW", cerrar)
+
+    def detener(self):
+        self.sim.detener()
+        if self.render is not None:
+            self.render.detener()
+        if self.vigilante is not None:
+            self.vigilante.detener()